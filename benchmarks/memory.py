@@ -0,0 +1,148 @@
+'''
+Benchmark reporting memory used per task and per project with tracemalloc.
+
+Compares the compact slotted objects of workflow.py against dict backed
+objects laid out as they were before, for a synthetic 100k task workload.
+Run from the repository root with "python benchmarks/memory.py".
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Templates is imported before workflow, which imports it.
+import templates
+from workflow import Project, Task, load_deadline
+
+# - - - - - - - - - - - - - - - - - - -
+
+PROJECT_COUNT = 1000
+TASKS_PER_PROJECT = 100
+
+# - - - - - - - - - - - - - - - - - - -
+
+class DictProject():
+
+  def __init__(self,name,id) -> None:
+    self.name = name
+    self.id = id
+    self.deadline = None
+    self.tasks = []
+    self.team_ids = []
+    self.description = None
+    self.status = "PENDING"
+    self.priority = None
+    self.workflow = None
+
+
+class DictTask():
+
+  def __init__(self,name,task_id,project_id) -> None:
+    self.name = name
+    self.id = task_id
+    self.deadline = None
+    self.project = project_id
+    self.member_ids = []
+    self.description = None
+    self.status = "PENDING"
+    self.priority = None
+    self.archive = False
+    self.logs = {}
+    self.workflow = None
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Creating task data as it is after loading from json, most tasks archived without logs.
+def create_task_data():
+  tasks = []
+  for task_number in range(TASKS_PER_PROJECT):
+    logs = {f"12:00:0{log_number} 01-01-2026": [f"Update {log_number}.",400000000000000000] for log_number in range(task_number % 5 == 0 and 3 or 0)}
+    tasks.append({
+      "name": f"Task {task_number}",
+      "id": task_number + 1,
+      "deadline": {"day": 1, "month": 6, "year": 2027},
+      "member_ids": [200000000000000000 + task_number],
+      "description": None,
+      "status": "COMPLETED" if task_number % 3 else "PENDING",
+      "priority": "HIGH" if task_number % 2 else None,
+      "archive": task_number % 3 != 0,
+      "logs": logs
+    })
+  return json.loads(json.dumps(tasks))
+
+
+# Creating dict backed projects.
+def create_dict_projects():
+  return [DictProject(f"Project {project_number}",project_number) for project_number in range(PROJECT_COUNT)]
+
+
+# Adding dict backed tasks from loaded data.
+def add_dict_tasks(projects,tasks_data):
+  for project in projects:
+    for task_data in tasks_data[project.id]:
+      task = DictTask(task_data["name"],task_data["id"],project.id)
+      task.deadline = dict(task_data["deadline"])
+      task.member_ids = list(task_data["member_ids"])
+      task.status = task_data["status"]
+      task.priority = task_data["priority"]
+      task.archive = task_data["archive"]
+      task.logs = {log_datetime: list(log_info) for log_datetime, log_info in task_data["logs"].items()}
+      project.tasks.append(task)
+
+
+# Creating slotted projects.
+def create_slotted_projects():
+  return [Project(f"Project {project_number}",project_number) for project_number in range(PROJECT_COUNT)]
+
+
+# Adding slotted tasks from loaded data.
+def add_slotted_tasks(projects,tasks_data):
+  for project in projects:
+    for task_data in tasks_data[project.id]:
+      task = Task(task_data["name"],None,task_data["id"],project.id)
+      task.deadline = load_deadline(task_data["deadline"])
+      task.member_ids = tuple(task_data["member_ids"])
+      task.status = task_data["status"]
+      task.priority = task_data["priority"]
+      task.archive = task_data["archive"]
+      for log_datetime, log_info in task_data["logs"].items():
+        task.set_log(log_datetime,list(log_info))
+      project.load_task(task)
+
+
+# Measuring bytes allocated by a function, returning its result and bytes.
+def measure(function,*arguments):
+  gc.collect()
+  start = tracemalloc.take_snapshot()
+  result = function(*arguments)
+  gc.collect()
+  end = tracemalloc.take_snapshot()
+  return result, sum(stat.size_diff for stat in end.compare_to(start,"filename"))
+
+
+def main():
+  tasks_data = [create_task_data() for _ in range(PROJECT_COUNT)]
+  task_count = PROJECT_COUNT * TASKS_PER_PROJECT
+  tracemalloc.start()
+
+  print(f"{PROJECT_COUNT} projects, {task_count} tasks")
+  print(f"{'objects':<10}{'bytes/project':>16}{'bytes/task':>14}{'total MB':>12}")
+  for label, create_projects, add_tasks in [("dict",create_dict_projects,add_dict_tasks),("slots",create_slotted_projects,add_slotted_tasks)]:
+    projects, project_bytes = measure(create_projects)
+    _, task_bytes = measure(add_tasks,projects,tasks_data)
+    print(f"{label:<10}{project_bytes / PROJECT_COUNT:>16.1f}{task_bytes / task_count:>14.1f}{(project_bytes + task_bytes) / 1e6:>12.2f}")
+    del projects
+
+  tracemalloc.stop()
+
+
+if __name__ == "__main__":
+  main()
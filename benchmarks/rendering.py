@@ -0,0 +1,87 @@
+'''
+Benchmark timing each render layout for projects with 10, 100 and 1000 tasks.
+
+Cold renders build a project's text after it changed, warm renders reuse the
+text kept on the project. Run from the repository root with
+"python benchmarks/rendering.py".
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Templates is imported before workflow, which imports it.
+import templates
+import rendering
+from workflow import Workflow
+
+# - - - - - - - - - - - - - - - - - - -
+
+TASK_COUNTS = [10,100,1000]
+
+# Renders timed for each layout, cold renders are repeated less as they are slower.
+WARM_REPEAT = 1000
+COLD_REPEAT = 20
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Member():
+
+  def __init__(self,id) -> None:
+    self.id = id
+
+
+# Creating a workflow with a project of the given number of tasks, a fifth of them archived.
+def create_workflow(task_count):
+  workflow = Workflow("100000000000000000")
+  project = workflow.add_project("Project","1 1 2027")
+  team = workflow.add_team("Team",role_id=500000000000000000,manager_role_id=600000000000000000)
+  project.add_team(team)
+  for task_number in range(task_count):
+    task = project.add_task(f"Task {task_number}","1 6 2027")
+    task.assign_member(Member(200000000000000000 + task_number))
+    if task_number % 5 == 0:
+      task.change_status("COMPLETED")
+      task.change_archive(True)
+  return workflow
+
+
+# Timing a render in milliseconds, changing the project before each one when cold.
+def time_render(render,project,repeat,cold):
+  total = 0.0
+  for _ in range(repeat):
+    if cold:
+      project.change_description("Changed.")
+    start_time = time.perf_counter()
+    render()
+    total += time.perf_counter() - start_time
+  return total / repeat * 1000
+
+
+def main():
+  for task_count in TASK_COUNTS:
+    workflow = create_workflow(task_count)
+    project = workflow.projects[0]
+    layouts = {
+      "board": lambda: rendering.render_board(workflow,rendering.paginate_board(workflow)),
+      "edit": lambda: rendering.render_edit(project,workflow),
+      "manage": lambda: rendering.render_manage(project,workflow,True),
+      "archive": lambda: rendering.render_archive(project,workflow,1,1),
+    }
+
+    print(f"\n1 project, {task_count} tasks")
+    print(f"{'layout':<10}{'cold ms':>12}{'warm ms':>12}")
+    for layout, render in layouts.items():
+      cold_time = time_render(render,project,COLD_REPEAT,True)
+      warm_time = time_render(render,project,WARM_REPEAT,False)
+      print(f"{layout:<10}{cold_time:>12.3f}{warm_time:>12.4f}")
+
+
+if __name__ == "__main__":
+  main()
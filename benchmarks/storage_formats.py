@@ -0,0 +1,86 @@
+'''
+Benchmark comparing size, encode and decode time of storage formats.
+
+Run from the repository root with "python benchmarks/storage_formats.py".
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Templates is imported before workflow, which imports it.
+import templates
+import encoding
+from workflow import Workflow
+from json_storage import snapshot_workflow
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Number of projects, tasks per project and logs per task of each synthetic workflow.
+SIZES = [(1,10,2),(5,20,5),(20,50,10),(50,100,20)]
+
+FORMATS = [("json",None),("json","gzip"),("json","zstd"),("msgpack",None),("msgpack","gzip"),("msgpack","zstd")]
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Author():
+
+  def __init__(self,id) -> None:
+    self.id = id
+
+
+# Creating a workflow with the given number of projects, tasks and logs.
+def create_workflow(project_count,task_count,log_count):
+  workflow = Workflow("100000000000000000")
+  start = datetime(2026,1,1)
+  for project_number in range(project_count):
+    project = workflow.add_project(f"Project {project_number}","1 1 2027")
+    project.description = "A synthetic project used for benchmarking storage formats."
+    for task_number in range(task_count):
+      task = project.add_task(f"Task {task_number}","1 6 2027")
+      task.description = "A synthetic task."
+      task.assign_member(Author(200000000000000000 + task_number))
+      task.assign_member(Author(300000000000000000 + task_number))
+      for log_number in range(log_count):
+        task.set_log(str(start + timedelta(minutes=log_number)),[f"Progress update {log_number}.", 400000000000000000 + log_number])
+  for team_number in range(5):
+    workflow.add_team(f"Team {team_number}",role_id=500000000000000000 + team_number,manager_role_id=600000000000000000 + team_number)
+  return workflow
+
+
+# Timing a function in milliseconds per call.
+def time_call(function,repeat):
+  return min(timeit.repeat(function,number=repeat,repeat=3)) / repeat * 1000
+
+
+def main():
+  formats = []
+  for format, compression in FORMATS:
+    try:
+      encoding.check_available(format,compression)
+      formats.append((format,compression))
+    except RuntimeError as e:
+      print(f"Skipping {format}/{compression}, {e}")
+
+  for project_count, task_count, log_count in SIZES:
+    snapshot = snapshot_workflow(create_workflow(project_count,task_count,log_count))
+    repeat = max(1,2000 // (project_count * task_count))
+    print(f"\n{project_count} projects, {task_count} tasks each, {log_count} logs each")
+    print(f"{'format':<18}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+
+    for format, compression in formats:
+      encoded = encoding.encode(snapshot,format,compression)
+      encode_time = time_call(lambda: encoding.encode(snapshot,format,compression),repeat)
+      decode_time = time_call(lambda: encoding.decode(encoded),repeat)
+      print(f"{format + '/' + str(compression):<18}{len(encoded):>12}{encode_time:>12.3f}{decode_time:>12.3f}")
+
+
+if __name__ == "__main__":
+  main()
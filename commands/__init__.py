@@ -8,7 +8,7 @@ Created on Wednesday 24th January 2024.
 
 import asyncio
 
-from .active_channel import restart_looping,set_active_channel_command, init_active_channel
+from .active_channel import restart_looping,stop_looping,set_active_channel_command, init_active_channel
 from .teams import display_teams    
 from .manage_projects import manage_projects
 from .manage_task import manage_tasks
@@ -9,7 +9,14 @@ Created on Wednesday 24th January 2024.
 import discord
 import asyncio
 
+import config
+import events
+from debounce import Debouncer
+from edits import MessageEdits
 from templates import get_template_selection 
+from rendering import render_board, render_edit, paginate_board
+from scheduler import BOARD, message_edit, channel_send, delete_message, send_notice
+from sessions import Session, concerns_project, run_message_loop
 from .misc import get_admin_role
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -19,7 +26,8 @@ from .misc import get_admin_role
 class WorkflowButtonView(discord.ui.View):
 
     def __init__(self,workflow,client):
-        super().__init__()
+        # Kept without timeout, as the board is only edited when the workflow changes.
+        super().__init__(timeout=None)
         self.workflow = workflow
         self.client = client
 
@@ -121,59 +129,24 @@ class EditProjectModal(discord.ui.Modal,title="Edit Project"):
         self.user = user
 
     # Requires project number to edit.
-    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Number",required=True,max_length=2)
+    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Number",required=True,max_length=4)
 
     async def on_submit(self, interaction: discord.Interaction):
-        initial_check = True
-
         # Getting project.
         project = self.workflow.projects[int(self.number_input.value)-1]
 
         if project.__class__.__name__ != "DaysOfCode":
-          while True:
-              # Creating title.
-              title = f"{project.name} - Deadline <t:{project.get_unix_deadline()}:R>" if project.deadline else f"{project.name}"
-              # Creating task list.
-              task_list = ""
-              for team in project.get_teams_from_ids(self.workflow):
-                task_list += f"{self.workflow.active_message.guild.get_role(team.role_id).mention} "
-              if len(project.get_teams_from_ids(self.workflow)) != 0:
-                task_list += "\n"
-              if len(project.tasks) != 0:
-                  index = 0
-                  for task in project.tasks:
-                    if not task.archive:
-                      index += 1
-                      task_members_mention = ""
-                      task_status = ""
-                      if task.status:
-                        task_status += f"**`{task.status}`**"
-                      for member_id in task.member_ids:
-                          member = await self.workflow.active_message.guild.fetch_member(member_id)
-                          task_members_mention += member.mention 
-                      task_list += f'{index}. {task.name} - *Due <t:{task.get_unix_deadline()}:R>* {task_status} {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
-                      f'{index}. {task.name} {task_status} {task_members_mention}\n'
-              else:
-                  task_list += "No tasks."
+          session = Session(self.workflow,concerns_project(project))
+          async def render():
               # Creating embed.
-              embed = discord.Embed(color=discord.Color.blurple(),title=title,description=task_list)
+              embed = render_edit(project,self.workflow)
               # Creating view.
               view = ProjectButtonView(project=project,user=self.user,workflow=self.workflow)
-              if len(project.tasks) == 0:
+              if len(project.active_tasks) == 0:
                   view.del_task.disabled = True
-              # Checking if initial message.
-              if initial_check:
-                  await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-                  initial_check = False
-                  await self.client.wait_for('interaction')
-              else:
-                  await interaction.edit_original_response(embed=embed,view=view)
-                  await self.client.wait_for('interaction')
-              # Checking to close the message.
-              await asyncio.sleep(1)
-              if view.close_check:
-                  await interaction.delete_original_response()
-                  break
+              return embed, view
+
+          await run_message_loop(interaction,session,render,delay=1,delete_after=300,ephemeral=True)
         else:
           await interaction.response.send_message("Cannot edit 100 Days of Code project.",delete_after=10,ephemeral=True)
 
@@ -186,11 +159,11 @@ class DelProjectModal(discord.ui.Modal,title="Delete Project"):
         self.workflow = workflow
     
     # Required project number to delete.
-    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Number",required=True,max_length=2)
+    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Number",required=True,max_length=4)
 
     async def on_submit(self, interaction: discord.Interaction):
-        # Getting original title
-        project_title = self.workflow.get_project_by_id(int(self.number_input.value)).name
+        # Getting original title of the project at the number on the board.
+        project_title = self.workflow.projects[int(self.number_input.value)-1].name
 
         # Deleting project from workflow.
         self.workflow.del_project(int(self.number_input.value))
@@ -198,7 +171,7 @@ class DelProjectModal(discord.ui.Modal,title="Delete Project"):
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted a project, `{project_title}`.")
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
@@ -228,7 +201,7 @@ class AddTaskModal(discord.ui.Modal,title="Add Task"):
         logger.info("Sending update log in active channel.")
         description = f"{interaction.user.mention} added task, (`{new_task.name}`), to `{self.project.name}`." if self.deadline_input.value == "" else f"{interaction.user.mention} added task, (`{self.task_input.value}` <t:{new_task.get_unix_deadline()}:R>), to `{self.project.name}`."
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=description)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
@@ -243,24 +216,21 @@ class DelTaskModal(discord.ui.Modal,title="Delete Task"):
         self.workflow = workflow
 
     # Requires task number to delete.
-    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Project Number",required=True,max_length=2)
+    number_input = discord.ui.TextInput(label="Please enter a project number:",style=discord.TextStyle.short,placeholder="Project Number",required=True,max_length=4)
 
     async def on_submit(self, interaction: discord.Interaction):
         # Deleting task from project.
-        count = 0
-        for task in self.project.tasks:
-          if not task.archive:
-            count += 1
-          if count == int(self.number_input.value):
-            task_name = task.name
-            self.project.tasks.remove(task)
+        task = self.project.get_active_task(int(self.number_input.value))
+        if task:
+          task_name = task.name
+          self.project.remove_task(task)
 
-            # Sending update log in active channel.
-            logger.info("Sending update log in active channel.")
-            update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted task, (`{task_name}`), from `{self.project.name}`.")
-            await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+          # Sending update log in active channel.
+          logger.info("Sending update log in active channel.")
+          update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted task, (`{task_name}`), from `{self.project.name}`.")
+          send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
-            await interaction.response.defer()
+          await interaction.response.defer()
 
 
 
@@ -280,12 +250,12 @@ class EditTitleModal(discord.ui.Modal, title="Edit Title"):
         original_title = self.project.name
 
         # Changing title of project.
-        self.project.name = self.title_input.value
+        self.project.change_name(self.title_input.value)
         
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} changed a project's title from `{original_title}` to `{self.project.name}`.")
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
@@ -309,12 +279,17 @@ class EditDeadlineModal(discord.ui.Modal, title="Edit Deadline"):
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} changed `{self.project.name}`'s deadline to <t:{self.project.get_unix_deadline()}:R>.")
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
+# Workflow each guild's board is being updated for, with the task updating it.
+board_loops = {}
+# View on each guild's board, stopped when replaced as it is kept without timeout.
+board_views = {}
+
 # Init active_channel.
 def init_active_channel(logging):
     # Initialising logger.
@@ -327,9 +302,10 @@ async def set_active_channel_command(interaction, workflow, client):
     # Getting channel and guild of command was sent in.
     channel = interaction.channel
     guild = interaction.guild
+    old_channel = workflow.active_channel
 
     # Updating projects channel in workflow.
-    workflow.active_channel = channel
+    workflow.set_active_channel(channel)
     logger.info("Active channel set.")
 
     # Getting workflow manager role.
@@ -343,108 +319,143 @@ async def set_active_channel_command(interaction, workflow, client):
     except:
       logger.info("Unable to change permissions of active channel.")
 
-    # Registering initial check.
-    initial_check = True
-
     # Sending projects embed.
-    while True:
-        # Creating embed for message.
-        embed = discord.Embed(color=discord.Color.blurple(),title="Existing Projects")
-
-        # Creating content of message.
-        if len(workflow.projects) != 0:
-            for project in workflow.projects:
-                # Creating field title.
-                field_title = f'{workflow.projects.index(project)+1}. {project.name} - Deadline <t:{project.get_unix_deadline()}:R>' if project.deadline else \
-                f'{workflow.projects.index(project)+1}. {project.name}'
-                # Creating task list for field.
-                task_list = ""
-                for team in project.get_teams_from_ids(workflow):
-                  try:
-                    task_list += f"{guild.get_role(team.role_id).mention} "
-                  except Exception as e:
-                    logger.info(e)
-                if len(project.get_teams_from_ids(workflow)) != 0:
-                  task_list += "\n"
-                if len(project.tasks) != 0:
-                    for task in project.tasks:
-                      if not task.archive:
-                        task_members_mention = ""
-                        task_status = ""
-                        if task.status:
-                          task_status += f"**`{task.status}`**"
-                        for member_id in task.member_ids:
-                            member = await workflow.active_channel.guild.fetch_member(member_id)
-                            task_members_mention += member.mention 
-                        task_list += f'- {task.name} - *Due <t:{task.get_unix_deadline()}:R>* {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
-                    f'- {task.name} {task_status} {task_members_mention}\n'
-                else:
-                    task_list += "No tasks."
-                embed.add_field(name=field_title,value=task_list,inline=False)
-        else:
-            embed.description = 'No existing projects.'
-
-        # Creating UI at bottom of message.
-        view = WorkflowButtonView(workflow=workflow,client=client)
-        if len(workflow.projects) == 0:
-            view.edit_project.disabled = True
-            view.del_project.disabled = True
-
-        # Updating message.
-        if initial_check:
-            await interaction.response.send_message(embed=embed,view=view)
-            response = await interaction.original_response()
-            workflow.active_message = response
-            initial_check = False
-            await client.wait_for('interaction')
-        else:
-            await interaction.edit_original_response(embed=embed,view=view)
-            await client.wait_for('interaction')
+    embed, view = create_board_message(workflow,client)
+    await interaction.response.send_message(embed=embed,view=view)
+    set_board_view(workflow,view)
+    response = await interaction.original_response()
+    old_message_ids = workflow.set_active_message(response)
 
-           
-# Restarting message looping.
-async def restart_looping(client,workflow,guild):
-    while True:
-        # Creating embed for message.
-        embed = discord.Embed(color=discord.Color.blurple(),title="Existing Projects")
-
-        # Creating content of message.
-        if len(workflow.projects) != 0:
-            for project in workflow.projects:
-                # Creating field title.
-                field_title = f'{workflow.projects.index(project)+1}. {project.name} - Deadline <t:{project.get_unix_deadline()}:R>' if project.deadline  else \
-                f'{workflow.projects.index(project)+1}. {project.name}'
-                # Creating task list for field.
-                task_list = ""
-                for team in project.get_teams_from_ids(workflow):
-                  task_list += f"{guild.get_role(team.role_id).mention} "
-                if len(project.get_teams_from_ids(workflow)) != 0:
-                  task_list += "\n"
-                if len(project.tasks) != 0:
-                    for task in project.tasks:
-                      if not task.archive:
-                        task_members_mention = ""
-                        task_status = ""
-                        if task.status:
-                          task_status += f"**`{task.status}`**"
-                        if len(task.member_ids) != 0:
-                          for member_id in task.member_ids:
-                            member = await workflow.active_message.guild.fetch_member(member_id)
-                            task_members_mention += member.mention 
-                        task_list += f'- {task.name} - *Due <t:{task.get_unix_deadline()}:R>* {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
-                    f'- {task.name} {task_status} {task_members_mention}\n'
-                else:
-                    task_list += "No tasks."
-                embed.add_field(name=field_title,value=task_list,inline=False)
-        else:
-            embed.description = 'No existing projects.'
+    # Deleting pages of the old board.
+    if old_channel:
+        for message_id in old_message_ids:
+            try:
+                await delete_message(old_channel.get_partial_message(message_id),BOARD)
+            except discord.HTTPException as e:
+                logger.info(f"Old board message unsuccessfully deleted, {workflow.guild_id}, {e}")
+
+    # Updating board on changes.
+    await restart_looping(client,workflow,guild)
 
-        # Creating UI at bottom of message.
-        view = WorkflowButtonView(workflow=workflow,client=client) 
-        if len(workflow.projects) == 0:
-            view.edit_project.disabled = True
-            view.del_project.disabled = True
 
-        # Updating message.
-        await workflow.active_message.edit(embed=embed,view=view)
-        await client.wait_for('interaction')
+# Creating embed and view of the board's first message, the loop sends the rest.
+def create_board_message(workflow,client):
+    embed = render_board(workflow,paginate_board(workflow))[0]
+    return embed, create_board_view(workflow,client)
+
+
+# Creating UI at bottom of the board's first message.
+def create_board_view(workflow,client):
+    view = WorkflowButtonView(workflow=workflow,client=client)
+    if len(workflow.projects) == 0:
+        view.edit_project.disabled = True
+        view.del_project.disabled = True
+    return view
+
+
+# Checking if an event changes the board.
+def check_board_event(event) -> bool:
+    return not isinstance(event,(events.LogEvent,events.ProgressChanged))
+
+
+# Restarting message looping, editing the board at most once each interval after the workflow changes.
+async def restart_looping(client,workflow,guild):
+    # Leaving board to the loop already updating it for this workflow.
+    if workflow.guild_id in board_loops and board_loops[workflow.guild_id][0] is workflow:
+        return
+    board_loop = (workflow,asyncio.current_task())
+    board_loops[workflow.guild_id] = board_loop
+    debouncer = Debouncer(config.BOARD_EDIT_INTERVAL)
+    subscription = workflow.events.subscribe(events.Event,lambda event: debouncer.signal() if check_board_event(event) else None)
+    # Refreshing board once on start.
+    debouncer.signal()
+    # Project ids on each board message, and what was last sent to each message by id.
+    pages = []
+    message_edits = {}
+    edited_message = None
+
+    try:
+        while board_loops.get(workflow.guild_id) is board_loop:
+            await debouncer.wait()
+            if workflow.active_message is None:
+                continue
+            # Always editing a new active message once.
+            if workflow.active_message is not edited_message:
+                message_edits = {}
+                edited_message = workflow.active_message
+
+            # Updating messages, only editing those whose projects changed.
+            pages = paginate_board(workflow,pages)
+            try:
+                await update_board_messages(workflow,client,render_board(workflow,pages),message_edits)
+            except discord.HTTPException as e:
+                logger.info(f"Board unsuccessfully edited, {workflow.guild_id}, {e}")
+    finally:
+        # Leaving the debouncer of a stopped loop unsignalled.
+        workflow.events.unsubscribe(events.Event,subscription)
+
+
+# Stopping board looping of a workflow being removed, so it no longer saves or edits its board.
+def stop_looping(workflow):
+    workflow.set_storage(None)
+    board_loop = board_loops.get(workflow.guild_id)
+    if board_loop and board_loop[0] is workflow:
+        del board_loops[workflow.guild_id]
+        board_loop[1].cancel()
+    view = board_views.get(workflow.guild_id)
+    if view and view.workflow is workflow:
+        del board_views[workflow.guild_id]
+        view.stop()
+
+
+# Setting view sent to the board, stopping the view it replaces.
+def set_board_view(workflow,view):
+    old_view = board_views.get(workflow.guild_id)
+    if old_view is not view:
+        board_views[workflow.guild_id] = view
+        if old_view:
+            old_view.stop()
+
+
+# Editing the board's messages with their embeds, sending messages for new pages and deleting those no longer needed.
+async def update_board_messages(workflow,client,embeds,message_edits):
+    messages = [workflow.active_message] + [workflow.active_channel.get_partial_message(message_id) for message_id in workflow.board_message_ids]
+    message_ids = list(workflow.board_message_ids)
+    try:
+        for index, embed in enumerate(embeds):
+            if index < len(messages):
+                message = messages[index]
+                edits = message_edits.setdefault(message.id,MessageEdits())
+                if index == 0:
+                    await edits.send(message_edit(message,BOARD),embed=embed,view=create_board_view(workflow,client))
+                    # Keeping only the view now on the board, none was sent when the edit was skipped.
+                    set_board_view(workflow,edits.view)
+                    continue
+                try:
+                    await edits.send(message_edit(message,BOARD),embed=embed)
+                except discord.NotFound:
+                    # Sending page again in place of a deleted message.
+                    logger.info(f"Board message deleted, sending page again, {workflow.guild_id}, {message.id}")
+                    message_edits.pop(message.id,None)
+                    edits = MessageEdits()
+                    new_message = await edits.send(channel_send(workflow.active_channel,BOARD),embed=embed)
+                    message_edits[new_message.id] = edits
+                    message_ids[message_ids.index(message.id)] = new_message.id
+            else:
+                edits = MessageEdits()
+                message = await edits.send(channel_send(workflow.active_channel,BOARD),embed=embed)
+                message_edits[message.id] = edits
+                message_ids.append(message.id)
+
+        # Deleting messages of pages no longer needed.
+        for message in messages[len(embeds):]:
+            message_edits.pop(message.id,None)
+            message_ids.remove(message.id)
+            try:
+                await delete_message(message,BOARD)
+            except discord.HTTPException as e:
+                logger.info(f"Board message unsuccessfully deleted, {workflow.guild_id}, {e}")
+    finally:
+        # Keeping ids of messages sent, even when a later edit fails.
+        if message_ids != workflow.board_message_ids:
+            workflow.set_board_message_ids(message_ids)
@@ -11,6 +11,9 @@ import math
 import asyncio
 
 from .manage_task import ManagerIndividualTaskView
+from members import get_resolver
+from rendering import render_archive, mention_member, TASKS_PER_ARCHIVE_PAGE
+from sessions import Session, concerns_project, concerns_task, run_message_loop
 
 # - - - - - - - - - - - - - - - - -
 
@@ -74,13 +77,10 @@ class UnarchiveTaskModal(discord.ui.Modal,title="Unarchive Task"):
 
   async def on_submit(self, interaction: discord.Interaction):
     # Unarchiving task from project.
-    count = 0
-    for task in self.project.tasks:
-      if task.archive:
-        count += 1
-      if count == int(self.number_input.value):
-        task.archive = False
-        await interaction.response.defer()
+    task = self.project.get_archived_task(int(self.number_input.value))
+    if task:
+      task.change_archive(False)
+      await interaction.response.defer()
 
 
 class EditTaskModal(discord.ui.Modal,title="Edit Task"):
@@ -99,13 +99,10 @@ class EditTaskModal(discord.ui.Modal,title="Edit Task"):
 
   async def on_submit(self, interaction: discord.Interaction):
     # Editing task from project.
-    count = 0
-    for task in self.project.tasks:
-      if task.archive:
-        count += 1
-      if count == int(self.number_input.value):
-        # Creating tasks.
-        await send_edit_task_message(task,self.guild,self.client,self.workflow,self.command,interaction)
+    task = self.project.get_archived_task(int(self.number_input.value))
+    if task:
+      # Creating tasks.
+      await send_edit_task_message(task,self.guild,self.client,self.workflow,self.command,interaction)
 
 
 class ClearTaskModal(discord.ui.Modal,title="Clear Task"):
@@ -123,25 +120,20 @@ class ClearTaskModal(discord.ui.Modal,title="Clear Task"):
   number_input = discord.ui.TextInput(label="Please enter a task number:",style=discord.TextStyle.short,placeholder="Task Number",required=True,max_length=2)
 
   async def on_submit(self, interaction: discord.Interaction):
-    # Unarchiving task from project.
-    count = 0
-    for task in self.project.tasks:
-      if task.archive:
-        count += 1
-      if count == int(self.number_input.value):
-        self.project.tasks.remove(task)
-        await interaction.response.defer()
+    # Clearing task from project.
+    task = self.project.get_archived_task(int(self.number_input.value))
+    if task:
+      self.project.remove_task(task)
+      await interaction.response.defer()
 
 # - - - - - - - - - - - - - - - - -
     
 async def send_edit_task_message(task,guild,client,workflow,command,interaction):
   # Sending edit task message.
-  initial_check = True
-  while True:
+  session = Session(workflow,concerns_task(task))
+  async def render():
     # Getting task members.
-    task_members = []
-    for member_id in task.member_ids:
-      task_members.append(guild.get_member(member_id))
+    task_members = await get_resolver(guild).fetch_all(task.member_ids)
   
     # Getting description.
     if task.description:
@@ -169,9 +161,8 @@ async def send_edit_task_message(task,guild,client,workflow,command,interaction)
     if len(task.logs.keys()) != 0:
       log_list = ""
       for log_date in task.logs.keys():
-        # Getting log author.
-        log_author = guild.get_member(task.logs[log_date][1])
-        log_list += f"`{log_date}` {task.logs[log_date][0]} {log_author.mention}\n"
+        # Mentioning log author.
+        log_list += f"`{log_date}` {task.logs[log_date][0]} {mention_member(task.logs[log_date][1])}\n"
       embed.add_field(name="Log:",value=log_list,inline=False)
 
     view = ManagerIndividualTaskView(task,guild,client,workflow,command.user)
@@ -184,21 +175,9 @@ async def send_edit_task_message(task,guild,client,workflow,command,interaction)
     available_members = get_member_selection(task,workflow,guild,False)
     if len(available_members) == 0:
       view.remove_member.disabled = True
+    return embed, view
 
-    if initial_check:
-      await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-      initial_check = False
-      await client.wait_for("interaction")
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-      await client.wait_for("interaction")
-
-    await asyncio.sleep(0.5)
-
-    # Checking to close message.
-    if view.close_check:
-      await interaction.delete_original_response()
-      break
+  await run_message_loop(interaction,session,render,delete_after=300,ephemeral=True)
 
 
 def get_member_selection(task,workflow,guild,menu_type):
@@ -211,9 +190,7 @@ def get_member_selection(task,workflow,guild,menu_type):
         if member not in member_selection and member.id not in task.member_ids:
           member_selection.append(member)
   else:
-    for member_id in task.member_ids:
-      member = guild.get_member(member_id)
-      member_selection.append(member)
+    member_selection = get_resolver(guild).get_all(task.member_ids)
   
   # Creating discord options.
   member_selection_options = []
@@ -226,19 +203,15 @@ def get_member_selection(task,workflow,guild,menu_type):
 # - - - - - - - - - - - - - - - - -
 
 async def send_archive_display(interaction: discord.Interaction,project,guild,client,workflow):
-  initial_check = True
+  session = Session(workflow,concerns_project(project))
   page_display = 1
-  fields_per_embed = 27
-  while True:
-  
-    # Calculating number of archive tasks.
-    archive_counter = 0
-    for task in project.tasks:
-      if task.archive:
-        archive_counter += 1
+  async def render():
+    nonlocal page_display
+    # Getting number of archive tasks.
+    archive_counter = project.archived_count
 
     # Calculating total number of pages.
-    total_pages = math.ceil(archive_counter/(fields_per_embed-2))
+    total_pages = math.ceil(archive_counter/TASKS_PER_ARCHIVE_PAGE)
 
     if total_pages == 0:
       await interaction.delete_original_response()
@@ -246,30 +219,8 @@ async def send_archive_display(interaction: discord.Interaction,project,guild,cl
     if page_display > total_pages:
       page_display = total_pages
 
-    if len(project.tasks) != 0:
-      # Creating archive message.
-      embed = discord.Embed(color=discord.Color.blurple(),title=f"Archived Tasks ({page_display}/{total_pages})")
-
-      counter = (page_display-1) * (fields_per_embed - 2)
-
-      for index, task in enumerate(project.tasks):
-        if index < (page_display * fields_per_embed) and index >= (page_display-1)*fields_per_embed:
-          if task.archive:
-            counter += 1
-            task_members_mention = ""
-            task_status = ""
-            if task.status:
-              task_status += f"**`{task.status}`**"
-            for member_id in task.member_ids:
-              member = await guild.fetch_member(member_id)
-              task_members_mention += member.mention 
-            task_list = f'{counter}. {task.name} Due <t:{task.get_unix_deadline()}:R>' if task.deadline and task.status != "COMPLETED" else \
-            f'{counter}. {task.name} {task_status}\n'
-
-            embed.add_field(name=task_list,value=task_members_mention,inline=False)
-    else:
-      task_list = "No tasks."
-      embed = discord.Embed(color=discord.Color.blurple(),title=f"Archived Tasks ({page_display}/{total_pages})",description=task_list)
+    # Creating archive message.
+    embed = render_archive(project,workflow,page_display,total_pages)
 
     view = ArchiveButtonView(project,guild,client,workflow,page_display)
 
@@ -277,24 +228,16 @@ async def send_archive_display(interaction: discord.Interaction,project,guild,cl
       view.page_up.disabled = True
     if page_display == 1:
       view.page_down.disabled = True
+    return embed, view
 
-    if initial_check:
-      await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-      initial_check = False
-      await client.wait_for("interaction")
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-      await client.wait_for("interaction")
-    
-    await asyncio.sleep(0.5)
-
+  def handle(view):
+    nonlocal page_display
     if view.page_up_check:
       page_display += 1
     if view.page_down_check:
       page_display -= 1
-    
-    if view.close_check:
-      await interaction.delete_original_response()
+
+  await run_message_loop(interaction,session,render,handle,delete_after=300,ephemeral=True)
     
     
     
\ No newline at end of file
@@ -11,6 +11,10 @@ import logging
 import asyncio
 import time
 
+import config
+from scheduler import send_notice
+from sessions import Session, concerns_project, run_message_loop
+
 # - - - - - - - - - - - - - - - - -
 
 global logger
@@ -33,7 +37,7 @@ class ApproveDaysOfCode(discord.ui.View):
     # Sending update log in active channel.
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} added a project, `{project.name}`.")
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
     self.close_check = True
     await interaction.response.defer()
@@ -47,51 +51,33 @@ class ApproveDaysOfCode(discord.ui.View):
 
 async def send_new_project_message(interaction,workflow,client):
   """ To send message to Workflow Manager when no 100 Days of Code project is available."""
-  initial_message = True
-  while True:
+  session = Session()
+  async def render():
     # Creating message.
     embed = discord.Embed(color=discord.Color.dark_red(),title="100 Days of Code",description="Currently no 100 Days of Code project available, would you like to create one?")
     # Creating view.
     view = ApproveDaysOfCode(workflow)
-    
-    # Sending message.
-    if initial_message:
-      await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
-      initial_message = False
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-
-    await client.wait_for('interaction')
+    return embed, view
 
-    await asyncio.sleep(0.5)
-
-    if view.close_check:
-      await interaction.delete_original_response()
-      break
+  # Sending message.
+  await run_message_loop(interaction,session,render,ephemeral=True)
 
 async def send_existing_project_message(interaction,workflow,client):
   """ To send message to Workflow Manager when already 100 Days of Code project."""
-  initial_message = True
-  while True:
+  session = Session(workflow,concerns_project(workflow.get_days_of_code()))
+  async def render():
     # Creating message.
     embed = workflow.get_days_of_code().display_message()
-    
-    # Sending message.
-    if initial_message:
-      await interaction.response.send_message(embed=embed)
-      initial_message = False
-    else:
-      await interaction.edit_original_response(embed=embed)
+    return embed, None
 
-    await client.wait_for('interaction')
-
-    await asyncio.sleep(0.5)
+  # Sending message, edited on each change shown on it.
+  await run_message_loop(interaction,session,render)
 
 async def send_standard_message(interaction,workflow,client):
   """ To send message to standard member when 100 Days of Code project active."""
   project = workflow.get_days_of_code()
-  initial_message = True
-  while True:
+  session = Session(workflow,concerns_project(project))
+  async def render():
     if interaction.user in project.members:
       # Sending message if member in project.
       embed = project.display_message(interaction.user)
@@ -100,45 +86,35 @@ async def send_standard_message(interaction,workflow,client):
       # Sending message if member not in project.
       embed = project.display_message(interaction.user)
       view = project.get_excluded_member_view()
+    return embed, view
 
-    # Sending message.
-    if initial_message:
-      await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
-      initial_message = False
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-
-    await client.wait_for('interaction')
-
-    await asyncio.sleep(0.5)
-
-    if view.close_check:
-      await interaction.delete_original_response()
-      break
+  # Sending message.
+  await run_message_loop(interaction,session,render,ephemeral=True)
 
 # - - - - - - - - - - - - - - - - -
     
 async def restart_days_of_code_looping(workflows,client):
   """ Restarting looping to check progress for days of code projects."""
   while True:
-    # Getting all days of code projects.
+    # Getting all days of code projects of loaded guilds, those loaded later catch up on their first check.
     days_of_code_projects: list = []
-    for guild_id in workflows.keys():
-      for project in workflows[guild_id].projects:
+    for guild_id in workflows.loaded.keys():
+      for project in workflows.loaded[guild_id].projects:
         if project.__class__.__name__ == "DaysOfCode":
           days_of_code_projects.append(project)
 
     # Checking if over 24 hours.
     for project in days_of_code_projects:
-      for member_id in project.time_checked.keys():
-        if time.time() - project.time_checked[member_id] > 24 * 60 * 60:
-          # Updating time.
-          project.time_checked[member_id] = time.time()
-          # Updating progress.
-          if project.progress[member_id][-1] == "m":
-            project.progress[member_id][-1] = "n"
-          # Adding new day.
-          project.progress[member_id].append("m")
+      project.check_progress()
     
-    # Waiting for interaction.
-    await client.wait_for('interaction')
\ No newline at end of file
+    # Waiting until the next member is due a new day.
+    await asyncio.sleep(get_next_check(days_of_code_projects))
+
+
+def get_next_check(projects) -> float:
+  """ Seconds until a member of the projects was last checked 24 hours ago, checking at least every interval for new members."""
+  next_check = config.PROGRESS_CHECK_INTERVAL
+  for project in projects:
+    for time_checked in project.time_checked.values():
+      next_check = min(next_check,time_checked + 24 * 60 * 60 - time.time())
+  return max(next_check,1)
\ No newline at end of file
@@ -11,6 +11,10 @@ import math
 import asyncio
 import logging
 
+from rendering import mention_member
+from scheduler import send_notice
+from sessions import Session, concerns_task, wait_for_message, run_message_loop
+
 # - - - - - - - - - - - - - - - - - - - - - -
 
 global logger
@@ -56,9 +60,9 @@ class LogButtonView(discord.ui.View):
     select_menu = self.create_log_menu(interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Finish",style=discord.ButtonStyle.success)
@@ -93,7 +97,7 @@ class LogSelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")  
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} removed a log from {self.task.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 # - - - - - - - - - - - - - - -
@@ -117,7 +121,7 @@ class AddLogModal(discord.ui.Modal,title="Add Log"):
     logger.info("Sending update log in active channel.")  
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} added a log to {self.task.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 # - - - - - - - - - - - - - - -
 
@@ -137,10 +141,11 @@ def get_log_selection(task,author,manager_check):
 # - - - - - - - - - - - - - - -
 
 async def send_log_message(interaction: discord.Interaction,task,client,guild,workflow):
-  initial_check = True
+  session = Session(workflow,concerns_task(task))
   page_display = 1
   fields_per_embed = 25
-  while True:
+  async def render():
+    nonlocal page_display
 
     # Calculating total number of pages.
     total_pages = math.ceil(len(task.logs.keys())/(fields_per_embed))
@@ -154,8 +159,7 @@ async def send_log_message(interaction: discord.Interaction,task,client,guild,wo
 
       for index, log_date in enumerate(task.logs.keys()):
         if index < (page_display * fields_per_embed) and index >= (page_display-1)*fields_per_embed:
-          log_author = guild.get_member(task.logs[log_date][1])
-          embed.add_field(name=f"`{log_date}`",value=f"{log_author.mention} {task.logs[log_date][0]}",inline=False)
+          embed.add_field(name=f"`{log_date}`",value=f"{mention_member(task.logs[log_date][1])} {task.logs[log_date][0]}",inline=False)
     else:
       log_list = "No logs."
       embed = discord.Embed(color=discord.Color.blurple(),title=f"Logs (1/1)",description=log_list)
@@ -168,22 +172,14 @@ async def send_log_message(interaction: discord.Interaction,task,client,guild,wo
       view.page_down.disabled = True
     if len(task.logs.keys()) == 0:
       view.remove_log.disabled = True
+    return embed, view
 
-    if initial_check:
-      await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-      initial_check = False
-      await client.wait_for("interaction")
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-      await client.wait_for("interaction")
-    
-    await asyncio.sleep(0.5)
-
+  def handle(view):
+    nonlocal page_display
     if view.page_up_check:
       page_display += 1
     if view.page_down_check:
       page_display -= 1
-    
-    if view.close_check:
-      await interaction.delete_original_response()
+
+  await run_message_loop(interaction,session,render,handle,delete_after=300,ephemeral=True)
     
\ No newline at end of file
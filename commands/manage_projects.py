@@ -23,6 +23,10 @@ from discord.interactions import Interaction
 from .misc import get_admin_role, check_team_manager, get_projects_for_member, check_team_manager_project
 from .manage_task import ManagerIndividualTaskView,get_member_selection
 from .archive import send_archive_display
+from members import get_resolver
+from rendering import render_manage
+from scheduler import send_notice
+from sessions import Session, concerns_project, concerns_task, wait_for_message, run_message_loop
 
 # - - - - - - - - - - - - - - - - - -
 
@@ -55,56 +59,16 @@ class ProjectSelectMenu(discord.ui.Select):
     await self.initial_interaction.delete_original_response()
 
   async def send_project_message(self,project,interaction):
-    initial_check = True
+    session = Session(self.workflow,concerns_project(project))
     archive_check = False
-    while True:
+    async def render():
       if project.__class__.__name__ == "DaysOfCode":
         # Getting display message and view.
         embed = project.display_message(interaction.user)
         view = project.get_manage_view()
       else:
-        description = ""
-        if project.description:
-          description += project.description
         # Creating project message.
-        embed = discord.Embed(color=discord.Color.blurple(),title=project.name + f" - due <t:{project.get_unix_deadline()}:R>" if project.deadline else project.name,description=description)
-        # Adding status to message.
-        status = f"**`{project.status}`**"
-        embed.add_field(name="Status:",value=status,inline=True)
-        # Adding priority to message.
-        if project.priority:
-          embed.add_field(name="Priority:",value=f"**`{project.priority}`**",inline=True)
-        # Adding teams to message.
-        teams_list = ""
-        if len(project.get_teams_from_ids(self.workflow)) != 0:
-          for team in project.get_teams_from_ids(self.workflow):
-            team_role = self.guild.get_role(team.role_id)
-            teams_list += f"- {team_role.mention}\n"
-        else:
-          teams_list += "No teams."
-        embed.add_field(name="Teams:",value=teams_list,inline=True)
-        # Adding tasks to message.
-        task_list = ""
-        if len(project.tasks) != 0:
-          for task in project.tasks:
-            index = 0
-            if not task.archive:
-              index += 1
-              task_members_mention = ""
-              task_status = ""
-              if task.status:
-                task_status += f"**`{task.status}`**"
-              for member_id in task.member_ids:
-                member = await self.guild.fetch_member(member_id)
-                task_members_mention += member.mention 
-              task_list += f'{index}. {task.name} Due <t:{task.get_unix_deadline()}:R> {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
-              f'{index}. {task.name} {task_status} {task_members_mention}\n'
-            
-          if index == 0:
-            task_list += "No tasks."
-        else:
-          task_list += "No tasks."
-        embed.add_field(name="Tasks:",value=task_list,inline=False)
+        embed = render_manage(project,self.workflow,archive_check)
 
         # Creating relevant view.
         if await get_admin_role(self.guild) in self.command.user.roles:
@@ -122,7 +86,7 @@ class ProjectSelectMenu(discord.ui.Select):
             view.show_archive.disabled = True
           if archive_check:
             view.show_archive.disabled = True
-          if len(project.tasks) == 0:
+          if len(project.active_tasks) == 0:
             view.edit_task.disabled = True
             view.delete_task.disabled = True
         else:
@@ -134,51 +98,21 @@ class ProjectSelectMenu(discord.ui.Select):
             view.show_archive.disabled = True
           if archive_check:
             view.show_archive.disabled = True
-          if len(project.tasks) == 0:
+          if len(project.active_tasks) == 0:
             view.edit_task.disabled = True
             view.delete_task.disabled = True
+      return embed, view
 
-        if archive_check:
-          task_list = ""
-          if len(project.tasks) != 0:
-            for task in project.tasks:
-              index = 0
-              if task.archive:
-                index += 1
-                task_members_mention = ""
-                task_status = ""
-                if task.status:
-                  task_status += f"**`{task.status}`**"
-                for member_id in task.member_ids:
-                  member = await self.guild.fetch_member(member_id)
-                  task_members_mention += member.mention 
-                task_list += f'{index}. {task.name} Due <t:{task.get_unix_deadline()}:R> {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
-                f'{index}. {task.name} {task_status} {task_members_mention}\n'
-          else:
-            task_list += "No tasks."
-          embed.add_field(name="Archived Tasks:",value=task_list,inline=False)
-
-      if initial_check:
-        await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-        initial_check = False
-        await self.client.wait_for("interaction")
-      else:
-        await interaction.edit_original_response(embed=embed,view=view)
-        await self.client.wait_for("interaction")
-
-      await asyncio.sleep(0.5)
-
-      # Checking to close message.
-      if view.close_check:
-        await interaction.delete_original_response()
-        break
-      
+    def handle(view):
+      nonlocal archive_check
       # Adding archive to message.
       if view.archive_check:
         archive_check = True
       else:
         archive_check = False
 
+    await run_message_loop(interaction,session,render,handle,delete_after=300,ephemeral=True)
+
         
 
 class WorkflowManagerIndividualProjectView(discord.ui.View):
@@ -212,9 +146,9 @@ class WorkflowManagerIndividualProjectView(discord.ui.View):
     select_menu = self.create_status_menu(interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
 
     await interaction.delete_original_response()
 
@@ -228,9 +162,9 @@ class WorkflowManagerIndividualProjectView(discord.ui.View):
     select_menu = self.create_priority_menu(interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Finish Edit",style=discord.ButtonStyle.success)
@@ -246,9 +180,9 @@ class WorkflowManagerIndividualProjectView(discord.ui.View):
     select_menu = self.create_team_menu(True,interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Remove Team",style=discord.ButtonStyle.primary,row=2)
@@ -260,9 +194,9 @@ class WorkflowManagerIndividualProjectView(discord.ui.View):
     select_menu = self.create_team_menu(False,interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Add Task",style=discord.ButtonStyle.primary,row=2)
@@ -283,9 +217,7 @@ class WorkflowManagerIndividualProjectView(discord.ui.View):
   @discord.ui.button(label="Archive Completed",style=discord.ButtonStyle.primary,row=4)
   async def archive_completed(self,interaction:discord.Interaction,button:discord.ui.Button):
     # Setting all completed tasks to archive.
-    for task in self.project.tasks:
-      if task.status == "COMPLETED":
-        task.archive = True
+    self.project.archive_completed()
     await interaction.response.defer()
 
   @discord.ui.button(label="Show Archive",style=discord.ButtonStyle.primary,row=4)
@@ -332,22 +264,20 @@ class TeamManagerIndividualProjectView(discord.ui.View):
   @discord.ui.button(label="Request Approval",style=discord.ButtonStyle.primary)
   async def request_completion(self,interaction:discord.Interaction,button:discord.ui.Button):
     # Changing project status to APPROVAL PENDING.
-    self.project.status = "APPROVAL PENDING"
+    self.project.change_status("APPROVAL PENDING")
 
     # Sending update log in active channel.
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} requested approval for {self.project.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
     
     await interaction.response.defer()
 
   @discord.ui.button(label="Archive Completed",style=discord.ButtonStyle.primary)
   async def archive_completed(self,interaction:discord.Interaction,button:discord.ui.Button):
     # Setting all completed tasks to archive.
-    for task in self.project.tasks:
-      if task.status == "COMPLETED":
-        task.archive = True
+    self.project.archive_completed()
     await interaction.response.defer()
 
   @discord.ui.button(label="Show Archive",style=discord.ButtonStyle.primary)
@@ -395,7 +325,7 @@ class TeamSelectMenu(discord.ui.Select):
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} assigned {self.guild.get_role(team.role_id).mention} to {self.project.name}.")
         await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
       else:
         self.project.remove_team(team)
         logger.info(f"Removed {team.name} from ({self.project.name})")
@@ -404,7 +334,7 @@ class TeamSelectMenu(discord.ui.Select):
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} removed {self.guild.get_role(team.role_id).mention} from {self.project.name}.")
         await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class StatusSelectMenu(discord.ui.Select):
@@ -424,7 +354,7 @@ class StatusSelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set {self.project.name}'s status to {self.project.status}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class PrioritySelectMenu(discord.ui.Select):
@@ -444,7 +374,7 @@ class PrioritySelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set {self.project.name}'s priority to {self.project.priority}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 # - - - - - - - - - - - - - - - - - -
@@ -463,13 +393,13 @@ class ChangeTitleModal(discord.ui.Modal,title="Change Title"):
     # Original title.
     original_title = self.project.name
     # Changing title.
-    self.project.name = self.title_input.value
+    self.project.change_name(self.title_input.value)
 
     # Sending update log in active channel.
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set a project's title from {original_title} to {self.project.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
     await interaction.response.defer()
 
 
@@ -491,7 +421,7 @@ class ChangeDeadlineModal(discord.ui.Modal,title="Change Deadline"):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set {self.project.name}'s deadline to <t:{self.project.get_unix_deadline()}:R>.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
     await interaction.response.defer()
 
     await interaction.response.defer()
@@ -521,7 +451,7 @@ class AddTaskModal(discord.ui.Modal,title="Add Task"):
     description = f"{interaction.user.mention} added task, ({new_task.name}), to {self.project.name}." if self.deadline_input.value == "" else f"{interaction.user.mention} added task, ({self.task_input.value} {self.deadline_input.value}), to {self.project.name}."
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=description)
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 
@@ -537,19 +467,16 @@ class DelTaskModal(discord.ui.Modal,title="Delete Task"):
 
   async def on_submit(self, interaction: discord.Interaction):
     # Deleting task from project.
-    count = 0
-    for task in self.project.tasks:
-      if not task.archive:
-        count += 1
-      if count == int(self.number_input.value):
-        task_name = task.name
-        self.project.tasks.remove(task)
+    task = self.project.get_active_task(int(self.number_input.value))
+    if task:
+      task_name = task.name
+      self.project.remove_task(task)
 
-        # Sending update log in active channel.
-        logger.info("Sending update log in active channel.")
-        update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted task, ({task_name}), from {self.project.name}.")
-        await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+      # Sending update log in active channel.
+      logger.info("Sending update log in active channel.")
+      update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted task, ({task_name}), from {self.project.name}.")
+      await interaction.response.send_message(embed=update_embed,delete_after=3)
+      send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class EditTaskModal(discord.ui.Modal,title="Edit Task"):
@@ -567,25 +494,20 @@ class EditTaskModal(discord.ui.Modal,title="Edit Task"):
 
   async def on_submit(self, interaction: discord.Interaction):
     # Editing task from project.
-    count = 0
-    for task in self.project.tasks:
-      if not task.archive:
-        count += 1
-      if count == int(self.number_input.value):
-        # Creating tasks.
-        await send_edit_task_message(task,self.guild,self.client,self.workflow,self.command,interaction)
+    task = self.project.get_active_task(int(self.number_input.value))
+    if task:
+      # Creating tasks.
+      await send_edit_task_message(task,self.guild,self.client,self.workflow,self.command,interaction)
     
 
 # - - - - - - - - - - - - - - - - - -
       
 async def send_edit_task_message(task,guild,client,workflow,command,interaction):
   # Sending edit task message.
-  initial_check = True
-  while True:
+  session = Session(workflow,concerns_task(task))
+  async def render():
     # Getting task members.
-    task_members = []
-    for member_id in task.member_ids:
-      task_members.append(guild.get_member(member_id))
+    task_members = await get_resolver(guild).fetch_all(task.member_ids)
   
     # Getting description.
     if task.description:
@@ -620,21 +542,9 @@ async def send_edit_task_message(task,guild,client,workflow,command,interaction)
     available_members = get_member_selection(task,workflow,guild,False)
     if len(available_members) == 0:
       view.remove_member.disabled = True
+    return embed, view
 
-    if initial_check:
-      await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-      initial_check = False
-      await client.wait_for("interaction")
-    else:
-      await interaction.edit_original_response(embed=embed,view=view)
-      await client.wait_for("interaction")
-
-    await asyncio.sleep(0.5)
-
-    # Checking to close message.
-    if view.close_check:
-      await interaction.delete_original_response()
-      break
+  await run_message_loop(interaction,session,render,delete_after=300,ephemeral=True)
 
 
 # - - - - - - - - - - - - - - - - - -
@@ -682,18 +592,10 @@ def get_priority_selection():
   return options
 
 def get_completed_count(project):
-  count = 0
-  for task in project.tasks:
-    if task.status == "COMPLETED" and task.archive == False:
-      count += 1
-  return count
+  return project.completed_count
 
 def get_archive_count(project):
-  count = 0
-  for task in project.tasks:
-    if task.archive:
-      count += 1
-  return count
+  return project.archived_count
 
 # - - - - - - - - - - - - - - - - - -
 
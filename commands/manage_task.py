@@ -12,6 +12,9 @@ import logging
 import asyncio
 
 from discord.interactions import Interaction
+from members import get_resolver
+from scheduler import send_notice
+from sessions import Session, concerns_task, wait_for_message, run_message_loop
 from .log_message import send_log_message
 from .misc import get_admin_role, check_team_manager, check_team_manager_project, check_team_member_task
 
@@ -45,12 +48,10 @@ class TaskSelectMenu(discord.ui.Select):
     await self.command.delete_original_response()
 
   async def send_task_message(self,task,interaction):
-    initial_check = True
-    while True:
+    session = Session(self.workflow,concerns_task(task))
+    async def render():
       # Getting task members.
-      task_members = []
-      for member_id in task.member_ids:
-        task_members.append(self.guild.get_member(member_id))
+      task_members = await get_resolver(self.guild).fetch_all(task.member_ids)
     
       # Getting description.
       if task.description:
@@ -86,19 +87,9 @@ class TaskSelectMenu(discord.ui.Select):
           view.remove_member.disabled = True
       else:
         view = MemberIndividualTaskView(task,self.guild,self.client,self.workflow,self.command.user)
+      return embed, view
 
-      if initial_check:
-        await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-        initial_check = False
-        await self.client.wait_for("interaction")
-      else:
-        await interaction.edit_original_response(embed=embed,view=view)
-        await self.client.wait_for("interaction")
-
-      # Checking to close message.
-      if view.close_check:
-        await interaction.delete_original_response()
-        break
+    await run_message_loop(interaction,session,render,delay=0,delete_after=300,ephemeral=True)
 
 
 class ManagerIndividualTaskView(discord.ui.View):
@@ -157,9 +148,9 @@ class ManagerIndividualTaskView(discord.ui.View):
     select_menu = self.create_status_menu(interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Change Priority",style=discord.ButtonStyle.primary)
@@ -172,9 +163,9 @@ class ManagerIndividualTaskView(discord.ui.View):
     select_menu = self.create_priority_menu(interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Finish Edit",style=discord.ButtonStyle.success)
@@ -191,9 +182,9 @@ class ManagerIndividualTaskView(discord.ui.View):
     select_menu = self.create_member_menu(True,interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Remove Member",style=discord.ButtonStyle.primary,row=2)
@@ -205,9 +196,9 @@ class ManagerIndividualTaskView(discord.ui.View):
     select_menu = self.create_member_menu(False,interaction.user)
     view.add_item(select_menu)
     # Sending message.
-    await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+    message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
     # Deleting message after interaction.
-    await self.client.wait_for("interaction")
+    await wait_for_message(message)
     await interaction.delete_original_response()
 
   @discord.ui.button(label="Show Log",style=discord.ButtonStyle.primary,row=2)
@@ -237,13 +228,13 @@ class MemberIndividualTaskView(discord.ui.View):
   @discord.ui.button(label="Request Approval", style=discord.ButtonStyle.primary)
   async def request_approval(self,interaction:discord.Interaction,button:discord.Button):
     # Setting task status.
-    self.task.status = "APPROVAL PENDING"
+    self.task.change_status("APPROVAL PENDING")
     
     # Sending update log in active channel.
     logger.info("Sending update log in active channel.")  
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} requested approval for {self.task.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
   @discord.ui.button(label="Show Log",style=discord.ButtonStyle.primary)
   async def show_log(self,interaction:discord.Interaction,button:discord.Button):
@@ -270,23 +261,23 @@ class MemberSelectMenu(discord.ui.Select):
       member = self.guild.get_member_named(member_title)
       if self.menu_type:
         if member.id not in self.task.member_ids:
-          self.task.member_ids.append(member.id)
+          self.task.assign_member(member)
           logger.info(f"Assigned {member.name} to ({self.task.name})")
 
           # Sending update log in active channel.
           logger.info("Sending update log in active channel.")  
           update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} assigned {member.mention} to {self.task.name}.")
           await interaction.response.send_message(embed=update_embed,delete_after=3)
-          await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+          send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
       else:
-        self.task.member_ids.remove(member.id)
+        self.task.remove_member(member)
         logger.info(f"Removed {member.name} from ({self.task.name})")
 
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")  
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} removed {member.mention} from {self.task.name}.")
         await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class PrioritySelectMenu(discord.ui.Select):
@@ -306,7 +297,7 @@ class PrioritySelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set {self.task.name}'s priority to {self.task.priority}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class StatusSelectMenu(discord.ui.Select):
@@ -326,7 +317,7 @@ class StatusSelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set {self.task.name}'s status to {self.task.status}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 class LogSelectMenu(discord.ui.Select):
@@ -346,7 +337,7 @@ class LogSelectMenu(discord.ui.Select):
     logger.info("Sending update log in active channel.")  
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} removed a log from {self.task.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 # - - - - - - - - - - - - - - - - - - - - - -
     
@@ -368,7 +359,7 @@ class DescriptionModal(discord.ui.Modal,title="Change Description"):
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} set the description of {self.task.name}.")
     await interaction.response.send_message(embed=update_embed,delete_after=3)
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 class AddLogModal(discord.ui.Modal,title="Add Log"):
 
@@ -391,47 +382,30 @@ def get_available_tasks(command,workflow,manager_check):
   # Getting teams from the user's roles.
   teams = []
   manager_teams = []
-
-  # Getting teams from roles.
   for role in user.roles:
-    for team in workflow.teams:
-      if role.id == team.manager_role_id:
-        manager_teams.append(team)
-      if role.id == team.role_id:
-        teams.append(team)
+    manager_teams.extend(workflow.get_teams_from_manager_id(role.id))
+    teams.extend(workflow.get_teams_from_role_id(role.id))
 
   # Getting project ids from all teams.
-  project_ids = []
+  project_ids = set()
   manager_project_ids = []
   for team in teams:
-    for project in team.get_projects_from_ids(workflow):
-      if project.id not in project_ids:
-        project_ids.append(project.id)
+    project_ids.update(team.project_ids)
   for manager_team in manager_teams:
-    for project in manager_team.get_projects_from_ids(workflow):
-      if project.id not in manager_project_ids:
-        manager_project_ids.append(project.id)
-
-  # Getting projects from project ids.
-  projects = []
-  manager_projects = []
-  for project_id in project_ids:
-    projects.append(workflow.get_project_by_id(project_id))
+    for project_id in manager_team.project_ids:
+      if project_id not in manager_project_ids:
+        manager_project_ids.append(project_id)
+
+  # Getting all tasks of managed projects.
+  available_tasks = {}
   for manager_project_id in manager_project_ids:
-    manager_projects.append(workflow.get_project_by_id(manager_project_id))
-
-  # Getting tasks from projects.
-  available_tasks = []
-  for manager_project in manager_projects:
-    for task in manager_project.tasks:
-      if not task.archive:
-        available_tasks.append(task)
-  for project in projects:
-    for task in project.tasks:
-      if user.id in task.member_ids and not task.archive:
-        if task not in available_tasks:
-          available_tasks.append(task)
-  return available_tasks
+    for task in workflow.get_project_by_id(manager_project_id).active_tasks:
+      available_tasks[task] = None
+  # Getting tasks the user is assigned to in their teams' projects.
+  for task in workflow.get_member_tasks(user.id):
+    if task.project in project_ids and not task.archive:
+      available_tasks[task] = None
+  return list(available_tasks.keys())
 
 def create_task_options(tasks):
   # Creating task options.
@@ -453,9 +427,7 @@ def get_member_selection(task,workflow,guild,menu_type):
         if member not in member_selection and member.id not in task.member_ids:
           member_selection.append(member)
   else:
-    for member_id in task.member_ids:
-      member = guild.get_member(member_id)
-      member_selection.append(member)
+    member_selection = get_resolver(guild).get_all(task.member_ids)
   
   # Creating discord options.
   member_selection_options = []
@@ -10,6 +10,8 @@ import discord
 import logging
 import asyncio
 
+from scheduler import send_notice
+from sessions import Session, concerns_teams, wait_for_message, run_message_loop
 from .misc import get_admin_role
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -75,9 +77,9 @@ class IndividualTeamButtonView(discord.ui.View):
       select_menu = await self.create_member_menu(True)
       view.add_item(select_menu)
       # Sending message.
-      await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+      message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
       # Deleting message after interaction.
-      await self.client.wait_for("interaction")
+      await wait_for_message(message)
       await interaction.delete_original_response()
 
     @discord.ui.button(label="Remove Member", style=discord.ButtonStyle.primary)
@@ -89,9 +91,9 @@ class IndividualTeamButtonView(discord.ui.View):
       select_menu = await self.create_member_menu(False)
       view.add_item(select_menu)
       # Sending message.
-      await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
+      message = await interaction.response.send_message(embed=embed,view=view,ephemeral=True)
       # Deleting message after interaction.
-      await self.client.wait_for("interaction")
+      await wait_for_message(message)
       await interaction.delete_original_response()
 
     @discord.ui.button(label="Change Title", style=discord.ButtonStyle.primary)
@@ -126,7 +128,7 @@ class MemberSelectMenu(discord.ui.Select):
         logger.info("Sending update log in active channel.")  
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} assigned {member.mention} to {self.guild.get_role(self.team.role_id).mention}.")
         await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
       else:
         await member.remove_roles(self.guild.get_role(self.team.role_id))
         logger.info(f"Removed {member.name} from ({self.team.name})")
@@ -135,7 +137,7 @@ class MemberSelectMenu(discord.ui.Select):
         logger.info("Sending update log in active channel.")  
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} removed {member.mention} from {self.guild.get_role(self.team.role_id).mention}.")
         await interaction.response.send_message(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -176,15 +178,14 @@ class AddTeamModal(discord.ui.Modal,title="New Team"):
         # Changing role positions.
         new_role.position = manager_role.position - 1
         # Updating role id for new team.
-        self.workflow.teams[self.workflow.teams.index(new_team)].role_id = new_role.id
-        self.workflow.teams[self.workflow.teams.index(new_team)].manager_role_id = manager_role.id
+        new_team.set_roles(new_role.id,manager_role.id)
         logger.info("Updating role id of team.")
 
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} created a new team, `{new_role.mention}`.")
-        await interaction.channel.send(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(interaction.channel,embed=update_embed,delete_after=3)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
@@ -200,9 +201,10 @@ class EditTeamModal(discord.ui.Modal,title="Edit Team"):
     number_input = discord.ui.TextInput(label="Please enter a team number: ",style=discord.TextStyle.short,placeholder="Number",required=True,max_length=2)
 
     async def on_submit(self, interaction: discord.Interaction):
-        initial_check = True
+        session = Session(self.workflow,concerns_teams)
+        session.watch_guild(interaction.guild)
 
-        while True:
+        async def render():
             # Getting team.
             team = self.workflow.teams[int(self.number_input.value)-1]
             # Getting role for team.
@@ -231,28 +233,10 @@ class EditTeamModal(discord.ui.Modal,title="Edit Team"):
               view.assign_member.disabled = True
             if len(await get_member_selection(team,interaction.guild,False)) == 0:
               view.remove_member.disabled = True
+            return embed, view
 
-            if initial_check:
-                await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-                initial_check = False
-                # Waiting for either interaction or role update.
-                interaction_task = asyncio.create_task(self.client.wait_for('interaction'))
-                role_task = asyncio.create_task(self.client.wait_for('member_update'))
-                guild_task = asyncio.create_task(self.client.wait_for('guild_role_update'))
-                await asyncio.wait([interaction_task,role_task,guild_task],return_when=asyncio.FIRST_COMPLETED)
-            else:
-                # Waiting for either interaction or role update.
-                await interaction.edit_original_response(embed=embed,view=view)
-                interaction_task = asyncio.create_task(self.client.wait_for('interaction'))
-                role_task = asyncio.create_task(self.client.wait_for('member_update'))
-                guild_task = asyncio.create_task(self.client.wait_for('guild_role_update'))
-                await asyncio.wait([interaction_task,role_task,guild_task],return_when=asyncio.FIRST_COMPLETED)
-
-            # Waiting to check whether to close edit.
-            await asyncio.sleep(1)
-            if view.close_check:
-                await interaction.delete_original_response()
-                break
+        # Editing on either interaction, team change or role update in the guild.
+        await run_message_loop(interaction,session,render,delay=1,delete_after=300,ephemeral=True)
 
 
                
@@ -287,8 +271,8 @@ class DelTeamModal(discord.ui.Modal,title="Delete Team"):
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
         update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} deleted a team, `{deleted_team.name}`.")
-        await interaction.channel.send(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        send_notice(interaction.channel,embed=update_embed,delete_after=3)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
         await interaction.response.defer()
 
@@ -307,9 +291,9 @@ class ChangeTitleModal(discord.ui.Modal,title="Change Title"):
 
     async def on_submit(self,interaction: discord.Interaction):
         # Getting original title.
-        original_title = self.workflow.teams[self.workflow.teams.index(self.team)].name
+        original_title = self.team.name
         # Changing title of team.
-        self.workflow.teams[self.workflow.teams.index(self.team)].name = self.title_input.value
+        self.team.change_name(self.title_input.value)
         # Changing title of role.
         await self.role.edit(name=self.title_input.value)
         await self.manager_role.edit(name=self.title_input.value + " Manager")
@@ -318,9 +302,9 @@ class ChangeTitleModal(discord.ui.Modal,title="Change Title"):
 
         # Sending update log in active channel.
         logger.info("Sending update log in active channel.")
-        update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} changed the title of `{original_title}` to `{self.workflow.teams[self.workflow.teams.index(self.team)].name}`.")
-        await interaction.channel.send(embed=update_embed,delete_after=3)
-        await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+        update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} changed the title of `{original_title}` to `{self.team.name}`.")
+        send_notice(interaction.channel,embed=update_embed,delete_after=3)
+        send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
         
         await interaction.response.defer()
 
@@ -356,80 +340,60 @@ async def display_teams(interaction, workflow, client):
     guild = interaction.guild
     
     logger.info("Command request approved.")
-    initial_check = True
-    # Sending teams embed.
-    while True:
-        try:
-            # Creating embed for message.
-            embed = discord.Embed(color=discord.Color.blurple(),title="Teams")  
-
-            # Creating content of message.
-            if len(workflow.teams) != 0:
-                for team in workflow.teams:
-                    # Getting roles from team's role id.
-                    team_role = guild.get_role(team.role_id)
-                    manager_role = guild.get_role(team.manager_role_id)
-                    attempt = 0
-                    while True:
-                        if team_role == None and attempt < 5:
-                            team_role = guild.get_role(team.role_id)
-                            manager_role = guild.get_role(team.manager_role_id)
-                            attempt += 1
-                            await asyncio.sleep(0.2)
-                        else:
-                            break
-                    
-                    if team_role:
-                      # Creating task list for field.
-                      team_starter = f"**{workflow.teams.index(team)+1}.{team_role.mention}**\n"
-                      member_list = ""
-                      manager_list = ""
-                      if len(team_role.members) != 0:
-                          for member in team_role.members:
-                            if member not in manager_role.members:
-                              member_list += f'- {member.name}\n'
-                            else:
-                              manager_list += f'- {member.name} - **Manager**\n'
-                      else:
-                          member_list += "No members."
+    session = Session(workflow,concerns_teams)
+    session.watch_guild(guild)
+    async def render():
+        # Creating embed for message.
+        embed = discord.Embed(color=discord.Color.blurple(),title="Teams")  
+
+        # Creating content of message.
+        if len(workflow.teams) != 0:
+            for team in workflow.teams:
+                # Getting roles from team's role id.
+                team_role = guild.get_role(team.role_id)
+                manager_role = guild.get_role(team.manager_role_id)
+                attempt = 0
+                while True:
+                    if team_role == None and attempt < 5:
+                        team_role = guild.get_role(team.role_id)
+                        manager_role = guild.get_role(team.manager_role_id)
+                        attempt += 1
+                        await asyncio.sleep(0.2)
                     else:
-                      team_starter = f"**{workflow.teams.index(team)+1}.{team.name}**\n"
-                      manager_list = ""
-                      member_list = "No members."
+                        break
+                
+                if team_role:
+                  # Creating task list for field.
+                  team_starter = f"**{workflow.teams.index(team)+1}.{team_role.mention}**\n"
+                  member_list = ""
+                  manager_list = ""
+                  if len(team_role.members) != 0:
+                      for member in team_role.members:
+                        if member not in manager_role.members:
+                          member_list += f'- {member.name}\n'
+                        else:
+                          manager_list += f'- {member.name} - **Manager**\n'
+                  else:
+                      member_list += "No members."
+                else:
+                  team_starter = f"**{workflow.teams.index(team)+1}.{team.name}**\n"
+                  manager_list = ""
+                  member_list = "No members."
 
-                    embed.add_field(name="",value=(team_starter+manager_list+member_list),inline=False)
+                embed.add_field(name="",value=(team_starter+manager_list+member_list),inline=False)
 
-            else:
-                embed.description = 'No existing teams.'
-            
-            # Creating button view.
-            view = TeamsButtonView(workflow,client)
-            if len(workflow.teams) == 0:  
-                view.edit_team.disabled = True
-                view.delete_team.disabled = True
-
-            # Updating message.
-            if initial_check:
-                await interaction.response.send_message(embed=embed,view=view,delete_after=300,ephemeral=True)
-                initial_check = False
-                # Waiting for either interaction or role update.
-                interaction_task = asyncio.create_task(client.wait_for('interaction'))
-                member_task = asyncio.create_task(client.wait_for('member_update'))
-                role_task = asyncio.create_task(client.wait_for('guild_role_delete'))
-                await asyncio.wait([interaction_task,member_task,role_task],return_when=asyncio.FIRST_COMPLETED)
-                await asyncio.sleep(1)
-            else:
-                # Waiting for either interaction or role update.
-                await interaction.edit_original_response(embed=embed,view=view)
-                interaction_task = asyncio.create_task(client.wait_for('interaction'))
-                member_task = asyncio.create_task(client.wait_for('member_update'))
-                role_task = asyncio.create_task(client.wait_for('guild_role_delete'))
-                await asyncio.wait([interaction_task,member_task,role_task],return_when=asyncio.FIRST_COMPLETED)
-                await asyncio.sleep(1)
-
-            if view.close_check:
-              await interaction.delete_original_response()
-              break
-
-        except Exception as e:
-          print(e)
\ No newline at end of file
+        else:
+            embed.description = 'No existing teams.'
+        
+        # Creating button view.
+        view = TeamsButtonView(workflow,client)
+        if len(workflow.teams) == 0:  
+            view.edit_team.disabled = True
+            view.delete_team.disabled = True
+        return embed, view
+
+    # Sending teams embed, edited on either interaction, team change or role update in the guild.
+    try:
+        await run_message_loop(interaction,session,render,delay=1,delete_after=300,ephemeral=True)
+    except Exception as e:
+      print(e)
\ No newline at end of file
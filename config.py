@@ -0,0 +1,85 @@
+'''
+Module for configuring the Workflow Bot.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+# - - - - - - - - - - - - - - - - - - -
+# Storage.
+
+# Storage backend, either "sqlite" or "json".
+STORAGE_BACKEND = "sqlite"
+
+# SQLite database file.
+DATABASE_PATH = "server_workflows.db"
+
+# Directory of json files for each guild and journal file.
+DATA_DIRECTORY = "server_workflows"
+JOURNAL_PATH = "server_workflows.journal"
+
+# Single json file used before guilds were stored separately, migrated on first load.
+SNAPSHOT_PATH = "server_workflows.json"
+
+# Encoding of stored guilds, either "json" or "msgpack", and compression, either None, "gzip" or "zstd".
+# Files in any of these are read regardless of the setting.
+STORAGE_FORMAT = "json"
+STORAGE_COMPRESSION = None
+
+# Seconds between autosaves of changed guilds to the snapshot.
+AUTOSAVE_INTERVAL = 60
+
+# Forcing each journal record to disk before continuing.
+JOURNAL_FSYNC = True
+
+# - - - - - - - - - - - - - - - - - - -
+# Startup.
+
+# Guilds fetched from discord at the same time when loading.
+HYDRATION_CONCURRENCY = 10
+
+# Seconds allowed to fetch a guild's discord objects before giving up on them.
+HYDRATION_TIMEOUT = 30
+
+# Loading each guild from storage when first used instead of at startup.
+LAZY_LOADING = True
+
+# - - - - - - - - - - - - - - - - - - -
+# Board.
+
+# Seconds between edits of each guild's board, changes within this are merged into one edit.
+BOARD_EDIT_INTERVAL = 5
+
+# Seconds an open message waits for interactions or changes before it stops updating.
+SESSION_TIMEOUT = 900
+
+# Most seconds between checking 100 Days of Code progress, so new members are checked.
+PROGRESS_CHECK_INTERVAL = 60 * 60
+
+# - - - - - - - - - - - - - - - - - - -
+# Requests.
+
+# Requests sent to discord at the same time, each rate limit bucket only sending one at a time.
+REQUEST_CONCURRENCY = 5
+# Requests for a single guild sent at the same time, so one busy guild cannot hold every request.
+GUILD_REQUEST_CONCURRENCY = 2
+
+# Seconds between logging stats of edits, member lookups, requests and autosaves.
+STATS_LOG_INTERVAL = 60 * 60
+
+# - - - - - - - - - - - - - - - - - - -
+# Members.
+
+# Members cached for each guild, and seconds they are kept for.
+MEMBER_CACHE_SIZE = 1000
+MEMBER_CACHE_TTL = 600
+
+# Seconds members who have left are remembered, so they are not fetched again.
+MEMBER_NOT_FOUND_TTL = 300
+
+# - - - - - - - - - - - - - - - - - - -
+# Deadlines.
+
+# Timezone deadlines fall at midnight in, such as "Europe/London", or None for the server's local time.
+DEADLINE_TIMEZONE = None
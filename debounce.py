@@ -0,0 +1,34 @@
+'''
+Module for merging bursts of changes into single updates.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import time
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Debouncer():
+  """ Waiting for changes, running at most once per interval however many arrive."""
+
+  def __init__(self,interval) -> None:
+    self.interval = interval
+    self.changed = asyncio.Event()
+    self.last_run = None
+
+  # Signalling a change.
+  def signal(self,*args) -> None:
+    self.changed.set()
+
+  # Waiting for a change, then for the rest of the interval since the last update so later changes are merged into it.
+  async def wait(self) -> None:
+    await self.changed.wait()
+    if self.last_run is not None:
+      delay = self.last_run + self.interval - time.monotonic()
+      if delay > 0:
+        await asyncio.sleep(delay)
+    self.changed.clear()
+    self.last_run = time.monotonic()
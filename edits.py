@@ -0,0 +1,84 @@
+'''
+Module for skipping edits which would not change a message.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import hashlib
+import json
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Edits sent and skipped as unchanged, so the saving can be measured.
+stats = {"sent": 0, "suppressed": 0}
+
+# Fields of a message which change how it looks.
+FINGERPRINT_FIELDS = ("content","embed","view")
+
+# - - - - - - - - - - - - - - - - - - -
+
+class MessageEdits():
+  """ Fingerprint of what was last sent to a message, skipping edits which would send the same again."""
+
+  def __init__(self) -> None:
+    self.fingerprint = None
+    # View on the message, kept when an edit is skipped as the view sent with it still receives its interactions.
+    self.view = None
+
+  # Sending or editing message with the fields, unless unchanged since last sent.
+  # Returns the result of sending, None if skipped.
+  async def send(self,send,**fields):
+    fingerprint = get_fingerprint(fields)
+    if fingerprint == self.fingerprint:
+      stats["suppressed"] += 1
+      return None
+
+    result = await send(**fields)
+    # Counting edits only, the first send of a message is never skipped.
+    if self.fingerprint is not None:
+      stats["sent"] += 1
+    self.fingerprint = fingerprint
+    if "view" in fields:
+      self.view = fields["view"]
+    return result
+
+  # Forgetting what was sent, so the next edit is always sent.
+  def reset(self) -> None:
+    self.fingerprint = None
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Getting fingerprint of the content, embed and component layout of message fields.
+def get_fingerprint(fields) -> str:
+  payload = {}
+  for field in FINGERPRINT_FIELDS:
+    if field in fields:
+      value = fields[field]
+      if field == "embed":
+        value = value.to_dict() if value else None
+      elif field == "view":
+        value = get_layout(value) if value else None
+      payload[field] = value
+  encoded = json.dumps(payload,sort_keys=True,default=str).encode()
+  return hashlib.blake2b(encoded,digest_size=16).hexdigest()
+
+
+# Getting components of a view without their custom ids, which are random for each view created.
+def get_layout(view) -> list:
+  layout = []
+  for row in view.to_components():
+    components = []
+    for component in row["components"]:
+      component = dict(component)
+      component.pop("custom_id",None)
+      components.append(component)
+    layout.append(components)
+  return layout
+
+
+# Getting edit stats, with the share of edits skipped as unchanged.
+def get_edit_stats() -> dict:
+  edits = stats["sent"] + stats["suppressed"]
+  return dict(stats,suppressed_rate=stats["suppressed"] / edits if edits else 0.0)
@@ -0,0 +1,77 @@
+'''
+Module for encoding stored workflows as json or msgpack, optionally compressed.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import gzip
+import json
+
+import config
+
+try:
+  import msgpack
+except ImportError:
+  msgpack = None
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Leading bytes of each compression.
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Checking the modules needed for a format and compression are installed.
+def check_available(format=config.STORAGE_FORMAT,compression=config.STORAGE_COMPRESSION):
+  if format not in ["json","msgpack"]:
+    raise ValueError(f"Unknown storage format, {format}.")
+  if compression not in [None,"gzip","zstd"]:
+    raise ValueError(f"Unknown storage compression, {compression}.")
+  if format == "msgpack" and msgpack is None:
+    raise RuntimeError("Storage format msgpack needs the msgpack package installed.")
+  if compression == "zstd" and zstandard is None:
+    raise RuntimeError("Storage compression zstd needs the zstandard package installed.")
+
+
+# Getting file extension for a format and compression.
+def get_extension(format=config.STORAGE_FORMAT,compression=config.STORAGE_COMPRESSION):
+  return ".json" if format == "json" and compression is None else ".bin"
+
+
+# Encoding data into bytes.
+def encode(data,format=config.STORAGE_FORMAT,compression=config.STORAGE_COMPRESSION) -> bytes:
+  if format == "msgpack":
+    encoded = msgpack.packb(data)
+  else:
+    encoded = json.dumps(data).encode("utf-8")
+
+  if compression == "gzip":
+    return gzip.compress(encoded,compresslevel=6)
+  if compression == "zstd":
+    return zstandard.ZstdCompressor(level=3).compress(encoded)
+  return encoded
+
+
+# Decoding bytes in any format and compression.
+def decode(encoded: bytes):
+  if encoded.startswith(GZIP_MAGIC):
+    encoded = gzip.decompress(encoded)
+  elif encoded.startswith(ZSTD_MAGIC):
+    if zstandard is None:
+      raise RuntimeError("Reading zstd compressed storage needs the zstandard package installed.")
+    encoded = zstandard.ZstdDecompressor().decompress(encoded)
+
+  # Json workflows always start with an object, msgpack maps never start with "{".
+  if encoded.lstrip()[:1] == b"{":
+    return json.loads(encoded)
+  if msgpack is None:
+    raise RuntimeError("Reading msgpack storage needs the msgpack package installed.")
+  return msgpack.unpackb(encoded)
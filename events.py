@@ -0,0 +1,172 @@
+'''
+Module for events emitted when a workflow changes.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+# - - - - - - - - - - - - - - - - - - -
+
+class EventBus():
+  """ Calling subscribers of each type of event emitted by a workflow."""
+
+  def __init__(self) -> None:
+    self.subscribers = {}
+    # Callbacks for each event type, including subscribers to its base types.
+    self.dispatch = {}
+
+  # Subscribing callback to events of a type and its subclasses.
+  def subscribe(self,event_type,callback):
+    self.subscribers.setdefault(event_type,[]).append(callback)
+    self.dispatch.clear()
+    return callback
+
+  # Unsubscribing callback from events of a type.
+  def unsubscribe(self,event_type,callback) -> None:
+    self.subscribers[event_type].remove(callback)
+    self.dispatch.clear()
+
+  # Emitting event, only creating it when there are subscribers.
+  def emit(self,event_type,*args) -> None:
+    callbacks = self.dispatch.get(event_type)
+    if callbacks is None:
+      callbacks = [callback for base_type in event_type.__mro__ for callback in self.subscribers.get(base_type,())]
+      self.dispatch[event_type] = callbacks
+    if len(callbacks) == 0:
+      return
+    event = event_type(*args)
+    for callback in callbacks:
+      callback(event)
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Event():
+  """ Change to a workflow."""
+
+  __slots__ = ("workflow",)
+
+  def __init__(self,workflow) -> None:
+    self.workflow = workflow
+
+# Active channel, active message or next ids changed.
+class WorkflowChanged(Event):
+  __slots__ = ()
+
+
+class ProjectEvent(Event):
+  """ Change to a project."""
+
+  __slots__ = ("project",)
+
+  def __init__(self,workflow,project) -> None:
+    super().__init__(workflow)
+    self.project = project
+
+class ProjectAdded(ProjectEvent):
+  __slots__ = ()
+
+class ProjectChanged(ProjectEvent):
+  __slots__ = ()
+
+class ProjectRemoved(ProjectEvent):
+  __slots__ = ()
+
+# DaysOfCode progress of a member changed.
+class ProgressChanged(ProjectEvent):
+  __slots__ = ("member_id",)
+
+  def __init__(self,workflow,project,member_id) -> None:
+    super().__init__(workflow,project)
+    self.member_id = member_id
+
+
+class TaskEvent(Event):
+  """ Change to a task."""
+
+  __slots__ = ("task",)
+
+  def __init__(self,workflow,task) -> None:
+    super().__init__(workflow)
+    self.task = task
+
+class TaskAdded(TaskEvent):
+  __slots__ = ()
+
+class TaskChanged(TaskEvent):
+  __slots__ = ()
+
+class TaskStatusChanged(TaskChanged):
+  __slots__ = ()
+
+class TaskArchiveChanged(TaskChanged):
+  __slots__ = ()
+
+class TaskMembersChanged(TaskChanged):
+  __slots__ = ()
+
+class TaskRemoved(TaskEvent):
+  __slots__ = ()
+
+class LogEvent(TaskEvent):
+  """ Change to a log of a task."""
+
+  __slots__ = ("log_datetime",)
+
+  def __init__(self,workflow,task,log_datetime) -> None:
+    super().__init__(workflow,task)
+    self.log_datetime = log_datetime
+
+class LogAppended(LogEvent):
+  __slots__ = ()
+
+class LogRemoved(LogEvent):
+  __slots__ = ()
+
+
+class TeamEvent(Event):
+  """ Change to a team."""
+
+  __slots__ = ("team",)
+
+  def __init__(self,workflow,team) -> None:
+    super().__init__(workflow)
+    self.team = team
+
+class TeamAdded(TeamEvent):
+  __slots__ = ()
+
+class TeamChanged(TeamEvent):
+  __slots__ = ()
+
+class TeamRemoved(TeamEvent):
+  __slots__ = ()
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Subscribing storage to the events it writes, returning subscriptions to remove it later.
+def subscribe_storage(bus,storage):
+  subscriptions = [
+    (WorkflowChanged, lambda event: storage.save_workflow(event.workflow)),
+    (ProjectAdded, lambda event: storage.save_project(event.workflow,event.project)),
+    (ProjectChanged, lambda event: storage.save_project(event.workflow,event.project)),
+    (ProjectRemoved, lambda event: storage.delete_project(event.workflow,event.project)),
+    (ProgressChanged, lambda event: storage.save_progress(event.workflow,event.project,event.member_id)),
+    (TaskAdded, lambda event: storage.save_task(event.workflow,event.task)),
+    (TaskChanged, lambda event: storage.save_task(event.workflow,event.task)),
+    (TaskRemoved, lambda event: storage.delete_task(event.workflow,event.task)),
+    (LogAppended, lambda event: storage.save_log(event.workflow,event.task,event.log_datetime)),
+    (LogRemoved, lambda event: storage.delete_log(event.workflow,event.task,event.log_datetime)),
+    (TeamAdded, lambda event: storage.save_team(event.workflow,event.team)),
+    (TeamChanged, lambda event: storage.save_team(event.workflow,event.team)),
+    (TeamRemoved, lambda event: storage.delete_team(event.workflow,event.team)),
+  ]
+  for event_type, callback in subscriptions:
+    bus.subscribe(event_type,callback)
+  return subscriptions
+
+
+# Unsubscribing storage.
+def unsubscribe_storage(bus,subscriptions) -> None:
+  for event_type, callback in subscriptions:
+    bus.unsubscribe(event_type,callback)
@@ -0,0 +1,198 @@
+'''
+Module for hydrating loaded workflows with discord objects.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import logging
+import time
+from collections.abc import MutableMapping
+
+import config
+from members import get_resolver
+
+# - - - - - - - - - - - - - - - - - - -
+
+global logger
+logger = logging.getLogger()
+
+# - - - - - - - - - - - - - - - - - - -
+
+class LazyWorkflows(MutableMapping):
+  """ Workflows dictionary that loads each guild from storage when first used."""
+
+  def __init__(self,client=None,storage=None) -> None:
+    self.client = client
+    self.storage = storage
+    # Guilds only stored on disk and guilds loaded into memory.
+    self.unloaded: set = set(storage.get_guild_ids()) if storage else set()
+    self.loaded: dict = {}
+    # Called with each workflow loaded after startup.
+    self.on_load = None
+
+  def __getitem__(self,guild_id):
+    if guild_id in self.loaded:
+      return self.loaded[guild_id]
+    if guild_id not in self.unloaded:
+      raise KeyError(guild_id)
+
+    # Building workflow and resolving discord objects from the client cache.
+    start_time = time.perf_counter()
+    workflow = resolve_workflow(self.client,guild_id,*self.storage.load_guild(guild_id))
+    self.unloaded.discard(guild_id)
+    self.loaded[guild_id] = workflow
+    logger.info(f"Loaded guild on first use, {guild_id}, in {time.perf_counter() - start_time:.3f}s.")
+
+    if self.on_load:
+      self.on_load(workflow)
+    return workflow
+
+  def __setitem__(self,guild_id,workflow):
+    self.unloaded.discard(guild_id)
+    self.loaded[guild_id] = workflow
+
+  def __delitem__(self,guild_id):
+    if guild_id in self.loaded:
+      del self.loaded[guild_id]
+    elif guild_id in self.unloaded:
+      self.unloaded.remove(guild_id)
+    else:
+      raise KeyError(guild_id)
+
+  def __contains__(self,guild_id):
+    return guild_id in self.loaded or guild_id in self.unloaded
+
+  def __iter__(self):
+    yield from list(self.loaded.keys())
+    yield from list(self.unloaded)
+
+  def __len__(self):
+    return len(self.loaded) + len(self.unloaded)
+
+  # Removing guild without loading it.
+  def pop(self,guild_id,*default):
+    if guild_id in self.unloaded:
+      self.unloaded.remove(guild_id)
+      return None
+    return self.loaded.pop(guild_id,*default)
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Setting discord objects of a workflow from the client cache, without requests.
+def resolve_workflow(client,guild_id,workflow,active_channel_id,active_message_id):
+  guild = client.get_guild(int(guild_id))
+
+  # Setting active channel and message.
+  resolve_active_message(client,workflow,active_channel_id,active_message_id)
+
+  # Getting DaysOfCode members.
+  if guild and workflow.check_days_of_code():
+    project = workflow.get_days_of_code()
+    resolver = get_resolver(guild)
+    for member_id in project.progress.keys():
+      member = resolver.get(member_id)
+      if member:
+        project.members.append(member)
+      else:
+        logger.info(f"DaysOfCode member not cached, {guild_id}, {member_id}.")
+
+  return workflow
+
+
+# Setting active channel and message of a workflow from the client cache.
+def resolve_active_message(client,workflow,active_channel_id,active_message_id):
+  workflow.active_channel = client.get_channel(active_channel_id) if active_channel_id else None
+  workflow.active_message = workflow.active_channel.get_partial_message(active_message_id) if workflow.active_channel and active_message_id else None
+
+
+# Setting discord objects of loaded workflows again after reconnecting, keeping those no longer cached.
+def rehydrate_workflows(client,workflows):
+  for guild_id, workflow in workflows.loaded.items():
+    if workflow.active_channel and client.get_channel(workflow.active_channel.id):
+      resolve_active_message(client,workflow,workflow.active_channel.id,workflow.active_message.id if workflow.active_message else None)
+  logger.info(f"Rehydrated {len(workflows.loaded)} loaded guilds.")
+
+
+# Hydrating workflows concurrently, pending maps guild ids to (workflow, active channel id, active message id).
+async def hydrate_workflows(client,pending,stage_times=None):
+  stage_times = stage_times if stage_times is not None else {}
+  for stage in ["guild","channel","message","members"]:
+    stage_times.setdefault(stage,0.0)
+  semaphore = asyncio.Semaphore(config.HYDRATION_CONCURRENCY)
+  start_time = time.perf_counter()
+
+  guild_ids = list(pending.keys())
+  results = await asyncio.gather(*[hydrate_guild(client,semaphore,stage_times,guild_id,*pending[guild_id]) for guild_id in guild_ids])
+  stage_times["hydration"] = time.perf_counter() - start_time
+
+  # Adding workflows to workflows.
+  workflows = {}
+  for guild_id in guild_ids:
+    workflows[guild_id] = pending[guild_id][0]
+
+  logger.info(f"Hydrated {len(workflows)} guilds, {results.count(False)} incomplete.")
+  logger.info("Startup stage times, " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in stage_times.items()) + ".")
+  logger.info("- - - - - - - - - - - - - - - - - - - - - -")
+  return workflows
+
+
+# Hydrating a single guild within the concurrency limit and timeout, returning if complete.
+async def hydrate_guild(client,semaphore,stage_times,guild_id,workflow,active_channel_id,active_message_id):
+  async with semaphore:
+    try:
+      await asyncio.wait_for(fetch_guild_objects(client,stage_times,guild_id,workflow,active_channel_id,active_message_id),config.HYDRATION_TIMEOUT)
+      return True
+    except asyncio.TimeoutError:
+      logger.warning(f"Hydrating guild timed out, {guild_id}.")
+    except Exception as e:
+      logger.warning(f"Hydrating guild failed, {guild_id}, {e}")
+    return False
+
+
+# Fetching guild, then active board and DaysOfCode members side by side, raising if the guild is not fetched.
+async def fetch_guild_objects(client,stage_times,guild_id,workflow,active_channel_id,active_message_id):
+  start_time = time.perf_counter()
+  try:
+    guild = await client.fetch_guild(guild_id)
+  finally:
+    stage_times["guild"] += time.perf_counter() - start_time
+
+  await asyncio.gather(
+    fetch_active_message(guild,stage_times,workflow,active_channel_id,active_message_id),
+    fetch_members(guild,stage_times,workflow)
+  )
+
+
+# Setting active channel and message.
+async def fetch_active_message(guild,stage_times,workflow,active_channel_id,active_message_id):
+  start_time = time.perf_counter()
+  try:
+    workflow.active_channel = await guild.fetch_channel(active_channel_id)
+  except:
+    workflow.active_channel = None
+    logger.info(f"Active channel unsuccessfully fetched, {guild.id}.")
+    return
+  finally:
+    stage_times["channel"] += time.perf_counter() - start_time
+
+  start_time = time.perf_counter()
+  try:
+    workflow.active_message = await workflow.active_channel.fetch_message(active_message_id)
+  except:
+    workflow.active_message = None
+    logger.info(f"Active message unsuccessfully fetched, {guild.id}.")
+  finally:
+    stage_times["message"] += time.perf_counter() - start_time
+
+
+# Fetching DaysOfCode members.
+async def fetch_members(guild,stage_times,workflow):
+  if not workflow.check_days_of_code():
+    return
+  start_time = time.perf_counter()
+  project = workflow.get_days_of_code()
+  project.members.extend(await get_resolver(guild).fetch_all(project.progress.keys()))
+  stage_times["members"] += time.perf_counter() - start_time
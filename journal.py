@@ -0,0 +1,393 @@
+'''
+Module for journalling workflow changes between saves of per-guild json files.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import logging
+import json
+import os
+import time
+
+import config
+import encoding
+from json_storage import get_attributes, serialize_project, serialize_task, snapshot_workflow, build_workflow, write_file
+from hydration import LazyWorkflows
+
+# - - - - - - - - - - - - - - - - - - -
+
+global logger
+logger = logging.getLogger()
+
+# Extensions of guild files in each format.
+GUILD_EXTENSIONS = [".json",".bin"]
+
+# - - - - - - - - - - - - - - - - - - -
+
+class JournalStorage():
+
+  def __init__(self,data_directory=config.DATA_DIRECTORY,journal_path=config.JOURNAL_PATH,snapshot_path=config.SNAPSHOT_PATH) -> None:
+    encoding.check_available()
+    self.data_directory = data_directory
+    self.snapshot_path = snapshot_path
+    self.journal_path = journal_path
+    self.journal_file = open(journal_path,"ab")
+
+    # Live workflows and guilds changed since the last autosave.
+    self.workflows = LazyWorkflows()
+    self.dirty = set()
+    self.autosave_lock = asyncio.Lock()
+
+    # Autosave statistics for monitoring.
+    self.save_stats = {
+      "saves": 0,
+      "guilds_serialized": 0,
+      "bytes_written": 0,
+      "last_guilds_serialized": 0,
+      "last_bytes_written": 0,
+      "last_save_seconds": 0.0
+    }
+
+  # Appending a record to the journal and marking its guild as changed.
+  def append(self,record):
+    self.journal_file.write((json.dumps(record,separators=(",",":")) + "\n").encode("utf-8"))
+    self.journal_file.flush()
+    if config.JOURNAL_FSYNC:
+      os.fsync(self.journal_file.fileno())
+    self.dirty.add(record["g"])
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Workflow specific methods.
+
+  def save_workflow(self,workflow):
+    self.append({
+      "op": "w",
+      "g": workflow.guild_id,
+      "c": workflow.active_channel.id if workflow.active_channel else None,
+      "m": workflow.active_message.id if workflow.active_message else None,
+      "np": workflow.next_project_id,
+      "nt": workflow.next_team_id,
+      "b": workflow.board_message_ids
+    })
+
+  def delete_workflow(self,guild_id):
+    self.append({"op": "-w", "g": guild_id})
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Project specific methods.
+
+  def save_project(self,workflow,project):
+    self.append({"op": "p", "g": workflow.guild_id, "d": serialize_project(project)})
+
+  def delete_project(self,workflow,project):
+    self.append({"op": "-p", "g": workflow.guild_id, "p": project.id})
+
+  def save_progress(self,workflow,project,member_id):
+    self.append({
+      "op": "dc",
+      "g": workflow.guild_id,
+      "p": project.id,
+      "m": member_id,
+      "v": project.progress[member_id],
+      "t": project.time_checked[member_id]
+    })
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Task specific methods.
+
+  def save_task(self,workflow,task):
+    self.append({"op": "t", "g": workflow.guild_id, "d": serialize_task(task)})
+
+  def delete_task(self,workflow,task):
+    self.append({"op": "-t", "g": workflow.guild_id, "p": task.project, "t": task.id})
+
+  def save_log(self,workflow,task,log_datetime):
+    self.append({"op": "l", "g": workflow.guild_id, "p": task.project, "t": task.id, "k": log_datetime, "v": task.logs[log_datetime]})
+
+  def delete_log(self,workflow,task,log_datetime):
+    self.append({"op": "-l", "g": workflow.guild_id, "p": task.project, "t": task.id, "k": log_datetime})
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Team specific methods.
+
+  def save_team(self,workflow,team):
+    self.append({"op": "tm", "g": workflow.guild_id, "d": get_attributes(team)})
+
+  def delete_team(self,workflow,team):
+    self.append({"op": "-tm", "g": workflow.guild_id, "id": team.id})
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Loading and autosave methods.
+
+  # Loading guild files with the journal replayed into them.
+  def load(self):
+    # Removing a record torn by a crash so new records start on their own line.
+    self.journal_file.close()
+    with open(self.journal_path,"rb+") as journal_file:
+      journal = journal_file.read()
+      if len(journal) != 0 and not journal.endswith(b"\n"):
+        logger.warning("Removing incomplete final journal record.")
+        journal_file.truncate(journal.rfind(b"\n")+1)
+    self.journal_file = open(self.journal_path,"ab")
+
+    # Splitting a single snapshot file into guild files.
+    if not os.path.isdir(self.data_directory):
+      os.makedirs(self.data_directory + ".tmp",exist_ok=True)
+      if os.path.exists(self.snapshot_path):
+        logger.info(f"Splitting {self.snapshot_path} into guild files.")
+        with open(self.snapshot_path,"rb") as snapshot_file:
+          write_guilds(self.data_directory + ".tmp",encoding.decode(snapshot_file.read()))
+      os.replace(self.data_directory + ".tmp",self.data_directory)
+
+    # Replaying journal into the files of changed guilds.
+    records = read_journal(self.journal_path)
+    if len(records) != 0:
+      workflows_json = {}
+      changed_guilds = {record["g"] for record in records}
+      for guild_id in changed_guilds:
+        guild_json = self.read_guild(guild_id)
+        if guild_json is not None:
+          workflows_json[guild_id] = guild_json
+      for record in records:
+        try:
+          apply_record(workflows_json,record)
+        except (KeyError,IndexError) as e:
+          logger.warning(f"Skipping journal record that does not apply, {record['op']} for guild {record['g']}, {e}")
+      write_guilds(self.data_directory,{guild_id: workflows_json.get(guild_id) for guild_id in changed_guilds})
+      logger.info(f"Replayed {len(records)} journal records into {len(changed_guilds)} guild files.")
+    self.trim_journal(self.journal_file.tell())
+    self.dirty = set()
+
+  # Getting ids of all stored guilds.
+  def get_guild_ids(self):
+    return list({os.path.splitext(file_name)[0] for file_name in os.listdir(self.data_directory) if os.path.splitext(file_name)[1] in GUILD_EXTENSIONS})
+
+  # Reading file of a guild in any format, quarantining it if unreadable.
+  def read_guild(self,guild_id):
+    path = find_guild_path(self.data_directory,guild_id)
+    if path is None:
+      return None
+    try:
+      with open(path,"rb") as guild_file:
+        return encoding.decode(guild_file.read())
+    except Exception as e:
+      quarantine_path = os.path.join(self.data_directory,"quarantine",f"{guild_id}.{int(time.time())}{os.path.splitext(path)[1]}")
+      os.makedirs(os.path.dirname(quarantine_path),exist_ok=True)
+      os.replace(path,quarantine_path)
+      logger.error(f"Guild file unreadable, moved to {quarantine_path}, {e}")
+      return None
+
+  # Reading files of all guilds, used when not loading lazily.
+  def read_all(self):
+    workflows_json = {}
+    for guild_id in self.get_guild_ids():
+      guild_json = self.read_guild(guild_id)
+      workflows_json[guild_id] = guild_json if guild_json is not None else empty_guild()
+    return workflows_json
+
+  # Loading workflow and its active channel and message ids for a guild from its file.
+  def load_guild(self,guild_id):
+    logger.info(f"Loading data for guild, {guild_id}.")
+    guild_json = self.read_guild(guild_id)
+    if guild_json is None:
+      # Starting quarantined guild again from empty.
+      guild_json = empty_guild()
+      self.dirty.add(guild_id)
+    workflow = build_workflow(guild_id,guild_json)
+    workflow.set_storage(self)
+    return (workflow,guild_json['active_channel'],guild_json['active_message'])
+
+  # Saving guilds changed since the last autosave and trimming the journal, one autosave at a time.
+  async def autosave(self):
+    # Holding the lock from snapshot to trim, so another autosave never trims the journal or writes guild files in between.
+    async with self.autosave_lock:
+      if len(self.dirty) == 0:
+        return
+      start_time = time.perf_counter()
+
+      # Records up to here are covered by this save.
+      journal_offset = self.journal_file.tell()
+      dirty, self.dirty = self.dirty, set()
+
+      # Taking snapshots of changed guilds on the event loop, encoding and writing them in a worker thread.
+      snapshots = {}
+      for guild_id in dirty:
+        if guild_id in self.workflows.loaded:
+          snapshots[guild_id] = snapshot_workflow(self.workflows.loaded[guild_id])
+        elif guild_id not in self.workflows:
+          snapshots[guild_id] = None
+      # Keeping changed guilds not loaded, with their records, until they are saved.
+      unsaved = {guild_id for guild_id in dirty if guild_id not in snapshots}
+      if len(unsaved) != 0:
+        logger.info(f"Keeping journal records of {len(unsaved)} changed guilds not loaded.")
+      try:
+        bytes_written = await asyncio.to_thread(write_guilds,self.data_directory,snapshots)
+      except:
+        self.dirty |= dirty
+        raise
+      self.dirty |= unsaved
+      self.trim_journal(journal_offset,unsaved)
+
+      # Updating statistics.
+      self.save_stats["saves"] += 1
+      self.save_stats["guilds_serialized"] += len(snapshots)
+      self.save_stats["bytes_written"] += bytes_written
+      self.save_stats["last_guilds_serialized"] = len(snapshots)
+      self.save_stats["last_bytes_written"] = bytes_written
+      self.save_stats["last_save_seconds"] = time.perf_counter() - start_time
+      logger.info(f"Autosaved {len(snapshots)} changed guilds, {bytes_written} bytes in {self.save_stats['last_save_seconds']:.3f}s.")
+
+  # Removing journal records up to an offset, keeping those of unsaved guilds and any appended since.
+  def trim_journal(self,offset,unsaved=()):
+    self.journal_file.close()
+    with open(self.journal_path,"rb") as journal_file:
+      saved = journal_file.read(offset)
+      remaining = journal_file.read()
+    if len(unsaved) != 0:
+      remaining = b"".join(line for line in saved.splitlines(keepends=True) if json.loads(line)["g"] in unsaved) + remaining
+    with open(self.journal_path + ".tmp","wb") as journal_file:
+      journal_file.write(remaining)
+      journal_file.flush()
+      os.fsync(journal_file.fileno())
+    os.replace(self.journal_path + ".tmp",self.journal_path)
+    self.journal_file = open(self.journal_path,"ab")
+
+  # Starting background autosave.
+  def start_autosave(self):
+    self.autosave_task = asyncio.create_task(self.run_autosave())
+
+  # Autosaving in the background.
+  async def run_autosave(self):
+    while True:
+      await asyncio.sleep(config.AUTOSAVE_INTERVAL)
+      try:
+        await self.autosave()
+      except Exception as e:
+        logger.error(f"Autosave failed, {e}")
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Reading every record of a journal file.
+def read_journal(path):
+  records = []
+  if not os.path.exists(path):
+    return records
+  with open(path,encoding="utf-8") as journal_file:
+    for line in journal_file:
+      try:
+        records.append(json.loads(line))
+      except json.JSONDecodeError:
+        logger.warning(f"Stopping replay at unreadable journal record in {path}.")
+        break
+  return records
+
+
+# Getting path of the file of a guild in the configured format.
+def get_guild_path(directory,guild_id):
+  return os.path.join(directory,f"{guild_id}{encoding.get_extension()}")
+
+
+# Finding existing file of a guild, preferring the configured format.
+def find_guild_path(directory,guild_id):
+  extensions = sorted(GUILD_EXTENSIONS,key=lambda extension: extension != encoding.get_extension())
+  for extension in extensions:
+    path = os.path.join(directory,f"{guild_id}{extension}")
+    if os.path.exists(path):
+      return path
+  return None
+
+
+# Writing file of each guild atomically in the configured format, removing guilds set to None, returning bytes written.
+def write_guilds(directory,workflows_json):
+  bytes_written = 0
+  for guild_id, guild_json in workflows_json.items():
+    path = get_guild_path(directory,guild_id) if guild_json is not None else None
+    if path:
+      bytes_written += write_file(path,encoding.encode(guild_json))
+    # Removing files of the guild in other formats.
+    for extension in GUILD_EXTENSIONS:
+      other_path = os.path.join(directory,f"{guild_id}{extension}")
+      if other_path != path and os.path.exists(other_path):
+        os.remove(other_path)
+  return bytes_written
+
+
+# Creating json structure of a guild without any data.
+def empty_guild():
+  return {"active_channel": None, "active_message": None, "projects": {}, "teams": {}}
+
+
+# Applying a journal record to the json structure.
+def apply_record(workflows_json,record):
+  operation = record["op"]
+
+  if operation == "-w":
+    workflows_json.pop(record["g"],None)
+    return
+
+  guild = workflows_json.setdefault(record["g"],empty_guild())
+  projects = guild["projects"]
+
+  if operation == "w":
+    guild["active_channel"] = record["c"]
+    guild["active_message"] = record["m"]
+    guild["next_project_id"] = record.get("np",1)
+    guild["next_team_id"] = record.get("nt",1)
+    guild["board_message_ids"] = record.get("b",[])
+
+  elif operation == "p":
+    project_id = str(record["d"]["id"])
+    tasks = projects[project_id]["tasks"] if project_id in projects else []
+    projects[project_id] = record["d"]
+    projects[project_id]["tasks"] = tasks
+
+  elif operation == "-p":
+    projects.pop(str(record["p"]),None)
+
+  elif operation == "dc":
+    project = projects[str(record["p"])]
+    project["progress"][str(record["m"])] = record["v"]
+    project["time_checked"][str(record["m"])] = record["t"]
+    if record["m"] not in project["member_ids"]:
+      project["member_ids"].append(record["m"])
+
+  elif operation == "t":
+    tasks = projects[str(record["d"]["project"])]["tasks"]
+    for index, task in enumerate(tasks):
+      if task["id"] == record["d"]["id"]:
+        record["d"]["logs"] = task["logs"]
+        tasks[index] = record["d"]
+        break
+    else:
+      record["d"]["logs"] = {}
+      tasks.append(record["d"])
+
+  elif operation == "-t":
+    project = projects[str(record["p"])]
+    project["tasks"] = [task for task in project["tasks"] if task["id"] != record["t"]]
+
+  elif operation in ["l","-l"]:
+    for task in projects[str(record["p"])]["tasks"]:
+      if task["id"] == record["t"]:
+        if operation == "l":
+          task["logs"][record["k"]] = record["v"]
+        else:
+          task["logs"].pop(record["k"],None)
+
+  elif operation == "tm":
+    # Teams are keyed by name, so keep position when renamed.
+    teams = {}
+    for team_name, team in guild["teams"].items():
+      if team["id"] == record["d"]["id"]:
+        teams[record["d"]["name"]] = record["d"]
+      else:
+        teams[team_name] = team
+    if record["d"]["name"] not in teams:
+      teams[record["d"]["name"]] = record["d"]
+    guild["teams"] = teams
+
+  elif operation == "-tm":
+    guild["teams"] = {team_name: team for team_name, team in guild["teams"].items() if team["id"] != record["id"]}
@@ -6,10 +6,13 @@ Created on Monday 5th February 2024.
 
 '''
 
-import discord
 import logging
-import json
-from workflow import Workflow
+import os
+import time
+from collections.abc import Mapping
+
+from workflow import Workflow, Task, get_next_id, load_deadline
+from hydration import hydrate_workflows
 
 # - - - - - - - - - - - - - - - - - - -
 
@@ -18,155 +21,156 @@ logger = logging.getLogger()
 
 # - - - - - - - - - - - - - - - - - - -
 
-def save_to_json(workflows):
-  logging.info("Saving workflows as json file.")
-
-  # Creating new structure for storing as json.
-  workflows_json = {}
-
-  for server_id in workflows.keys():
-    # Creating dictionary to store guild details.
-    guild_dictionary = {}
-
-    # Creating dictionary to store all projects.
-    projects_dictionary = {}
-
-    # Creating dictionary to store all teams.
-    teams_dictionary = {}
-
-    # Adding active channel name to dictionary.
-    guild_dictionary['active_channel'] = workflows[server_id].active_channel.id if workflows[server_id].active_channel else None
-    guild_dictionary['active_message'] = workflows[server_id].active_message.id if workflows[server_id].active_message else None
-
-
-    for project in workflows[server_id].projects:
-      serialized_project = project
-      # Serializing tasks.
-      serialized_tasks = []
-      for task in project.tasks:
-        try:
-          serialized_tasks.append(vars(task))
-        except:
-          logger.info("Failed attempt to save to JSON, already serialized.")
-          return
-      serialized_project.tasks = serialized_tasks
-      # Serializing DaysOfCode project.
-      if project.__class__.__name__ == "DaysOfCode":
-        for member in project.members:
-          project.member_ids.append(member.id)
-        del project.members
-      # Adding project dictionary.
-      projects_dictionary[project.id] = vars(serialized_project)
-    
-
-    for team in workflows[server_id].teams:
-      # Adding team dictionary.
-      teams_dictionary[team.name] = vars(team)
-
-
-    # Adding dictionaries to guild dictionary.
-    guild_dictionary['projects'] = projects_dictionary
-    guild_dictionary['teams'] = teams_dictionary
-
-    # Adding guild dictionary
-    workflows_json[server_id] = guild_dictionary
-
-
-  with open("server_workflows.json", "w") as outfile: 
-      json.dump(workflows_json, outfile)
-  logging.info("All data saved.")
-  logging.info("Disconnecting from client.")
-  logger.info("- - - - - - - - - - - - - - - - - - - - - -")
+# Writing file atomically, returning bytes written.
+def write_file(path,data):
+  with open(path + ".tmp","wb") as output_file:
+    output_file.write(data)
+    output_file.flush()
+    os.fsync(output_file.fileno())
+  os.replace(path + ".tmp",path)
+  return len(data)
+
+
+# Getting attributes of an object to store, detached from the live object.
+def get_attributes(item):
+  return {key: detach(getattr(item,key)) for key in item.stored_attributes}
+
+# Copying containers so a snapshot never shares state with live objects, with keys as strings in every format.
+def detach(value):
+  if isinstance(value,Mapping):
+    return {str(key): detach(item) for key, item in value.items()}
+  if isinstance(value,(list,tuple)):
+    return tuple(detach(item) for item in value)
+  return value
+
+# Serializing a project without its tasks.
+def serialize_project(project):
+  attributes = get_attributes(project)
+  if project.__class__.__name__ == "DaysOfCode":
+    attributes['member_ids'] = tuple(project.progress.keys())
+  return attributes
+
+# Serializing a task without its logs.
+def serialize_task(task):
+  attributes = get_attributes(task)
+  del attributes['logs']
+  return attributes
+
+# Taking a snapshot of a workflow that shares no state with it.
+def snapshot_workflow(workflow):
+  projects_dictionary = {}
+  for project in workflow.projects:
+    projects_dictionary[str(project.id)] = serialize_project(project)
+    projects_dictionary[str(project.id)]['tasks'] = tuple(get_attributes(task) for task in project.tasks)
+
+  teams_dictionary = {}
+  for team in workflow.teams:
+    teams_dictionary[team.name] = get_attributes(team)
+
+  return {
+    'active_channel': workflow.active_channel.id if workflow.active_channel else None,
+    'active_message': workflow.active_message.id if workflow.active_message else None,
+    'next_project_id': workflow.next_project_id,
+    'next_team_id': workflow.next_team_id,
+    'board_message_ids': list(workflow.board_message_ids),
+    'projects': projects_dictionary,
+    'teams': teams_dictionary
+  }
 
 
 # Converting json into workflows dictionary.    
 async def convert_from_json(workflow_json, client):
-  # Creating workflow dictionary.
-  workflows = {}
-
+  # Building workflows from json.
+  start_time = time.perf_counter()
+  pending = {}
   for guild_id in workflow_json.keys():
-    logger.info(f"Loading data for guild, {guild_id}.")
-    guild = await client.fetch_guild(guild_id)
-    # Creating new workflow.
-    workflow = Workflow()
-
-    # Setting active channel.
-    try:
-      workflow.active_channel = await (await client.fetch_guild(guild_id)).fetch_channel(workflow_json[guild_id]['active_channel'])
-      logger.info("Active channel successfully fetched.")
-    except:
-      workflow.active_channel = None
-      logger.info("Active channel unsuccessfully fetched.")
-
-    # Setting active message
-    try:
-      workflow.active_message = await workflow.active_channel.fetch_message(workflow_json[guild_id]['active_message'])
-      logger.info("Active message successfully fetched.")
-    except:
-      workflow.active_message = None
-      logger.info("Active message unsuccessfully fetched.")
-    
-
-    # Adding projects.
-    for project_id in workflow_json[guild_id]['projects'].keys():
-      # Getting project details.
-      project_title = workflow_json[guild_id]['projects'][project_id]['name']
-      project_deadline = workflow_json[guild_id]['projects'][project_id]['deadline']
-      project_deadline = f"{project_deadline['day']} {project_deadline['month']} {project_deadline['year']}" if project_deadline else None
-
-      # Adding project if DaysOfCode.
-      if project_title == "100 Days of Code":
-        project = workflow.add_100days_project()
-        for member_id in workflow_json[guild_id]['projects'][project_id]['member_ids']:
-          project.members.append(await guild.fetch_member(member_id))
-        for member_id in workflow_json[guild_id]['projects'][project_id]['progress'].keys():
-          project.progress[int(member_id)] =workflow_json[guild_id]['projects'][project_id]['progress'][member_id]
-        for member_id in workflow_json[guild_id]['projects'][project_id]['time_checked']:
-          project.time_checked[int(member_id)] = workflow_json[guild_id]['projects'][project_id]['time_checked'][member_id]
-      else:
-        # Adding project. 
-        project = workflow.add_project(project_title,project_deadline)
-      project.team_ids = workflow_json[guild_id]['projects'][project_id]['team_ids']
-      logger.info(f"Loading project, {project_title} ({project_deadline}).")
-
-      # Adding tasks.
-      for task in workflow_json[guild_id]['projects'][project_id]['tasks']:
-        # Getting task details.
-        task_name = task['name']
-        task_deadline = task['deadline']
-        task_deadline = f"{task_deadline['day']} {task_deadline['month']} {task_deadline['year']}" if task_deadline else None
-
-        # Adding task.
-        if project.__class__.__name__ != "DaysOfCode":
-          new_task = project.add_task(task_name,task_deadline)
-
-          # Adding attributes to task.
-          new_task.member_ids = task['member_ids']
-          new_task.description = task['description']
-          new_task.status = task['status']
-          new_task.priority = task['priority']
-          new_task.archive = task['archive']
-          new_task.logs = task['logs']
-
-        logger.info(f"Loading task, {task_name} ({task_deadline}).")
-    
-
-    # Adding teams.
-    for team_name in workflow_json[guild_id]['teams'].keys():
-      # Getting team details.
-      role_id = workflow_json[guild_id]['teams'][team_name]['role_id']
-      manager_role_id = workflow_json[guild_id]['teams'][team_name]['manager_role_id']
-
-      # Adding team.
-      team = workflow.add_team(team_name,role_id=role_id,manager_role_id=manager_role_id)
-      team.project_ids = workflow_json[guild_id]['teams'][team_name]['project_ids']
-      logger.info(f"Loading team, {team_name}.")
-
-    # Adding workflow to workflows.
-    workflows[guild_id] = workflow
-    logger.info("- - - - - - - - - - - - - - - - - - - - - -")
+    pending[guild_id] = (build_workflow(guild_id,workflow_json[guild_id]),workflow_json[guild_id]['active_channel'],workflow_json[guild_id]['active_message'])
+  stage_times = {"build": time.perf_counter() - start_time}
+
+  # Fetching discord objects for all guilds concurrently.
+  workflows = await hydrate_workflows(client,pending,stage_times)
 
   logger.info("Data loading finished.")
   logger.info("- - - - - - - - - - - - - - - - - - - - - -")
 
   return workflows
+
+
+# Building workflow for a guild from json, without discord objects.
+def build_workflow(guild_id, guild_json) -> Workflow:
+  logger.info(f"Loading data for guild, {guild_id}.")
+  # Creating new workflow.
+  workflow = Workflow(guild_id)
+
+  # Adding projects.
+  for project_id in guild_json['projects'].keys():
+    # Getting project details.
+    project_title = guild_json['projects'][project_id]['name']
+    project_deadline = load_deadline(guild_json['projects'][project_id]['deadline'])
+
+    # Adding project if DaysOfCode.
+    if project_title == "100 Days of Code":
+      project = workflow.add_100days_project(int(project_id))
+      for member_id in guild_json['projects'][project_id]['progress'].keys():
+        project.progress[int(member_id)] = guild_json['projects'][project_id]['progress'][member_id]
+      for member_id in guild_json['projects'][project_id]['time_checked']:
+        project.time_checked[int(member_id)] = guild_json['projects'][project_id]['time_checked'][member_id]
+    else:
+      # Adding project. 
+      project = workflow.add_project(project_title,project_id=int(project_id))
+      project.deadline = project_deadline
+    project.team_ids = guild_json['projects'][project_id]['team_ids']
+    project.description = guild_json['projects'][project_id]['description']
+    project.status = guild_json['projects'][project_id]['status']
+    project.priority = guild_json['projects'][project_id]['priority']
+    # Next task id is past every stored id, so tasks renumbered below never collide with one loaded after them.
+    stored_ids = [task['id'] for task in guild_json['projects'][project_id]['tasks']]
+    project.next_task_id = max(guild_json['projects'][project_id].get('next_task_id',1),max(stored_ids,default=0) + 1)
+    logger.info(f"Loading project, {project_title} ({project_deadline}).")
+
+    # Adding tasks.
+    for task in guild_json['projects'][project_id]['tasks']:
+      # Getting task details.
+      task_name = task['name']
+      task_deadline = load_deadline(task['deadline'])
+
+      # Adding task.
+      if project.__class__.__name__ != "DaysOfCode":
+        task_id = task['id']
+        # Renumbering tasks sharing an id, which files saved before ids were kept can hold after a deletion.
+        if project.get_task_by_id(task_id):
+          task_id = project.next_task_id
+          project.next_task_id += 1
+          logger.info(f"Renumbering task with duplicate id, {project.name}, {task_name}, {task['id']} to {task_id}.")
+        new_task = Task(task_name,None,task_id,project.id)
+        new_task.deadline = task_deadline
+        new_task.member_ids = tuple(task['member_ids'])
+
+        # Adding attributes to task, before loading so it is counted under its state.
+        new_task.description = task['description']
+        new_task.status = task['status']
+        new_task.priority = task['priority']
+        new_task.archive = task['archive']
+        project.load_task(new_task)
+        for log_datetime, log_info in task['logs'].items():
+          new_task.set_log(log_datetime,log_info)
+
+      logger.info(f"Loading task, {task_name} ({task_deadline}).")
+  
+
+  # Adding teams.
+  for team_name in guild_json['teams'].keys():
+    # Getting team details.
+    role_id = guild_json['teams'][team_name]['role_id']
+    manager_role_id = guild_json['teams'][team_name]['manager_role_id']
+
+    # Adding team.
+    team = workflow.add_team(team_name,role_id=role_id,manager_role_id=manager_role_id,team_id=guild_json['teams'][team_name]['id'])
+    team.project_ids = guild_json['teams'][team_name]['project_ids']
+    logger.info(f"Loading team, {team_name}.")
+
+  # Setting next ids, from the largest stored ids for data saved before they were kept.
+  workflow.next_project_id = max(guild_json.get('next_project_id',1),get_next_id(workflow.projects))
+  workflow.next_team_id = max(guild_json.get('next_team_id',1),get_next_id(workflow.teams))
+  workflow.board_message_ids = guild_json.get('board_message_ids',[])
+  return workflow
@@ -13,12 +13,22 @@ import pathlib
 import logging.config
 import logging.handlers
 import json
+import os
 import asyncio
 import traceback
 
 import commands
+import config
+import encoding
 import workflow
-from json_storage import save_to_json,convert_from_json
+from json_storage import convert_from_json
+from sqlite_storage import SQLiteStorage, load_from_sqlite
+from journal import JournalStorage
+from hydration import LazyWorkflows, rehydrate_workflows
+from members import get_resolver, get_member_stats
+from edits import get_edit_stats
+from scheduler import get_scheduler_stats
+from sessions import dispatch_interaction, dispatch_guild
 
 # - - - - - - - - - - - - - - - - - - - - - - - 
 
@@ -114,7 +124,9 @@ def init_events(client,tree):
             logger.info("Workflow Manager role has been created.")
 
         # Creating workflow for guild.
-        new_workflow = workflow.Workflow()
+        new_workflow = workflow.Workflow(str(guild.id))
+        new_workflow.set_storage(storage)
+        storage.save_workflow(new_workflow)
         logger.info("Creating new workflow for server.")
 
         # Adding workflow to dictionary.
@@ -127,6 +139,7 @@ def init_events(client,tree):
         logging.info("Member's role updated event.")
         # Getting workflow.
         guild = after.guild
+        dispatch_guild(guild)
         workflow = workflows[str(guild.id)]
         # Getting list of manager role ids.
         manager_ids = workflow.get_manager_role_ids()
@@ -149,13 +162,23 @@ def init_events(client,tree):
                 logging.info(f"Adding member to standard team role, {team_role.name}")
         logger.info("- - - - - - - - - - - - - - - - - - - - - -")
 
-        
+    # On member leaving event.
+    @client.event
+    async def on_member_remove(member):
+        # Forgetting member so they are fetched and found to have left.
+        get_resolver(member.guild).forget(member.id)
+
+    # On role update event, updating messages showing the guild's roles.
+    @client.event
+    async def on_guild_role_update(before, after):
+      dispatch_guild(after.guild)
 
     @client.event
     async def on_guild_role_delete(role):
       logging.info("Role deleted event.")
       # Getting workflow.
       guild = role.guild
+      dispatch_guild(guild)
       workflow = workflows[str(guild.id)]
       # Getting list of manager role ids.
       manager_ids = workflow.get_manager_role_ids()
@@ -167,7 +190,7 @@ def init_events(client,tree):
         # Getting team and deleting.
         team = workflow.get_team_from_manager_id(role.id)
         logging.info(f"Deleting team, {team.name}")
-        workflow.del_team(workflow.teams.index(team)+1)
+        workflow.remove_team(team.id)
         # Removing team member role.
         logging.info(f"Deleting team member role.")
         role = guild.get_role(team.role_id)
@@ -178,7 +201,7 @@ def init_events(client,tree):
         # Getting team and deleting.
         team = workflow.get_team_from_role_id(role.id)
         logging.info(f"Deleting team, {team.name}")
-        workflow.del_team(workflow.teams.index(team)+1)
+        workflow.remove_team(team.id)
         # Removing team manager role.
         logging.info(f"Deleting team member role.")
         role = guild.get_role(team.manager_role_id)
@@ -195,15 +218,29 @@ def init_events(client,tree):
         logger.info(f"Removed discord server ({guild.name}).")
 
         # Removing guild from workflow.
-        workflows.pop(str(guild.id))
+        guild_workflow = workflows.pop(str(guild.id),None)
+        if guild_workflow:
+            commands.stop_looping(guild_workflow)
+        storage.delete_workflow(str(guild.id))
         logger.info("Removing guild from workflows dictionary.")
         logger.info("- - - - - - - - - - - - - - - - - - - - - -")
             
+    # On interaction event.
+    @client.event
+    async def on_interaction(interaction):
+        # Loading guild so its active message responds again.
+        if interaction.guild and str(interaction.guild.id) in workflows:
+            workflows[str(interaction.guild.id)]
+        # Waking messages waiting on interactions with them.
+        dispatch_interaction(interaction)
+
     # On disconnect event.
     @client.event
     async def on_disconnect():
-      # Saving data to json.
-      save_to_json(workflows)
+      # Saving changed guilds to their json files.
+      if config.STORAGE_BACKEND == "json" and storage:
+        await storage.autosave()
+      logger.info("Disconnecting from client.")
       logger.info("- - - - - - - - - - - - - - - - - - - - - -")
 
     @client.event
@@ -335,15 +372,19 @@ def init_commands(client,tree):
     try:
       logger.info("Requesting reset server command.")
       # Deleting original Workflow.
-      del workflows[str(interaction.guild.id)]
-      # Creating new Workflow.
-      workflows[str(interaction.guild.id)] = workflow.Workflow()
+      old_workflow = workflows.pop(str(interaction.guild.id))
+      if old_workflow:
+        commands.stop_looping(old_workflow)
     except KeyError as e:
       logger.error(f"KeyError: {e}")
       logger.error(f"Guild {e} not included in Workflows.")
-      # Creating workflow object.
       logger.info("Creating new Workflow object for server.")
-      workflows[str(interaction.guild.id)] = workflow.Workflow()
+    # Creating new Workflow.
+    storage.delete_workflow(str(interaction.guild.id))
+    new_workflow = workflow.Workflow(str(interaction.guild.id))
+    new_workflow.set_storage(storage)
+    storage.save_workflow(new_workflow)
+    workflows[str(interaction.guild.id)] = new_workflow
     # Sending message.
     await interaction.response.send_message("WorkflowBot has been reset for this server.",ephemeral=True)
     
@@ -355,44 +396,102 @@ def init_commands(client,tree):
 
 async def init_saved(client):
     # Loading workflows dictionary.
-    global workflows
-    
-    load_check = False
-
-    try:
-        # Loading json.
-        json_file = open('server_workflows.json',)
-        workflows_import = json.load(json_file)
-        load_check = True
-    except:
-        # Creating new dictionary.
-        workflows = {}
-
-    if load_check:
-        workflows = await convert_from_json(workflows_import, client)
+    global workflows, storage
+
+    # Keeping workflows loaded before reconnecting, only setting their discord objects again.
+    if workflows is not None:
+        rehydrate_workflows(client,workflows)
+        return
+
+    if config.STORAGE_BACKEND == "json":
+        # Opening journal and starting autosave.
+        storage = JournalStorage()
+        storage.start_autosave()
+
+        # Loading guild files with journal replayed.
+        storage.load()
+        workflows = LazyWorkflows(client, storage)
+        if not config.LAZY_LOADING:
+            workflows.loaded = await convert_from_json(storage.read_all(), client)
+            workflows.unloaded = set()
+            for guild_workflow in workflows.loaded.values():
+                guild_workflow.set_storage(storage)
+        storage.workflows = workflows
+        return
+
+    # Opening SQLite storage.
+    storage = SQLiteStorage()
+
+    if storage.check_empty() and os.path.exists(config.SNAPSHOT_PATH):
+        # Migrating json to SQLite.
+        logger.info("Migrating server_workflows.json to SQLite.")
+        with open(config.SNAPSHOT_PATH,"rb") as json_file:
+            workflows_import = encoding.decode(json_file.read())
+        workflows = LazyWorkflows(client, storage)
+        for guild_id, guild_workflow in (await convert_from_json(workflows_import, client)).items():
+            storage.save_all(guild_workflow)
+            guild_workflow.set_storage(storage)
+            workflows[guild_id] = guild_workflow
+    else:
+        workflows = LazyWorkflows(client, storage)
+        if not config.LAZY_LOADING:
+            workflows.loaded = await load_from_sqlite(storage, client)
+            workflows.unloaded = set()
 
 
 async def init_message_looping(client):
     task_list = []
-    for guild_id in workflows.keys():
+    for guild_id in workflows.loaded.keys():
         logger.info(f"Restarting message looping, {guild_id}")
         if workflows[guild_id].active_message:
             logger.info(f"Active message retrieved.")
             restart_looping_task = asyncio.create_task(commands.restart_looping(client,workflows[guild_id],await client.fetch_guild(guild_id)))
             task_list.append(restart_looping_task)
+
+    # Restarting message looping for guilds when first used.
+    workflows.on_load = lambda guild_workflow: start_message_looping(client,guild_workflow)
     
-    # Restarting progress looping.
-    logger.info("Restarting progress looping.")
-    progress_task = asyncio.create_task(commands.restart_days_of_code_looping(workflows,client))
-    task_list.append(progress_task)
+    # Restarting progress looping, unless still running from before reconnecting.
+    global progress_task
+    if progress_task is None or progress_task.done():
+        logger.info("Restarting progress looping.")
+        progress_task = asyncio.create_task(commands.restart_days_of_code_looping(workflows,client))
+        task_list.append(progress_task)
+
+    # Starting stats logging.
+    global stats_task
+    if stats_task is None or stats_task.done():
+        stats_task = asyncio.create_task(log_stats())
 
     logger.info("- - - - - - - - - - - - - - - - - - - - - -")
 
     if len(task_list) != 0:
       await asyncio.wait(task_list)
 
+
+# Logging stats of edits, member lookups, requests and autosaves each interval.
+async def log_stats():
+    while True:
+        await asyncio.sleep(config.STATS_LOG_INTERVAL)
+        logger.info(f"Edit stats, {get_edit_stats()}")
+        logger.info(f"Member stats, {get_member_stats()}")
+        logger.info(f"Request stats, {get_scheduler_stats()}")
+        if config.STORAGE_BACKEND == "json":
+            logger.info(f"Autosave stats, {storage.save_stats}")
+
+
+def start_message_looping(client,guild_workflow):
+    if guild_workflow.active_message:
+        logger.info(f"Restarting message looping, {guild_workflow.guild_id}")
+        asyncio.create_task(commands.restart_looping(client,guild_workflow,client.get_guild(int(guild_workflow.guild_id))))
+
 # - - - - - - - - - - - - - - - - - - - - - - - 
 
+workflows = None
+storage = None
+progress_task = None
+stats_task = None
+
 if __name__ == "__main__":
 
     global client 
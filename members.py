@@ -0,0 +1,145 @@
+'''
+Module for resolving members of guilds from their ids.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+import config
+
+# - - - - - - - - - - - - - - - - - - -
+
+global logger
+logger = logging.getLogger()
+
+# Resolver of each guild id.
+resolvers = {}
+
+# - - - - - - - - - - - - - - - - - - -
+
+class MemberResolver():
+  """ Members of a guild, cached for a time and fetched once however many ask at the same time."""
+
+  def __init__(self,guild,size=config.MEMBER_CACHE_SIZE,ttl=config.MEMBER_CACHE_TTL,not_found_ttl=config.MEMBER_NOT_FOUND_TTL) -> None:
+    self.guild = guild
+    self.size = size
+    self.ttl = ttl
+    self.not_found_ttl = not_found_ttl
+    # Members by id with the time they expire, least recently used first, None for members who have left.
+    self.cache = OrderedDict()
+    # Fetches in progress by member id.
+    self.fetching = {}
+    self.stats = {"hits": 0, "not_found_hits": 0, "misses": 0, "fetches": 0, "coalesced": 0, "not_found": 0, "errors": 0}
+
+  # Getting member from the cache or the client's member cache, without requests.
+  # Returns the cached entry as (found, member), found is False when unknown.
+  def lookup(self,member_id):
+    entry = self.cache.get(member_id)
+    if entry and entry[1] > time.monotonic():
+      self.cache.move_to_end(member_id)
+      if entry[0] is None:
+        self.stats["not_found_hits"] += 1
+      else:
+        self.stats["hits"] += 1
+      return (True,entry[0])
+
+    member = self.guild.get_member(member_id) if self.guild else None
+    if member:
+      self.stats["hits"] += 1
+      self.store(member_id,member,self.ttl)
+      return (True,member)
+    return (False,None)
+
+  # Storing member, removing least recently used members over the size.
+  def store(self,member_id,member,ttl) -> None:
+    self.cache[member_id] = (member,time.monotonic() + ttl)
+    self.cache.move_to_end(member_id)
+    while len(self.cache) > self.size:
+      self.cache.popitem(last=False)
+
+  # Getting member without requests, None if not cached or left.
+  def get(self,member_id):
+    found, member = self.lookup(member_id)
+    if not found:
+      self.stats["misses"] += 1
+    return member
+
+  # Getting cached members of ids, skipping those not cached or left.
+  def get_all(self,member_ids) -> list:
+    members = [self.get(member_id) for member_id in member_ids]
+    return [member for member in members if member]
+
+  # Getting member, fetching if not cached, None if left.
+  async def fetch(self,member_id):
+    found, member = self.lookup(member_id)
+    if found:
+      return member
+
+    # Waiting on fetch already in progress.
+    if member_id in self.fetching:
+      self.stats["coalesced"] += 1
+      return await asyncio.shield(self.fetching[member_id])
+
+    self.stats["misses"] += 1
+    self.fetching[member_id] = asyncio.ensure_future(self.fetch_member(member_id))
+    try:
+      return await asyncio.shield(self.fetching[member_id])
+    finally:
+      self.fetching.pop(member_id,None)
+
+  # Fetching member from discord and caching the result.
+  async def fetch_member(self,member_id):
+    self.stats["fetches"] += 1
+    try:
+      member = await self.guild.fetch_member(member_id)
+    except discord.NotFound:
+      self.stats["not_found"] += 1
+      self.store(member_id,None,self.not_found_ttl)
+      return None
+    except discord.HTTPException as e:
+      # Not caching errors which may not happen again.
+      self.stats["errors"] += 1
+      logger.info(f"Member unsuccessfully fetched, {self.guild.id}, {member_id}, {e}")
+      return None
+    self.store(member_id,member,self.ttl)
+    return member
+
+  # Getting members of ids concurrently, skipping those who have left.
+  async def fetch_all(self,member_ids) -> list:
+    members = await asyncio.gather(*[self.fetch(member_id) for member_id in member_ids])
+    return [member for member in members if member]
+
+  # Forgetting member, such as when they leave.
+  def forget(self,member_id) -> None:
+    self.cache.pop(member_id,None)
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Getting resolver of a guild, keeping the latest guild object.
+def get_resolver(guild) -> MemberResolver:
+  resolver = resolvers.get(guild.id)
+  if resolver is None:
+    resolver = MemberResolver(guild)
+    resolvers[guild.id] = resolver
+  else:
+    resolver.guild = guild
+  return resolver
+
+
+# Getting stats of all resolvers, with the share of lookups answered without requests.
+def get_member_stats() -> dict:
+  stats = {}
+  for resolver in resolvers.values():
+    for key, value in resolver.stats.items():
+      stats[key] = stats.get(key,0) + value
+  lookups = stats.get("hits",0) + stats.get("not_found_hits",0) + stats.get("misses",0) + stats.get("coalesced",0)
+  stats["hit_rate"] = (stats.get("hits",0) + stats.get("not_found_hits",0)) / lookups if lookups else 0.0
+  return stats
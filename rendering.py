@@ -0,0 +1,262 @@
+'''
+Module for rendering workflows into embeds.
+
+Each layout renders the text of a project, which is kept on the project and
+only rendered again once the project or the layout's key has changed. Members
+and roles are mentioned from their ids, so rendering never makes requests.
+
+Boards are split over several messages to stay within discord's limits on
+embeds, with projects kept on the message they are on while it has room, so
+a change to a project only changes the message it is on.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import discord
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Archived tasks shown on each page of the archive.
+TASKS_PER_ARCHIVE_PAGE = 25
+
+# Discord's limits on embeds.
+EMBED_FIELD_LIMIT = 25
+EMBED_CHARACTER_LIMIT = 6000
+FIELD_VALUE_LIMIT = 1024
+
+# Title of the board's first message, and name of fields continuing a project's tasks.
+BOARD_TITLE = "Existing Projects"
+CONTINUED_FIELD_NAME = "\u200b"
+
+# - - - - - - - - - - - - - - - - - - -
+# Shared text.
+
+# Mentioning member from id, discord shows the name without the member being fetched.
+def mention_member(member_id) -> str:
+  return f"<@{member_id}>"
+
+# Mentioning role from id.
+def mention_role(role_id) -> str:
+  return f"<@&{role_id}>"
+
+# Getting mentions of the members of a task.
+def render_members(task) -> str:
+  return "".join(mention_member(member_id) for member_id in task.member_ids)
+
+# Getting mentions of the teams of a project.
+def render_teams(project,workflow,separator) -> str:
+  teams_list = ""
+  for team in project.get_teams_from_ids(workflow):
+    if team.role_id:
+      teams_list += separator.format(mention_role(team.role_id))
+  return teams_list
+
+# Getting status of a task in bold.
+def render_status(task) -> str:
+  return f"**`{task.status}`**" if task.status else ""
+
+# Splitting text into field values within the limit, between lines where possible.
+def split_field_value(text) -> list:
+  values = []
+  value = ""
+  for line in text.splitlines(keepends=True):
+    while len(line) > FIELD_VALUE_LIMIT:
+      if value:
+        values.append(value)
+        value = ""
+      values.append(line[:FIELD_VALUE_LIMIT])
+      line = line[FIELD_VALUE_LIMIT:]
+    if len(value) + len(line) > FIELD_VALUE_LIMIT:
+      values.append(value)
+      value = ""
+    value += line
+  if value or not values:
+    values.append(value)
+  return values
+
+# - - - - - - - - - - - - - - - - - - -
+# Layouts, each rendering the text of a project for a key.
+
+# Board fields of a project, with its number on the board as key.
+# Tasks over the limit of one field continue in fields after it.
+def render_board_fragment(project,number,workflow):
+  # Creating field title.
+  field_title = f'{number}. {project.name} - Deadline <t:{project.get_unix_deadline()}:R>' if project.deadline else \
+  f'{number}. {project.name}'
+  # Creating task list for field.
+  task_list = render_teams(project,workflow,"{} ")
+  if len(project.team_ids) != 0:
+    task_list += "\n"
+  if len(project.active_tasks) != 0:
+    for task in project.active_tasks:
+      task_members_mention = render_members(task)
+      task_list += f'- {task.name} - *Due <t:{task.get_unix_deadline()}:R>* {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
+      f'- {task.name} {render_status(task)} {task_members_mention}\n'
+  else:
+    task_list += "No tasks."
+  values = split_field_value(task_list)
+  return ((field_title,values[0]),) + tuple((CONTINUED_FIELD_NAME,value) for value in values[1:])
+
+# Title and numbered tasks of a project being edited from the board.
+def render_edit_fragment(project,key,workflow):
+  # Creating title.
+  title = f"{project.name} - Deadline <t:{project.get_unix_deadline()}:R>" if project.deadline else f"{project.name}"
+  # Creating task list.
+  task_list = render_teams(project,workflow,"{} ")
+  if len(project.team_ids) != 0:
+    task_list += "\n"
+  if len(project.active_tasks) != 0:
+    for index, task in enumerate(project.active_tasks,1):
+      task_members_mention = render_members(task)
+      task_list += f'{index}. {task.name} - *Due <t:{task.get_unix_deadline()}:R>* {render_status(task)} {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
+      f'{index}. {task.name} {render_status(task)} {task_members_mention}\n'
+  else:
+    task_list += "No tasks."
+  return (title,task_list)
+
+# Teams, numbered tasks and optionally numbered archived tasks of a project being managed, with showing archive as key.
+def render_manage_fragment(project,archive_check,workflow):
+  # Creating teams list.
+  teams_list = render_teams(project,workflow,"- {}\n") if len(project.team_ids) != 0 else "No teams."
+  # Creating task lists.
+  task_list = render_manage_tasks(project.active_tasks)
+  archive_list = render_manage_tasks(project.archived_tasks) if archive_check else None
+  return (teams_list,task_list,archive_list)
+
+def render_manage_tasks(tasks) -> str:
+  if len(tasks) == 0:
+    return "No tasks."
+  task_list = ""
+  for index, task in enumerate(tasks,1):
+    task_members_mention = render_members(task)
+    task_list += f'{index}. {task.name} Due <t:{task.get_unix_deadline()}:R> {task_members_mention}\n' if task.deadline and task.status != "COMPLETED" else \
+    f'{index}. {task.name} {render_status(task)} {task_members_mention}\n'
+  return task_list
+
+# Fields of archived tasks on a page of the archive, with the page as key.
+def render_archive_fragment(project,page_display,workflow):
+  fields = []
+  counter = (page_display-1) * TASKS_PER_ARCHIVE_PAGE
+  for task in project.archived_tasks[counter:counter+TASKS_PER_ARCHIVE_PAGE]:
+    counter += 1
+    task_members_mention = render_members(task)
+    task_list = f'{counter}. {task.name} Due <t:{task.get_unix_deadline()}:R>' if task.deadline and task.status != "COMPLETED" else \
+    f'{counter}. {task.name} {render_status(task)}\n'
+    fields.append((task_list,task_members_mention))
+  return tuple(fields)
+
+LAYOUTS = {
+  "board": render_board_fragment,
+  "edit": render_edit_fragment,
+  "manage": render_manage_fragment,
+  "archive": render_archive_fragment,
+}
+
+# Rendering text of a project for a layout, reusing it while the project and key are unchanged.
+def render_fragment(layout,project,key,workflow):
+  fragment = project.get_rendered(layout,key)
+  if fragment is None:
+    fragment = LAYOUTS[layout](project,key,workflow)
+    project.set_rendered(layout,key,fragment)
+  return fragment
+
+# - - - - - - - - - - - - - - - - - - -
+# Embeds.
+
+# Getting characters a project's board fields take up in an embed.
+def get_fields_length(fields) -> int:
+  return sum(len(name) + len(value) for name, value in fields)
+
+# Splitting the board's projects into ids on each of its messages.
+# Projects stay on the message they were on in pages while it has room, new projects going on the last.
+def paginate_board(workflow,pages=()) -> list:
+  project_ids = {project.id for project in workflow.projects}
+  counts = [count for count in (sum(1 for project_id in page if project_id in project_ids) for page in pages) if count]
+  new_count = len(workflow.projects) - sum(counts)
+  if new_count > 0:
+    if counts:
+      counts[-1] += new_count
+    else:
+      counts.append(new_count)
+
+  # Filling pages in board order, moving projects over a page's limits to the start of the next.
+  new_pages = []
+  numbered = list(enumerate(workflow.projects,1))
+  start = 0
+  overflow = []
+  for count in counts:
+    page, overflow = fill_board_page(overflow + numbered[start:start+count],workflow)
+    new_pages.append(page)
+    start += count
+  while overflow:
+    page, overflow = fill_board_page(overflow,workflow)
+    new_pages.append(page)
+  return new_pages
+
+# Filling a page with projects while within the limits of an embed, returning its ids and the projects left over.
+# A project over the limits on its own is given a page of its own.
+def fill_board_page(numbered,workflow):
+  page = []
+  field_count = 0
+  length = len(BOARD_TITLE)
+  for index, (number, project) in enumerate(numbered):
+    fields = render_fragment("board",project,number,workflow)
+    field_count += len(fields)
+    length += get_fields_length(fields)
+    if page and (field_count > EMBED_FIELD_LIMIT or length > EMBED_CHARACTER_LIMIT):
+      return (page,numbered[index:])
+    page.append(project.id)
+  return (page,[])
+
+# Board of the projects in the active channel, one embed for each page of project ids.
+def render_board(workflow,pages) -> list:
+  if len(workflow.projects) == 0:
+    return [discord.Embed(color=discord.Color.blurple(),title=BOARD_TITLE,description='No existing projects.')]
+
+  numbered = {project.id: (number,project) for number, project in enumerate(workflow.projects,1)}
+  embeds = []
+  for page in pages:
+    embed = discord.Embed(color=discord.Color.blurple(),title=BOARD_TITLE if len(embeds) == 0 else None)
+    length = len(BOARD_TITLE)
+    for project_id in page:
+      number, project = numbered[project_id]
+      for field_title, task_list in render_fragment("board",project,number,workflow):
+        # Leaving out the end of a project too large for any message.
+        length += len(field_title) + len(task_list)
+        if len(embed.fields) == EMBED_FIELD_LIMIT or length > EMBED_CHARACTER_LIMIT:
+          break
+        embed.add_field(name=field_title,value=task_list,inline=False)
+    embeds.append(embed)
+  return embeds
+
+# Project being edited from the board.
+def render_edit(project,workflow) -> discord.Embed:
+  title, task_list = render_fragment("edit",project,None,workflow)
+  return discord.Embed(color=discord.Color.blurple(),title=title,description=task_list)
+
+# Project being managed, with its archived tasks if shown.
+def render_manage(project,workflow,archive_check) -> discord.Embed:
+  teams_list, task_list, archive_list = render_fragment("manage",project,archive_check,workflow)
+  # Creating project message.
+  embed = discord.Embed(color=discord.Color.blurple(),title=project.name + f" - due <t:{project.get_unix_deadline()}:R>" if project.deadline else project.name,description=project.description or "")
+  # Adding status and priority to message.
+  embed.add_field(name="Status:",value=f"**`{project.status}`**",inline=True)
+  if project.priority:
+    embed.add_field(name="Priority:",value=f"**`{project.priority}`**",inline=True)
+  # Adding teams and tasks to message.
+  embed.add_field(name="Teams:",value=teams_list,inline=True)
+  embed.add_field(name="Tasks:",value=task_list,inline=False)
+  if archive_list is not None:
+    embed.add_field(name="Archived Tasks:",value=archive_list,inline=False)
+  return embed
+
+# Page of the archive of a project.
+def render_archive(project,workflow,page_display,total_pages) -> discord.Embed:
+  if len(project.archived_tasks) == 0:
+    return discord.Embed(color=discord.Color.blurple(),title=f"Archived Tasks ({page_display}/{total_pages})",description="No tasks.")
+  embed = discord.Embed(color=discord.Color.blurple(),title=f"Archived Tasks ({page_display}/{total_pages})")
+  for task_list, task_members_mention in render_fragment("archive",project,page_display,workflow):
+    embed.add_field(name=task_list,value=task_members_mention,inline=False)
+  return embed
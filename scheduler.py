@@ -0,0 +1,204 @@
+'''
+Module for scheduling requests sent to discord by priority.
+
+Requests wait in one queue, interaction responses before board refreshes
+before notices, with one request at a time on each of discord's rate limit
+buckets so a bucket held up by low priority requests does not hold up the
+rest, and a few at a time for each guild. An edit waiting for a message is
+replaced by a later edit of it.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+import config
+
+# - - - - - - - - - - - - - - - - - - -
+
+global logger
+logger = logging.getLogger()
+
+# Priorities of requests, lowest sent first.
+INTERACTION = 0
+BOARD = 1
+NOTICE = 2
+PRIORITY_NAMES = {INTERACTION: "interaction", BOARD: "board", NOTICE: "notice"}
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Request():
+  """ Request waiting to be sent, with the future of each caller waiting on it."""
+
+  def __init__(self,priority,bucket,key,send,fields) -> None:
+    self.priority = priority
+    self.bucket = bucket
+    self.key = key
+    self.send = send
+    self.fields = fields
+    self.future = asyncio.get_running_loop().create_future()
+    self.submitted = time.monotonic()
+    self.started = False
+
+
+class Scheduler():
+  """ Queue of requests to discord, sending those of highest priority whose buckets are free."""
+
+  def __init__(self,concurrency=config.REQUEST_CONCURRENCY,guild_concurrency=config.GUILD_REQUEST_CONCURRENCY) -> None:
+    self.concurrency = concurrency
+    self.guild_concurrency = guild_concurrency
+    # Queue of (priority, sequence, request), requests waiting by key and buckets with a request being sent.
+    self.queue = []
+    self.sequence = itertools.count()
+    self.waiting = {}
+    self.busy = set()
+    # Requests being sent, in total and for each guild, with their tasks.
+    self.running = 0
+    self.guild_running = {}
+    self.tasks = set()
+    self.stats = {"sent": 0, "merged": 0, "errors": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+  # Adding request, returning a future of its result.
+  # Buckets are tuples starting with the id of the guild their requests are for.
+  # A request with the key of one still waiting replaces what that one sends.
+  def submit(self,priority,bucket,send,key=None,**fields) -> asyncio.Future:
+    request = self.waiting.get(key) if key is not None else None
+    if request:
+      self.stats["merged"] += 1
+      request.send = send
+      request.fields = fields
+      if priority < request.priority:
+        request.priority = priority
+        heapq.heappush(self.queue,(priority,next(self.sequence),request))
+      return request.future
+
+    request = Request(priority,bucket,key,send,fields)
+    if key is not None:
+      self.waiting[key] = request
+    heapq.heappush(self.queue,(priority,next(self.sequence),request))
+    self.start_requests()
+    return request.future
+
+  # Starting requests in priority order while under the concurrency, skipping those whose bucket or guild is busy.
+  # One request at a time is kept for interaction responses, in total and in each guild, so they never wait behind slower requests.
+  def start_requests(self) -> None:
+    blocked = []
+    while self.queue and self.running < self.concurrency:
+      entry = heapq.heappop(self.queue)
+      request = entry[2]
+      if request.started:
+        continue
+      reserved = 0 if request.priority == INTERACTION else 1
+      guild_id = request.bucket[0]
+      if request.bucket in self.busy or self.running >= max(self.concurrency - reserved,1) or self.guild_running.get(guild_id,0) >= max(self.guild_concurrency - reserved,1):
+        blocked.append(entry)
+        continue
+      request.started = True
+      if request.key is not None:
+        self.waiting.pop(request.key,None)
+      self.busy.add(request.bucket)
+      self.running += 1
+      self.guild_running[guild_id] = self.guild_running.get(guild_id,0) + 1
+      # Keeping task until done, as the event loop only keeps a weak reference to it.
+      task = asyncio.ensure_future(self.run(request))
+      self.tasks.add(task)
+      task.add_done_callback(self.tasks.discard)
+    for entry in blocked:
+      heapq.heappush(self.queue,entry)
+
+  # Sending request and passing its result to the callers waiting on it.
+  async def run(self,request) -> None:
+    wait = time.monotonic() - request.submitted
+    self.stats["wait_seconds"] += wait
+    self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"],wait)
+    try:
+      result = await request.send(**request.fields)
+    except Exception as e:
+      self.stats["errors"] += 1
+      if not request.future.done():
+        request.future.set_exception(e)
+    else:
+      self.stats["sent"] += 1
+      if not request.future.done():
+        request.future.set_result(result)
+    finally:
+      self.busy.discard(request.bucket)
+      self.running -= 1
+      self.guild_running[request.bucket[0]] -= 1
+      if self.guild_running[request.bucket[0]] == 0:
+        del self.guild_running[request.bucket[0]]
+      self.start_requests()
+
+  # Getting requests waiting for each priority.
+  def get_depths(self) -> dict:
+    depths = {name: 0 for name in PRIORITY_NAMES.values()}
+    counted = set()
+    for priority, sequence, request in self.queue:
+      if not request.started and id(request) not in counted:
+        counted.add(id(request))
+        depths[PRIORITY_NAMES[request.priority]] += 1
+    return depths
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Scheduler of all requests the bot sends outside of first interaction responses.
+scheduler = Scheduler()
+
+# Getting bucket of requests to a channel's messages.
+def get_channel_bucket(channel) -> tuple:
+  guild = getattr(channel,"guild",None)
+  return (guild.id if guild else None,"channel",channel.id)
+
+# Getting bucket of requests to an interaction's messages, which go through its webhook.
+def get_interaction_bucket(interaction) -> tuple:
+  return (interaction.guild_id,"webhook",interaction.token)
+
+
+# Getting sender editing an interaction's original response, for MessageEdits.
+def response_edit(interaction):
+  async def send(**fields):
+    return await scheduler.submit(INTERACTION,get_interaction_bucket(interaction),interaction.edit_original_response,("response",interaction.token),**fields)
+  return send
+
+# Getting sender editing a message.
+def message_edit(message,priority):
+  async def send(**fields):
+    return await scheduler.submit(priority,get_channel_bucket(message.channel),message.edit,("message",message.id),**fields)
+  return send
+
+# Getting sender sending a message to a channel.
+def channel_send(channel,priority):
+  async def send(**fields):
+    return await scheduler.submit(priority,get_channel_bucket(channel),channel.send,**fields)
+  return send
+
+# Deleting a message.
+async def delete_message(message,priority) -> None:
+  await scheduler.submit(priority,get_channel_bucket(message.channel),message.delete)
+
+
+# Sending notice to a channel without waiting for it, as notices are sent after everything else.
+def send_notice(channel,**fields) -> asyncio.Future:
+  future = scheduler.submit(NOTICE,get_channel_bucket(channel),channel.send,**fields)
+  future.add_done_callback(log_notice_error)
+  return future
+
+def log_notice_error(future) -> None:
+  if not future.cancelled() and future.exception():
+    logger.info(f"Notice unsuccessfully sent, {future.exception()}")
+
+
+# Getting stats of the scheduler, with the requests waiting for each priority and the average wait.
+def get_scheduler_stats() -> dict:
+  stats = dict(scheduler.stats)
+  stats["queue_depths"] = scheduler.get_depths()
+  stats["running"] = scheduler.running
+  started = stats["sent"] + stats["errors"]
+  stats["average_wait_seconds"] = stats["wait_seconds"] / started if started else 0.0
+  return stats
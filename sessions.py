@@ -0,0 +1,171 @@
+'''
+Module for waking long-running messages only when something concerning them happens.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import time
+
+import config
+import events
+from edits import MessageEdits
+from scheduler import response_edit
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Sessions watching each message id, and member and role changes of each guild id.
+watching = {}
+watching_guilds = {}
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Session():
+  """ Wakeups for a message loop, from interactions with its messages and changes to its workflow it checks."""
+
+  def __init__(self,workflow=None,check=None,timeout=config.SESSION_TIMEOUT) -> None:
+    self.woken = asyncio.Event()
+    self.timeout = timeout
+    self.expires = time.monotonic() + timeout
+    self.message_ids = set()
+    self.guild_ids = set()
+    self.workflow = workflow
+    self.check = check
+    self.closed = False
+    if workflow:
+      workflow.events.subscribe(events.Event,self.on_event)
+
+  # Watching interactions with a message, from the response send_message returns since discord.py 2.5 or a message.
+  def watch(self,message) -> None:
+    message_id = getattr(message,"message_id",None) or getattr(message,"id",None)
+    if message_id:
+      self.message_ids.add(message_id)
+      watching.setdefault(message_id,set()).add(self)
+
+  # Watching member and role changes of a guild.
+  def watch_guild(self,guild) -> None:
+    self.guild_ids.add(guild.id)
+    watching_guilds.setdefault(guild.id,set()).add(self)
+
+  # Waking for workflow changes the session checks, closing once expired.
+  def on_event(self,event) -> None:
+    if time.monotonic() > self.expires:
+      self.close()
+    elif self.check is None or self.check(event):
+      self.woken.set()
+
+  def wake(self) -> None:
+    self.woken.set()
+
+  # Waiting to be woken, returning False and closing if nothing happens before the timeout.
+  async def wait(self) -> bool:
+    try:
+      await asyncio.wait_for(self.woken.wait(),self.timeout)
+    except asyncio.TimeoutError:
+      self.close()
+      return False
+    self.woken.clear()
+    self.expires = time.monotonic() + self.timeout
+    return True
+
+  # Stopping wakeups.
+  def close(self) -> None:
+    if self.closed:
+      return
+    self.closed = True
+    if self.workflow:
+      self.workflow.events.unsubscribe(events.Event,self.on_event)
+    for message_id in self.message_ids:
+      remove_watcher(watching,message_id,self)
+    for guild_id in self.guild_ids:
+      remove_watcher(watching_guilds,guild_id,self)
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Waking sessions watching the message of an interaction.
+def dispatch_interaction(interaction) -> None:
+  if interaction.message:
+    for session in list(watching.get(interaction.message.id,())):
+      session.wake()
+
+
+# Waking sessions watching member and role changes of a guild.
+def dispatch_guild(guild) -> None:
+  for session in list(watching_guilds.get(guild.id,())):
+    session.wake()
+
+
+# Removing session from those watching a key.
+def remove_watcher(watchers,key,session) -> None:
+  sessions = watchers.get(key)
+  if sessions:
+    sessions.discard(session)
+    if len(sessions) == 0:
+      del watchers[key]
+
+
+# Waiting for an interaction with a message sent for a single choice, returning False if none before the timeout.
+async def wait_for_message(message,timeout=config.SESSION_TIMEOUT) -> bool:
+  session = Session(timeout=timeout)
+  session.watch(message)
+  woken = await session.wait()
+  session.close()
+  return woken
+
+
+# Sending a message in response to an interaction, then editing it each time the session wakes until closed or timed out.
+# render returns the embed and view of the message, view None for none, and handle is given the view after each wakeup.
+async def run_message_loop(interaction,session,render,handle=None,delay=0.5,**send_fields) -> None:
+  message_edits = MessageEdits()
+  initial_check = True
+  while True:
+    embed, view = await render()
+    fields = {"embed": embed} if view is None else {"embed": embed, "view": view}
+    if initial_check:
+      session.watch(await message_edits.send(interaction.response.send_message,**fields,**send_fields))
+      initial_check = False
+    else:
+      await message_edits.send(response_edit(interaction),**fields)
+    # Keeping the view on the message, as it stays when an unchanged edit is skipped.
+    view = message_edits.view
+    # Waiting for an interaction with the message or a change shown on it.
+    if not await session.wait():
+      break
+
+    await asyncio.sleep(delay)
+
+    # Checking to close message.
+    if view and view.close_check:
+      session.close()
+      await interaction.delete_original_response()
+      break
+    if handle:
+      handle(view)
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Checking events concerning a task.
+def concerns_task(task):
+  return lambda event: isinstance(event,events.TaskEvent) and event.task is task
+
+# Checking events concerning a project, its tasks or its teams.
+def concerns_project(project):
+  def check(event):
+    if isinstance(event,events.ProjectEvent):
+      return event.project is project
+    if isinstance(event,events.TaskEvent):
+      return event.task.project == project.id
+    if isinstance(event,events.TeamEvent):
+      return project.id in event.team.project_ids or event.team.id in project.team_ids
+    return False
+  return check
+
+# Checking events concerning teams.
+def concerns_teams(event) -> bool:
+  return isinstance(event,events.TeamEvent)
+
+# Checking events concerning the projects shown on the board.
+def concerns_projects(event) -> bool:
+  return isinstance(event,(events.ProjectEvent,events.TaskEvent,events.TeamEvent)) and not isinstance(event,events.LogEvent)
@@ -0,0 +1,341 @@
+'''
+Module for managing storage to SQLite.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import logging
+import json
+import sqlite3
+import time
+
+import config
+import templates
+from workflow import Workflow, Project, Task, Team, get_next_id, load_deadline
+from hydration import hydrate_workflows
+
+# - - - - - - - - - - - - - - - - - - -
+
+global logger
+logger = logging.getLogger()
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS workflows (
+  guild_id TEXT PRIMARY KEY,
+  active_channel INTEGER,
+  active_message INTEGER,
+  next_project_id INTEGER,
+  next_team_id INTEGER,
+  board_message_ids TEXT
+);
+CREATE TABLE IF NOT EXISTS projects (
+  guild_id TEXT,
+  project_id INTEGER,
+  template TEXT,
+  name TEXT,
+  deadline TEXT,
+  description TEXT,
+  status TEXT,
+  priority TEXT,
+  team_ids TEXT,
+  next_task_id INTEGER,
+  PRIMARY KEY (guild_id, project_id)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+  guild_id TEXT,
+  project_id INTEGER,
+  task_id INTEGER,
+  name TEXT,
+  deadline TEXT,
+  member_ids TEXT,
+  description TEXT,
+  status TEXT,
+  priority TEXT,
+  archive INTEGER,
+  PRIMARY KEY (guild_id, project_id, task_id)
+);
+CREATE TABLE IF NOT EXISTS task_logs (
+  guild_id TEXT,
+  project_id INTEGER,
+  task_id INTEGER,
+  log_datetime TEXT,
+  comment TEXT,
+  author_id INTEGER,
+  PRIMARY KEY (guild_id, project_id, task_id, log_datetime)
+);
+CREATE TABLE IF NOT EXISTS teams (
+  guild_id TEXT,
+  team_id INTEGER,
+  name TEXT,
+  role_id INTEGER,
+  manager_role_id INTEGER,
+  project_ids TEXT,
+  PRIMARY KEY (guild_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS days_of_code (
+  guild_id TEXT,
+  project_id INTEGER,
+  member_id INTEGER,
+  progress TEXT,
+  time_checked REAL,
+  PRIMARY KEY (guild_id, project_id, member_id)
+);
+'''
+
+# Columns added after tables were first created.
+ADDED_COLUMNS = [
+  ("workflows","next_project_id","INTEGER"),
+  ("workflows","next_team_id","INTEGER"),
+  ("projects","next_task_id","INTEGER"),
+  ("workflows","board_message_ids","TEXT")
+]
+
+# - - - - - - - - - - - - - - - - - - -
+
+class SQLiteStorage():
+
+  def __init__(self,path=config.DATABASE_PATH) -> None:
+    self.path = path
+    self.connection = sqlite3.connect(path)
+    self.connection.execute("PRAGMA journal_mode=WAL")
+    self.connection.execute("PRAGMA synchronous=NORMAL")
+    self.connection.executescript(SCHEMA)
+
+    # Adding columns missing from databases created before them.
+    for table, column, column_type in ADDED_COLUMNS:
+      columns = [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+      if column not in columns:
+        self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Workflow specific methods.
+
+  # Saving active channel and message of workflow.
+  def save_workflow(self,workflow):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO workflows VALUES (?,?,?,?,?,?)",(
+        workflow.guild_id,
+        workflow.active_channel.id if workflow.active_channel else None,
+        workflow.active_message.id if workflow.active_message else None,
+        workflow.next_project_id,
+        workflow.next_team_id,
+        json.dumps(workflow.board_message_ids)
+      ))
+
+  # Deleting all rows for a guild.
+  def delete_workflow(self,guild_id):
+    with self.connection:
+      for table in ["workflows","projects","tasks","task_logs","teams","days_of_code"]:
+        self.connection.execute(f"DELETE FROM {table} WHERE guild_id = ?",(guild_id,))
+
+  # Saving every row of a workflow, used when migrating from json.
+  def save_all(self,workflow):
+    with self.connection:
+      self.save_workflow(workflow)
+      for project in workflow.projects:
+        self.save_project(workflow,project)
+        if project.__class__.__name__ == "DaysOfCode":
+          for member_id in project.progress.keys():
+            self.save_progress(workflow,project,member_id)
+        else:
+          for task in project.tasks:
+            self.save_task(workflow,task)
+            for log_datetime in task.logs.keys():
+              self.save_log(workflow,task,log_datetime)
+      for team in workflow.teams:
+        self.save_team(workflow,team)
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Project specific methods.
+
+  def save_project(self,workflow,project):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO projects VALUES (?,?,?,?,?,?,?,?,?,?)",(
+        workflow.guild_id,
+        project.id,
+        project.__class__.__name__ if project.__class__.__name__ != "Project" else None,
+        project.name,
+        json.dumps(project.deadline) if project.deadline else None,
+        project.description,
+        project.status,
+        project.priority,
+        json.dumps(project.team_ids),
+        project.next_task_id
+      ))
+
+  def delete_project(self,workflow,project):
+    with self.connection:
+      for table in ["projects","tasks","task_logs","days_of_code"]:
+        self.connection.execute(f"DELETE FROM {table} WHERE guild_id = ? AND project_id = ?",(workflow.guild_id,project.id))
+
+  # Saving progress of member in DaysOfCode project.
+  def save_progress(self,workflow,project,member_id):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO days_of_code VALUES (?,?,?,?,?)",(
+        workflow.guild_id,
+        project.id,
+        member_id,
+        "".join(project.progress[member_id]),
+        project.time_checked[member_id]
+      ))
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Task specific methods.
+
+  def save_task(self,workflow,task):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO tasks VALUES (?,?,?,?,?,?,?,?,?,?)",(
+        workflow.guild_id,
+        task.project,
+        task.id,
+        task.name,
+        json.dumps(task.deadline) if task.deadline else None,
+        json.dumps(task.member_ids),
+        task.description,
+        task.status,
+        task.priority,
+        int(task.archive)
+      ))
+
+  def delete_task(self,workflow,task):
+    with self.connection:
+      for table in ["tasks","task_logs"]:
+        self.connection.execute(f"DELETE FROM {table} WHERE guild_id = ? AND project_id = ? AND task_id = ?",(workflow.guild_id,task.project,task.id))
+
+  def save_log(self,workflow,task,log_datetime):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO task_logs VALUES (?,?,?,?,?,?)",(
+        workflow.guild_id,
+        task.project,
+        task.id,
+        log_datetime,
+        task.logs[log_datetime][0],
+        task.logs[log_datetime][1]
+      ))
+
+  def delete_log(self,workflow,task,log_datetime):
+    with self.connection:
+      self.connection.execute("DELETE FROM task_logs WHERE guild_id = ? AND project_id = ? AND task_id = ? AND log_datetime = ?",(workflow.guild_id,task.project,task.id,log_datetime))
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Team specific methods.
+
+  def save_team(self,workflow,team):
+    with self.connection:
+      self.connection.execute("INSERT OR REPLACE INTO teams VALUES (?,?,?,?,?,?)",(
+        workflow.guild_id,
+        team.id,
+        team.name,
+        team.role_id,
+        team.manager_role_id,
+        json.dumps(team.project_ids)
+      ))
+
+  def delete_team(self,workflow,team):
+    with self.connection:
+      self.connection.execute("DELETE FROM teams WHERE guild_id = ? AND team_id = ?",(workflow.guild_id,team.id))
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Loading methods.
+
+  # Checking if no workflows have been stored yet.
+  def check_empty(self) -> bool:
+    return self.connection.execute("SELECT 1 FROM workflows LIMIT 1").fetchone() is None
+
+  # Getting ids of all stored guilds.
+  def get_guild_ids(self):
+    return [row[0] for row in self.connection.execute("SELECT guild_id FROM workflows")]
+
+  # Getting active channel and message ids of a guild.
+  def get_active_ids(self,guild_id):
+    return self.connection.execute("SELECT active_channel, active_message FROM workflows WHERE guild_id = ?",(guild_id,)).fetchone()
+
+  # Building workflow for a guild from its rows.
+  def load_workflow(self,guild_id) -> Workflow:
+    workflow = Workflow(guild_id)
+
+    # Adding projects.
+    for project_id, template, name, deadline, description, status, priority, team_ids, next_task_id in self.connection.execute(
+      "SELECT project_id, template, name, deadline, description, status, priority, team_ids, next_task_id FROM projects WHERE guild_id = ? ORDER BY project_id",(guild_id,)):
+      if template == "DaysOfCode":
+        project = templates.DaysOfCode(project_id)
+      else:
+        project = Project(name,project_id)
+      project.deadline = load_deadline(json.loads(deadline)) if deadline else None
+      project.description = description
+      project.status = status
+      project.priority = priority
+      project.team_ids = json.loads(team_ids)
+      project.next_task_id = max(next_task_id or 1,project.next_task_id)
+      project.workflow = workflow
+      workflow.projects.append(project)
+      workflow.index_project(project)
+
+    # Adding tasks.
+    for project_id, task_id, name, deadline, member_ids, description, status, priority, archive in self.connection.execute(
+      "SELECT project_id, task_id, name, deadline, member_ids, description, status, priority, archive FROM tasks WHERE guild_id = ? ORDER BY project_id, task_id",(guild_id,)):
+      project = workflow.get_project_by_id(project_id)
+      task = Task(name,None,task_id,project_id)
+      task.deadline = load_deadline(json.loads(deadline)) if deadline else None
+      task.member_ids = tuple(json.loads(member_ids))
+      task.description = description
+      task.status = status
+      task.priority = priority
+      task.archive = bool(archive)
+      project.load_task(task)
+
+    # Adding logs.
+    for project_id, task_id, log_datetime, comment, author_id in self.connection.execute(
+      "SELECT project_id, task_id, log_datetime, comment, author_id FROM task_logs WHERE guild_id = ? ORDER BY rowid",(guild_id,)):
+      workflow.get_project_by_id(project_id).get_task_by_id(task_id).set_log(log_datetime,[comment,author_id])
+
+    # Adding DaysOfCode progress.
+    for project_id, member_id, progress, time_checked in self.connection.execute(
+      "SELECT project_id, member_id, progress, time_checked FROM days_of_code WHERE guild_id = ?",(guild_id,)):
+      project = workflow.get_project_by_id(project_id)
+      project.progress[member_id] = list(progress)
+      project.time_checked[member_id] = time_checked
+
+    # Adding teams.
+    for team_id, name, role_id, manager_role_id, project_ids in self.connection.execute(
+      "SELECT team_id, name, role_id, manager_role_id, project_ids FROM teams WHERE guild_id = ? ORDER BY team_id",(guild_id,)):
+      team = Team(name,role_id=role_id,manager_role_id=manager_role_id,id=team_id)
+      team.project_ids = json.loads(project_ids)
+      team.workflow = workflow
+      workflow.teams.append(team)
+      workflow.index_team(team)
+
+    # Setting next ids, from the largest stored ids for data saved before they were kept.
+    next_project_id, next_team_id, board_message_ids = self.connection.execute("SELECT next_project_id, next_team_id, board_message_ids FROM workflows WHERE guild_id = ?",(guild_id,)).fetchone() or (None,None,None)
+    workflow.next_project_id = max(next_project_id or 1,get_next_id(workflow.projects))
+    workflow.next_team_id = max(next_team_id or 1,get_next_id(workflow.teams))
+    workflow.board_message_ids = json.loads(board_message_ids) if board_message_ids else []
+    return workflow
+
+  # Loading workflow and its active channel and message ids for a guild.
+  def load_guild(self,guild_id):
+    logger.info(f"Loading data for guild, {guild_id}.")
+    workflow = self.load_workflow(guild_id)
+    workflow.set_storage(self)
+    return (workflow,*self.get_active_ids(guild_id))
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Loading workflows dictionary from SQLite.
+async def load_from_sqlite(storage,client):
+  # Building workflows from rows.
+  start_time = time.perf_counter()
+  pending = {}
+  for guild_id in storage.get_guild_ids():
+    pending[guild_id] = storage.load_guild(guild_id)
+  stage_times = {"build": time.perf_counter() - start_time}
+
+  # Fetching discord objects for all guilds concurrently.
+  workflows = await hydrate_workflows(client,pending,stage_times)
+
+  logger.info("Data loading finished.")
+  logger.info("- - - - - - - - - - - - - - - - - - - - - -")
+
+  return workflows
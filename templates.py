@@ -10,9 +10,12 @@ Created on Sunday 3rd March 2024.
 from typing import Any, Coroutine, List
 import discord
 import workflow
+import events
 import logging
 import time
 
+from scheduler import send_notice
+
 # - - - - - - - - - - - - - - - - -
 
 global logger
@@ -22,6 +25,11 @@ logger = logging.getLogger()
 
 class DaysOfCode(workflow.Project):
 
+  __slots__ = ("members","member_ids","progress","time_checked")
+
+  # Attributes written to storage, members are stored by id.
+  stored_attributes = workflow.Project.stored_attributes + ("progress","time_checked")
+
   def __init__(self, id) -> None:
     super().__init__("100 Days of Code", id, None)
     self.add_task("Complete 1 hour of coding each day for 100 days.",None)
@@ -38,6 +46,7 @@ class DaysOfCode(workflow.Project):
     self.members.append(member)
     self.progress[member.id] = ["m"]
     self.time_checked[member.id] = time.time()
+    workflow.emit_event(self.workflow,events.ProgressChanged,self,member.id)
 
   def add_member_from_id(self,id,guild) -> None:
     """ Adding member from id."""
@@ -91,6 +100,22 @@ class DaysOfCode(workflow.Project):
   def manage_progress(self,member,addition) -> None:
     """ To manage progress of an individual member."""
     self.progress[member.id][-1] = addition
+    workflow.emit_event(self.workflow,events.ProgressChanged,self,member.id)
+
+  def check_progress(self) -> None:
+    """ Starting a new day for each full 24 hours since members were last checked, catching up on guilds loaded late."""
+    for member_id in self.time_checked.keys():
+      days = int((time.time() - self.time_checked[member_id]) // (24 * 60 * 60))
+      if days > 0:
+        # Updating time.
+        self.time_checked[member_id] += days * 24 * 60 * 60
+        for day in range(days):
+          # Updating progress.
+          if self.progress[member_id][-1] == "m":
+            self.progress[member_id][-1] = "n"
+          # Adding new day.
+          self.progress[member_id].append("m")
+        workflow.emit_event(self.workflow,events.ProgressChanged,self,member_id)
 
   def display_message(self,active_member) -> discord.Embed:
     """ To display message specificaly for 100 days of code project."""
@@ -188,7 +213,7 @@ class AddProjectModal(discord.ui.Modal,title="Add Project"):
     # Sending update log in active channel.
     logger.info("Sending update log in active channel.")
     update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} added a project, `{self.title_input.value}`.")
-    await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+    send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
 
     await interaction.response.defer()
 
@@ -209,7 +234,7 @@ class TemplateSelectionMenu(discord.ui.Select):
       # Sending update log in active channel.
       logger.info("Sending update log in active channel.")
       update_embed = discord.Embed(colour=discord.Color.blurple(),description=f"{interaction.user.mention} added a project, `{project.name}`.")
-      await self.workflow.active_channel.send(embed=update_embed,delete_after=60)
+      send_notice(self.workflow.active_channel,embed=update_embed,delete_after=60)
     await self.initial_interaction.delete_original_response()
 
 # - - - - - - - - - - - - - - - - -
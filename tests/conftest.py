@@ -0,0 +1,15 @@
+'''
+Module for setting up tests, importing modules from the repository root.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing templates before workflow, as workflow imports it back.
+import templates
@@ -0,0 +1,190 @@
+'''
+Module for testing the journal of workflow changes and its replay into guild files.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+import os
+
+import workflow
+from journal import JournalStorage, apply_record, empty_guild, read_journal
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Author():
+  """ Member with only an id, as stored in logs and tasks."""
+
+  def __init__(self,id) -> None:
+    self.id = id
+
+
+# Opening journal storage in a directory.
+def open_storage(directory):
+  storage = JournalStorage(str(directory / "guilds"),str(directory / "journal.jsonl"),str(directory / "snapshot.json"))
+  storage.load()
+  return storage
+
+
+# Creating workflow of a guild writing its changes to storage.
+def create_workflow(storage,guild_id):
+  guild_workflow = workflow.Workflow(guild_id)
+  guild_workflow.set_storage(storage)
+  storage.workflows[guild_id] = guild_workflow
+  storage.save_workflow(guild_workflow)
+  return guild_workflow
+
+# - - - - - - - - - - - - - - - - - - -
+
+def test_replay_round_trip(tmp_path):
+  storage = open_storage(tmp_path)
+  guild_workflow = create_workflow(storage,"1")
+  project = guild_workflow.add_project("Project")
+  task = project.add_task("Task",None)
+  task.assign_member(Author(5))
+  task.add_log(Author(5),"Started.")
+  team = guild_workflow.add_team("Team",10,11)
+  project.add_team(team)
+  storage.journal_file.close()
+
+  # Replaying journal into guild files when opened again.
+  storage = open_storage(tmp_path)
+  assert read_journal(storage.journal_path) == []
+  loaded_workflow = storage.load_guild("1")[0]
+  loaded_project = loaded_workflow.get_project_by_id(project.id)
+  loaded_task = loaded_project.get_task_by_id(task.id)
+  assert loaded_project.name == "Project"
+  assert loaded_task.member_ids == (5,)
+  assert list(loaded_task.logs.values()) == [["Started.",5]]
+  assert loaded_workflow.get_team_from_id(team.id).project_ids == [project.id]
+
+
+def test_replay_after_crash(tmp_path):
+  storage = open_storage(tmp_path)
+  guild_workflow = create_workflow(storage,"1")
+  guild_workflow.add_project("Project")
+  # Leaving a record torn by a crash at the end of the journal.
+  storage.journal_file.write(b'{"op":"p","g":"1","d":')
+  storage.journal_file.close()
+
+  storage = open_storage(tmp_path)
+  assert [project.name for project in storage.load_guild("1")[0].projects] == ["Project"]
+  # Appending to the journal again after removing the torn record.
+  storage.workflows["1"] = storage.load_guild("1")[0]
+  storage.workflows["1"].add_project("Second")
+  assert [record["op"] for record in read_journal(storage.journal_path)] == ["w","p"]
+
+
+def test_apply_record():
+  workflows_json = {}
+  apply_record(workflows_json,{"op": "w", "g": "1", "c": 2, "m": 3, "np": 4, "nt": 5, "b": [6]})
+  assert workflows_json["1"]["active_message"] == 3
+  assert workflows_json["1"]["board_message_ids"] == [6]
+
+  # Keeping tasks when a project changes, and logs when a task changes.
+  apply_record(workflows_json,{"op": "p", "g": "1", "d": {"id": 1, "name": "Project"}})
+  apply_record(workflows_json,{"op": "t", "g": "1", "d": {"id": 1, "project": 1, "name": "Task"}})
+  apply_record(workflows_json,{"op": "l", "g": "1", "p": 1, "t": 1, "k": "date", "v": ["Log",5]})
+  apply_record(workflows_json,{"op": "t", "g": "1", "d": {"id": 1, "project": 1, "name": "Renamed"}})
+  apply_record(workflows_json,{"op": "p", "g": "1", "d": {"id": 1, "name": "Renamed"}})
+  tasks = workflows_json["1"]["projects"]["1"]["tasks"]
+  assert [task["name"] for task in tasks] == ["Renamed"]
+  assert tasks[0]["logs"] == {"date": ["Log",5]}
+  apply_record(workflows_json,{"op": "-l", "g": "1", "p": 1, "t": 1, "k": "date"})
+  assert tasks[0]["logs"] == {}
+  apply_record(workflows_json,{"op": "-t", "g": "1", "p": 1, "t": 1})
+  assert workflows_json["1"]["projects"]["1"]["tasks"] == []
+
+  # Keeping position of a renamed team.
+  apply_record(workflows_json,{"op": "tm", "g": "1", "d": {"id": 1, "name": "First"}})
+  apply_record(workflows_json,{"op": "tm", "g": "1", "d": {"id": 2, "name": "Second"}})
+  apply_record(workflows_json,{"op": "tm", "g": "1", "d": {"id": 1, "name": "Renamed"}})
+  assert list(workflows_json["1"]["teams"].keys()) == ["Renamed","Second"]
+  apply_record(workflows_json,{"op": "-tm", "g": "1", "id": 1})
+  assert list(workflows_json["1"]["teams"].keys()) == ["Second"]
+
+  apply_record(workflows_json,{"op": "-w", "g": "1"})
+  assert workflows_json == {}
+
+
+def test_autosave_only_changed_guilds(tmp_path):
+  storage = open_storage(tmp_path)
+  first_workflow = create_workflow(storage,"1")
+  create_workflow(storage,"2")
+  asyncio.run(storage.autosave())
+  assert storage.save_stats["last_guilds_serialized"] == 2
+  assert storage.dirty == set()
+
+  # Saving only the guild changed since, then trimming the journal.
+  first_workflow.add_project("Project")
+  assert storage.dirty == {"1"}
+  asyncio.run(storage.autosave())
+  assert storage.save_stats["saves"] == 2
+  assert storage.save_stats["last_guilds_serialized"] == 1
+  assert read_journal(storage.journal_path) == []
+  assert [project.name for project in storage.load_guild("1")[0].projects] == ["Project"]
+
+
+def test_quarantine_corrupt_guild_file(tmp_path):
+  storage = open_storage(tmp_path)
+  with open(os.path.join(storage.data_directory,"1.json"),"wb") as guild_file:
+    guild_file.write(b"{not json")
+
+  # Moving unreadable file aside and starting the guild again from empty.
+  guild_workflow, active_channel_id, active_message_id = storage.load_guild("1")
+  assert guild_workflow.projects == [] and active_channel_id is None and active_message_id is None
+  assert os.listdir(storage.data_directory) == ["quarantine"]
+  assert len(os.listdir(os.path.join(storage.data_directory,"quarantine"))) == 1
+  assert "1" in storage.dirty
+  assert storage.read_guild("1") is None
+
+
+def test_trim_journal_keeps_later_records(tmp_path):
+  storage = open_storage(tmp_path)
+  create_workflow(storage,"1")
+  offset = storage.journal_file.tell()
+  create_workflow(storage,"2")
+  storage.trim_journal(offset)
+  assert [record["g"] for record in read_journal(storage.journal_path)] == ["2"]
+
+  # Keeping records of guilds not saved from before the offset.
+  create_workflow(storage,"3")
+  storage.trim_journal(storage.journal_file.tell(),{"3"})
+  assert [record["g"] for record in read_journal(storage.journal_path)] == ["3"]
+
+
+def test_autosave_keeps_unloaded_guilds(tmp_path):
+  storage = open_storage(tmp_path)
+  create_workflow(storage,"1")
+  storage.append({"op": "w", "g": "2", "c": None, "m": None})
+  storage.workflows.unloaded.add("2")
+  asyncio.run(storage.autosave())
+
+  # Keeping the guild not loaded changed, with its records, until it is saved.
+  assert os.listdir(storage.data_directory) == ["1.json"]
+  assert storage.dirty == {"2"}
+  assert [record["g"] for record in read_journal(storage.journal_path)] == ["2"]
+  storage.journal_file.close()
+  storage = open_storage(tmp_path)
+  assert storage.read_guild("2") == dict(empty_guild(),next_project_id=1,next_team_id=1,board_message_ids=[])
+
+
+def test_concurrent_autosaves(tmp_path):
+  storage = open_storage(tmp_path)
+  first_workflow = create_workflow(storage,"1")
+  storage.append({"op": "w", "g": "2", "c": None, "m": None})
+  storage.workflows.unloaded.add("2")
+
+  async def run():
+    # Changing a guild while the first autosave writes, then saving again before it trims.
+    first = asyncio.create_task(storage.autosave())
+    await asyncio.sleep(0)
+    first_workflow.add_project("Project")
+    await asyncio.gather(first,storage.autosave())
+  asyncio.run(run())
+
+  # Keeping whole records of the guild not loaded.
+  assert [record["g"] for record in read_journal(storage.journal_path)] == ["2"]
+  assert [project.name for project in storage.load_guild("1")[0].projects] == ["Project"]
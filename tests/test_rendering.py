@@ -0,0 +1,81 @@
+'''
+Module for testing the pages of the board and the limits of their embeds.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import workflow
+from rendering import paginate_board, fill_board_page, render_board, split_field_value, EMBED_FIELD_LIMIT, EMBED_CHARACTER_LIMIT, FIELD_VALUE_LIMIT, CONTINUED_FIELD_NAME
+
+# - - - - - - - - - - - - - - - - - - -
+
+# Creating workflow with projects, each with tasks of the given name length.
+def create_workflow(project_count,task_count=0,name_length=10):
+  guild_workflow = workflow.Workflow("1")
+  for project_number in range(project_count):
+    project = guild_workflow.add_project(f"Project {project_number}")
+    for task_number in range(task_count):
+      project.add_task(f"{task_number}".ljust(name_length,"x"),None)
+  return guild_workflow
+
+
+# Checking embeds are within discord's limits.
+def check_limits(embeds):
+  for embed in embeds:
+    assert len(embed.fields) <= EMBED_FIELD_LIMIT
+    assert len(embed) <= EMBED_CHARACTER_LIMIT
+    for field in embed.fields:
+      assert len(field.value) <= FIELD_VALUE_LIMIT
+
+# - - - - - - - - - - - - - - - - - - -
+
+def test_paginate_board_field_limit():
+  guild_workflow = create_workflow(30)
+  pages = paginate_board(guild_workflow)
+  assert [len(page) for page in pages] == [25,5]
+  assert sum(pages,[]) == [project.id for project in guild_workflow.projects]
+  check_limits(render_board(guild_workflow,pages))
+
+
+def test_paginate_board_character_limit():
+  guild_workflow = create_workflow(12,task_count=20,name_length=60)
+  pages = paginate_board(guild_workflow)
+  assert len(pages) > 1
+  assert sum(pages,[]) == [project.id for project in guild_workflow.projects]
+  embeds = render_board(guild_workflow,pages)
+  check_limits(embeds)
+  # Showing every project, as none is over the limits on its own.
+  assert [embed_field.name for embed in embeds for embed_field in embed.fields if embed_field.name != CONTINUED_FIELD_NAME] == [f"{number}. Project {number-1}" for number in range(1,13)]
+
+
+def test_paginate_board_keeps_pages_stable():
+  guild_workflow = create_workflow(30)
+  pages = paginate_board(guild_workflow)
+
+  # Keeping later pages when a project before them is removed.
+  guild_workflow.remove_project(pages[0][0])
+  new_pages = paginate_board(guild_workflow,pages)
+  assert new_pages == [pages[0][1:],pages[1]]
+
+  # Adding new projects to the last page.
+  project = guild_workflow.add_project("New")
+  assert paginate_board(guild_workflow,new_pages) == [pages[0][1:],pages[1] + [project.id]]
+
+
+def test_fill_board_page_oversized_project():
+  guild_workflow = create_workflow(2,task_count=400,name_length=60)
+  numbered = list(enumerate(guild_workflow.projects,1))
+  # Giving a project over the limits on its own a page of its own.
+  page, overflow = fill_board_page(numbered,guild_workflow)
+  assert page == [guild_workflow.projects[0].id]
+  assert overflow == numbered[1:]
+  check_limits(render_board(guild_workflow,paginate_board(guild_workflow)))
+
+
+def test_split_field_value():
+  values = split_field_value("a" * 2500 + "\nshort\n")
+  assert [len(value) for value in values] == [1024,1024,459]
+  assert "".join(values) == "a" * 2500 + "\nshort\n"
+  assert split_field_value("") == [""]
@@ -0,0 +1,103 @@
+'''
+Module for testing the order requests to discord are sent in.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import asyncio
+
+from scheduler import Scheduler, INTERACTION, BOARD, NOTICE
+
+# - - - - - - - - - - - - - - - - - - -
+
+class Sender():
+  """ Sender recording what is sent, and how many are sent at once in each bucket and guild."""
+
+  def __init__(self) -> None:
+    self.sent = []
+    self.running = {}
+    self.most_running = {}
+    self.release = asyncio.Event()
+
+  def __call__(self,bucket):
+    async def send(**fields):
+      for key in [bucket,bucket[0]]:
+        self.running[key] = self.running.get(key,0) + 1
+        self.most_running[key] = max(self.most_running.get(key,0),self.running[key])
+      await self.release.wait()
+      self.sent.append(fields["name"])
+      for key in [bucket,bucket[0]]:
+        self.running[key] -= 1
+      return fields["name"]
+    return send
+
+
+# Submitting a request for a bucket.
+def submit(scheduler,sender,priority,bucket,name,key=None):
+  return scheduler.submit(priority,bucket,sender(bucket),key,name=name)
+
+# - - - - - - - - - - - - - - - - - - -
+
+def test_priority_order():
+  async def run():
+    scheduler = Scheduler(concurrency=1,guild_concurrency=1)
+    sender = Sender()
+    # Holding the only slot while the rest wait.
+    futures = [submit(scheduler,sender,BOARD,(1,"channel",1),"first")]
+    futures.append(submit(scheduler,sender,NOTICE,(1,"channel",2),"notice"))
+    futures.append(submit(scheduler,sender,BOARD,(1,"channel",3),"board"))
+    futures.append(submit(scheduler,sender,INTERACTION,(1,"webhook","token"),"interaction"))
+    sender.release.set()
+    assert await asyncio.gather(*futures) == ["first","notice","board","interaction"]
+    return sender.sent
+  assert asyncio.run(run()) == ["first","interaction","board","notice"]
+
+
+def test_bucket_serialized():
+  async def run():
+    scheduler = Scheduler(concurrency=5,guild_concurrency=5)
+    sender = Sender()
+    futures = [submit(scheduler,sender,BOARD,(1,"channel",1),f"edit {number}") for number in range(3)]
+    futures.append(submit(scheduler,sender,BOARD,(1,"channel",2),"other"))
+    await asyncio.sleep(0)
+    # Sending to the other bucket alongside the first request.
+    assert sender.running == {(1,"channel",1): 1, (1,"channel",2): 1, 1: 2}
+    sender.release.set()
+    await asyncio.gather(*futures)
+    assert sender.most_running[(1,"channel",1)] == 1
+    assert [name for name in sender.sent if name.startswith("edit")] == ["edit 0","edit 1","edit 2"]
+    assert scheduler.tasks == set() and scheduler.guild_running == {}
+  asyncio.run(run())
+
+
+def test_guild_concurrency():
+  async def run():
+    scheduler = Scheduler(concurrency=10,guild_concurrency=2)
+    sender = Sender()
+    futures = [submit(scheduler,sender,BOARD,(guild_id,"channel",number),number) for guild_id in [1,2] for number in range(4)]
+    futures.append(submit(scheduler,sender,INTERACTION,(1,"webhook","token"),"interaction"))
+    await asyncio.sleep(0)
+    # Keeping one request of each guild for interaction responses.
+    assert sender.running[1] == 2 and sender.running[2] == 1
+    sender.release.set()
+    await asyncio.gather(*futures)
+    assert sender.most_running[1] == 2 and sender.most_running[2] == 1
+  asyncio.run(run())
+
+
+def test_merge_waiting_edits():
+  async def run():
+    scheduler = Scheduler(concurrency=1,guild_concurrency=1)
+    sender = Sender()
+    first = submit(scheduler,sender,BOARD,(1,"channel",1),"first")
+    # Replacing a waiting edit of a message with a later one.
+    older = submit(scheduler,sender,BOARD,(1,"channel",1),"older",key=("message",1))
+    newer = submit(scheduler,sender,INTERACTION,(1,"channel",1),"newer",key=("message",1))
+    assert older is newer
+    sender.release.set()
+    await asyncio.gather(first,newer)
+    assert scheduler.stats["merged"] == 1
+    return sender.sent
+  assert asyncio.run(run()) == ["first","newer"]
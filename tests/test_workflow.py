@@ -0,0 +1,53 @@
+'''
+Module for testing workflow versions, choices and converting deadline input.
+
+Created on Sunday 18th October 2026.
+@author: Harry New
+
+'''
+
+import pytest
+
+from workflow import Workflow, convert_deadline, get_epoch, DatetimeConversionError, STATUSES, PRIORITIES
+
+# - - - - - - - - - - - - - - - - - - -
+
+def test_convert_deadline():
+  assert convert_deadline("1 1 2027") == get_epoch(1,1,2027)
+  assert convert_deadline("01 02 2027") == get_epoch(1,2,2027)
+  assert convert_deadline(None) is None
+
+
+@pytest.mark.parametrize("deadline_input",["1 1 24","1 1 1","0001 1 2027","31 2 2027","1 13 2027","1 1 0000","1 1 0001","a b c","1 1","1 1 9999 1"])
+def test_convert_deadline_rejects(deadline_input):
+  with pytest.raises(DatetimeConversionError):
+    convert_deadline(deadline_input)
+
+
+def test_versions():
+  guild_workflow = Workflow("1")
+  project = guild_workflow.add_project("Project")
+  other_project = guild_workflow.add_project("Other")
+  workflow_version, project_version, other_version = guild_workflow.version, project.version, other_project.version
+
+  # Bumping the workflow on every change, and only the projects a change concerns.
+  project.add_task("Task",None)
+  assert guild_workflow.version > workflow_version
+  assert project.version > project_version
+  assert other_project.version == other_version
+  workflow_version = guild_workflow.version
+  guild_workflow.set_board_message_ids([1])
+  assert guild_workflow.version == workflow_version + 1
+
+
+def test_unknown_choices():
+  project = Workflow("1").add_project("Project")
+  statuses, priorities = list(STATUSES), list(PRIORITIES)
+
+  # Keeping values from older data on the project only.
+  project.status = "IN PROGRESS"
+  project.priority = "CRITICAL"
+  assert (project.status, project.priority) == ("IN PROGRESS","CRITICAL")
+  assert (STATUSES, PRIORITIES) == (statuses,priorities)
+  project.status = "COMPLETED"
+  assert project.status == "COMPLETED" and project.status_code == STATUSES.index("COMPLETED")
@@ -6,51 +6,232 @@ Created on Tuesday 2nd January 2024
 
 '''
 
+from bisect import insort
+from calendar import monthrange
 from datetime import datetime
+from operator import attrgetter
+from types import MappingProxyType
+from zoneinfo import ZoneInfo
 
+import config
+import events
+import members
 import templates
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
+class Choice():
+  """ Attribute stored as its position in a list of choices."""
+
+  def __init__(self,choices,code_attribute) -> None:
+    self.choices = choices
+    self.code_attribute = code_attribute
+
+  def __get__(self,item,owner=None):
+    if item is None:
+      return self
+    code = getattr(item,self.code_attribute)
+    return self.choices[code] if isinstance(code,int) else code
+
+  def __set__(self,item,value):
+    if value not in self.choices:
+      # Keeping values from older data usable on the item itself, leaving the shared choices unchanged.
+      setattr(item,self.code_attribute,value)
+      return
+    setattr(item,self.code_attribute,self.choices.index(value))
+
+# Statuses and priorities of projects and tasks.
+STATUSES = ["PENDING","APPROVAL PENDING","COMPLETED"]
+PRIORITIES = [None,"LOW","MEDIUM","HIGH","URGENT","EMERGENCY"]
+
+# Ordering tasks by id, the order they were added in.
+get_task_id = attrgetter("id")
+
+# Logs of tasks without any, replaced by a dict when the first is added.
+NO_LOGS = MappingProxyType({})
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - -
+
 class Workflow():
 
-  def __init__(self) -> None:
+  def __init__(self,guild_id=None) -> None:
+    self.guild_id = guild_id
     self.projects = []
     self.teams = []
     self.active_channel = None
     self.active_message = None
+    # Ids of the board's messages after the active message, when its projects do not fit in one.
+    self.board_message_ids = []
+    self.storage = None
+    # Events emitted by changes to the workflow, and subscriptions writing them to storage.
+    self.events = events.EventBus()
+    self.storage_subscriptions = []
+
+    # Versions of the workflow and its projects, bumped on each change to invalidate rendered text.
+    self.version = 0
+    self.events.subscribe(events.Event,self.bump_versions)
+
+    # Next ids given to projects and teams, never reused after deletion.
+    self.next_project_id = 1
+    self.next_team_id = 1
+
+    # Indexes of projects and teams, names and roles map to lists in order added.
+    self.project_by_id = {}
+    self.project_by_name = {}
+    self.team_by_id = {}
+    self.team_by_name = {}
+    self.team_by_role_id = {}
+    self.team_by_manager_id = {}
+    # Tasks of each member id, as dictionaries used as ordered sets.
+    self.tasks_by_member = {}
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Index specific methods.
+
+  # Adding project to indexes.
+  def index_project(self,project) -> None:
+    self.project_by_id[int(project.id)] = project
+    add_to_index(self.project_by_name,project.name,project)
+
+  # Removing project from indexes.
+  def unindex_project(self,project) -> None:
+    self.project_by_id.pop(int(project.id),None)
+    remove_from_index(self.project_by_name,project.name,project)
+
+  # Adding team to indexes.
+  def index_team(self,team) -> None:
+    self.team_by_id[team.id] = team
+    add_to_index(self.team_by_name,team.name,team)
+    add_to_index(self.team_by_role_id,team.role_id,team)
+    add_to_index(self.team_by_manager_id,team.manager_role_id,team)
+
+  # Removing team from indexes.
+  def unindex_team(self,team) -> None:
+    self.team_by_id.pop(team.id,None)
+    remove_from_index(self.team_by_name,team.name,team)
+    remove_from_index(self.team_by_role_id,team.role_id,team)
+    remove_from_index(self.team_by_manager_id,team.manager_role_id,team)
+
+  # Adding task to the tasks of its members.
+  def index_task_members(self,task) -> None:
+    for member_id in task.member_ids:
+      self.tasks_by_member.setdefault(member_id,{})[task] = None
+
+  # Removing task from the tasks of its members.
+  def unindex_task_members(self,task) -> None:
+    for member_id in task.member_ids:
+      member_tasks = self.tasks_by_member.get(member_id,{})
+      member_tasks.pop(task,None)
+      if len(member_tasks) == 0:
+        self.tasks_by_member.pop(member_id,None)
+
+  # Get tasks assigned to member id.
+  def get_member_tasks(self,member_id):
+    return list(self.tasks_by_member.get(member_id,{}).keys())
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Storage specific methods.
+
+  # Set storage, writing changes to it from then on.
+  def set_storage(self,storage) -> None:
+    events.unsubscribe_storage(self.events,self.storage_subscriptions)
+    self.storage = storage
+    self.storage_subscriptions = events.subscribe_storage(self.events,storage) if storage else []
+
+  # Bumping versions of the workflow and projects an event changes.
+  def bump_versions(self,event) -> None:
+    self.version += 1
+    if isinstance(event,events.ProjectEvent):
+      event.project.version += 1
+    elif isinstance(event,events.TaskEvent):
+      project = self.get_project_by_id(event.task.project)
+      if project:
+        project.version += 1
+    elif isinstance(event,events.TeamEvent):
+      for project_id in event.team.project_ids:
+        project = self.get_project_by_id(project_id)
+        if project:
+          project.version += 1
+
+  #   -   -   -   -   -   -   -   -   -   -   -   -   -
+  # Active channel specific methods.
+
+  # Set active channel.
+  def set_active_channel(self,channel) -> None:
+    self.active_channel = channel
+    self.events.emit(events.WorkflowChanged,self)
+
+  # Set active message, starting the board again from it.
+  # Returns ids of the old board's messages after its active message, for the caller to delete.
+  def set_active_message(self,message) -> list:
+    old_message_ids = self.board_message_ids
+    self.active_message = message
+    self.board_message_ids = []
+    self.events.emit(events.WorkflowChanged,self)
+    return old_message_ids
+
+  # Set ids of the board's messages after the active message.
+  def set_board_message_ids(self,message_ids) -> None:
+    self.board_message_ids = list(message_ids)
+    self.events.emit(events.WorkflowChanged,self)
 
   #   -   -   -   -   -   -   -   -   -   -   -   -   -
   # Project specific methods.
 
-  # Create new project with title and deadline.
-  def add_project(self, title, deadline: str=None) -> None:
-    new_project = Project(title, len(self.projects)+1,deadline)
+  # Allocating id for a new project.
+  def allocate_project_id(self,project_id=None) -> int:
+    if project_id is None:
+      project_id = self.next_project_id
+    self.next_project_id = max(self.next_project_id,project_id + 1)
+    self.events.emit(events.WorkflowChanged,self)
+    return project_id
+
+  # Create new project with title and deadline, keeping its stored id when loaded.
+  def add_project(self, title, deadline: str=None, project_id=None) -> None:
+    new_project = Project(title, self.allocate_project_id(project_id),deadline)
+    new_project.workflow = self
     self.projects.append(new_project)
+    self.index_project(new_project)
+    self.events.emit(events.ProjectAdded,self,new_project)
     return new_project
   
-  # Adding 100 days of code project.
-  def add_100days_project(self) -> None:
-    new_project = templates.DaysOfCode(len(self.projects)+1)
+  # Adding 100 days of code project, keeping its stored id when loaded.
+  def add_100days_project(self, project_id=None) -> None:
+    new_project = templates.DaysOfCode(self.allocate_project_id(project_id))
+    new_project.workflow = self
     self.projects.append(new_project)
+    self.index_project(new_project)
+    self.events.emit(events.ProjectAdded,self,new_project)
     return new_project
 
   # Remove project with number.
   def del_project(self, number) -> None:
-    project = self.projects[number-1]
+    return self.remove_project(self.projects[number-1].id)
+
+  # Remove project with id.
+  def remove_project(self, project_id):
+    project = self.project_by_id[int(project_id)]
     # Getting teams assigned to project.
-    team_ids = project.team_ids
-    for team_id in team_ids:
+    for team_id in project.team_ids:
       team = self.get_team_from_id(team_id)
       team.project_ids.remove(project.id)
-    # Removing project.
-    del self.projects[number-1]
+      self.events.emit(events.TeamChanged,self,team)
+    # Removing project, linear in projects as the board numbers them by position.
+    self.projects.remove(project)
+    self.unindex_project(project)
+    for task in project.tasks:
+      self.unindex_task_members(task)
+    self.events.emit(events.ProjectRemoved,self,project)
+    return project
 
   # Edit project with number.
   def edit_project(self, number, name, deadline):
     project = self.projects[number-1]
+    self.unindex_project(project)
     project.name = name
+    self.index_project(project)
     project.deadline = convert_deadline(deadline)
+    self.events.emit(events.ProjectChanged,self,project)
 
   # Get project names.
   def get_project_names(self):
@@ -61,15 +242,11 @@ class Workflow():
 
   # Get project from id.
   def get_project_by_id(self, id_number):
-    for project in self.projects:
-      if int(project.id) == int(id_number):
-        return project
+    return self.project_by_id.get(int(id_number))
   
   # Get project from title.
   def get_project_from_name(self,name):
-    for project in self.projects:
-      if project.name == name:
-        return project
+    return get_from_index(self.project_by_name,name)
       
   def get_days_of_code(self):
     """ Returning 100 Days of Code project."""
@@ -87,21 +264,40 @@ class Workflow():
   #   -   -   -   -   -   -   -   -   -   -   -   -   -
   # Team specific methods.
 
-  # Add team.
-  def add_team(self,title,role_id=None,manager_role_id=None):
-    team = Team(title,role_id=role_id,manager_role_id=manager_role_id,id=len(self.teams)+1)
+  # Allocating id for a new team.
+  def allocate_team_id(self,team_id=None) -> int:
+    if team_id is None:
+      team_id = self.next_team_id
+    self.next_team_id = max(self.next_team_id,team_id + 1)
+    self.events.emit(events.WorkflowChanged,self)
+    return team_id
+
+  # Add team, keeping its stored id when loaded.
+  def add_team(self,title,role_id=None,manager_role_id=None,team_id=None):
+    team = Team(title,role_id=role_id,manager_role_id=manager_role_id,id=self.allocate_team_id(team_id))
+    team.workflow = self
     self.teams.append(team)
+    self.index_team(team)
+    self.events.emit(events.TeamAdded,self,team)
     return team
 
-  # Delete team.
+  # Delete team with number.
   def del_team(self,number):
-    team = self.teams[int(number)-1]
+    return self.remove_team(self.teams[int(number)-1].id)
+
+  # Remove team with id.
+  def remove_team(self,team_id):
+    team = self.team_by_id[team_id]
     # Getting projects assigned to team.
     for project_id in team.project_ids:
       project = self.get_project_by_id(project_id)
       project.team_ids.remove(team.id)
-    # Removing team.
-    return self.teams.pop(int(number)-1)
+      self.events.emit(events.ProjectChanged,self,project)
+    # Removing team, linear in teams as commands number them by position.
+    self.teams.remove(team)
+    self.unindex_team(team)
+    self.events.emit(events.TeamRemoved,self,team)
+    return team
   
   # Get manager role ids.
   def get_manager_role_ids(self):
@@ -119,31 +315,39 @@ class Workflow():
   
   # Get team from role id.
   def get_team_from_role_id(self,role_id):
-    for team in self.teams:
-      if team.role_id == role_id:
-        return team
+    return get_from_index(self.team_by_role_id,role_id)
 
   # Get team from manager id.
   def get_team_from_manager_id(self,manager_id):
-    for team in self.teams:
-      if team.manager_role_id == manager_id:
-        return team
+    return get_from_index(self.team_by_manager_id,manager_id)
+
+  # Get all teams with role id.
+  def get_teams_from_role_id(self,role_id):
+    return list(self.team_by_role_id.get(role_id,[]))
+
+  # Get all teams with manager id.
+  def get_teams_from_manager_id(self,manager_id):
+    return list(self.team_by_manager_id.get(manager_id,[]))
   
   # Get team from id.
   def get_team_from_id(self,id):
-    for team in self.teams:
-      if team.id == id:
-        return team
+    return self.team_by_id.get(id)
       
   # Get team from name.
   def get_team_from_name(self,name):
-    for team in self.teams:
-      if team.name == name:
-        return team
+    return get_from_index(self.team_by_name,name)
     
 
 class Project():
 
+  __slots__ = ("name","id","deadline","tasks","team_ids","description","status_code","priority_code","workflow","next_task_id","task_by_id","active_tasks","archived_tasks","active_count","completed_count","archived_count","version","render_cache")
+
+  # Attributes written to storage.
+  stored_attributes = ("name","id","deadline","team_ids","description","status","priority","next_task_id")
+
+  status = Choice(STATUSES,"status_code")
+  priority = Choice(PRIORITIES,"priority_code")
+
   def __init__(self,name,id,deadline: str = None) -> None:
     self.name = name
     self.id = id
@@ -153,35 +357,136 @@ class Project():
     self.description = None
     self.status = "PENDING"
     self.priority = None
+    self.workflow = None
+    # Next id given to tasks, never reused after deletion, and tasks by id.
+    self.next_task_id = 1
+    self.task_by_id = {}
+    # Active and archived tasks, each in the order of tasks.
+    self.active_tasks = []
+    self.archived_tasks = []
+    # Counts of active, completed but not archived, and archived tasks.
+    self.active_count = 0
+    self.completed_count = 0
+    self.archived_count = 0
+    # Version bumped on each change, and rendered text of each layout with the key it was rendered for.
+    self.version = 0
+    self.render_cache = {}
 
   # Add task.
   def add_task(self,name,deadline) -> None:
-    task = Task(name,deadline,len(self.tasks)+1,self.id)
+    task = Task(name,deadline,self.next_task_id,self.id)
+    self.next_task_id += 1
+    task.workflow = self.workflow
     self.tasks.append(task)
+    self.task_by_id[task.id] = task
+    self.track_task(task)
+    emit_event(self.workflow,events.ProjectChanged,self)
+    emit_event(self.workflow,events.TaskAdded,task)
     return task
 
-  # Delete task
+  # Adding a loaded task with its stored id.
+  def load_task(self,task) -> None:
+    task.workflow = self.workflow
+    self.tasks.append(task)
+    self.task_by_id[task.id] = task
+    self.track_task(task)
+    self.next_task_id = max(self.next_task_id,task.id + 1)
+    if self.workflow:
+      self.workflow.index_task_members(task)
+
+  # Get task from id.
+  def get_task_by_id(self,task_id):
+    return self.task_by_id.get(task_id)
+
+  # Get active task from its number.
+  def get_active_task(self,number):
+    return self.active_tasks[number-1] if 0 < number <= len(self.active_tasks) else None
+
+  # Get archived task from its number.
+  def get_archived_task(self,number):
+    return self.archived_tasks[number-1] if 0 < number <= len(self.archived_tasks) else None
+
+  # Delete active task with number.
   def del_task(self,number) -> None:
-    del self.tasks[number-1]
+    self.remove_task(self.active_tasks[number-1])
+
+  # Remove task.
+  def remove_task(self,task) -> None:
+    del self.task_by_id[task.id]
+    # Removing from tasks and its state, linear in tasks as both keep their order for numbering.
+    self.tasks.remove(task)
+    self.untrack_task(task)
+    if self.workflow:
+      self.workflow.unindex_task_members(task)
+    emit_event(self.workflow,events.TaskRemoved,task)
+
+  # Adding task to the collection and counts of its state.
+  def track_task(self,task) -> None:
+    insort(self.archived_tasks if task.archive else self.active_tasks,task,key=get_task_id)
+    self.count_task(task,1)
+
+  # Removing task from the collection and counts of its state.
+  def untrack_task(self,task) -> None:
+    (self.archived_tasks if task.archive else self.active_tasks).remove(task)
+    self.count_task(task,-1)
+
+  # Getting text rendered for a layout, or None if the project or key has changed since.
+  def get_rendered(self,layout,key):
+    cached = self.render_cache.get(layout)
+    if cached and cached[0] == (self.version,key):
+      return cached[1]
+    return None
+
+  # Storing text rendered for a layout.
+  def set_rendered(self,layout,key,rendered) -> None:
+    self.render_cache[layout] = ((self.version,key),rendered)
+
+  # Counting task under its state, with change 1 when added and -1 when removed.
+  def count_task(self,task,change) -> None:
+    if task.archive:
+      self.archived_count += change
+    elif task.status == "COMPLETED":
+      self.completed_count += change
+    else:
+      self.active_count += change
+
+  # Archive completed tasks.
+  def archive_completed(self) -> None:
+    for task in list(self.active_tasks):
+      if task.status == "COMPLETED":
+        task.change_archive(True)
+
+  # Edit name.
+  def change_name(self,name) -> None:
+    if self.workflow:
+      self.workflow.unindex_project(self)
+    self.name = name
+    if self.workflow:
+      self.workflow.index_project(self)
+    emit_event(self.workflow,events.ProjectChanged,self)
 
   # Edit deadline.
   def edit_deadline(self,deadline) -> None:
     self.deadline = convert_deadline(deadline)
+    emit_event(self.workflow,events.ProjectChanged,self)
 
   # Getting deadline in unix.
   def get_unix_deadline(self) -> int:
-    deadline = datetime(year=self.deadline['year'],month=self.deadline['month'],day=self.deadline['day'])
-    return round(deadline.timestamp())
+    return self.deadline
   
   # Adding team to project.
   def add_team(self,team):
     self.team_ids.append(team.id)
     team.project_ids.append(self.id)
+    emit_event(self.workflow,events.ProjectChanged,self)
+    emit_event(self.workflow,events.TeamChanged,team)
 
   # Removing team from project.
   def remove_team(self,team):
     self.team_ids.remove(team.id)
     team.project_ids.remove(self.id)
+    emit_event(self.workflow,events.ProjectChanged,self)
+    emit_event(self.workflow,events.TeamChanged,team)
 
   # Getting teams from ids.
   def get_teams_from_ids(self,workflow):
@@ -193,79 +498,163 @@ class Project():
 
   def change_description(self,description):
       self.description = description
+      emit_event(self.workflow,events.ProjectChanged,self)
 
   def change_status(self,status):
     self.status = status
+    emit_event(self.workflow,events.ProjectChanged,self)
 
   def change_priority(self,priority):
     self.priority = priority
+    emit_event(self.workflow,events.ProjectChanged,self)
 
 
 
 class Task():
 
+    __slots__ = ("name","id","deadline","project","member_ids","description","status_code","priority_code","archive","logs","workflow")
+
+    # Attributes written to storage.
+    stored_attributes = ("name","id","deadline","project","member_ids","description","status","priority","archive","logs")
+
+    status = Choice(STATUSES,"status_code")
+    priority = Choice(PRIORITIES,"priority_code")
+
     def __init__(self,name,deadline,task_id,project_id) -> None:
         self.name = name
         self.id = task_id
         self.deadline = convert_deadline(deadline)
         self.project = project_id
-        self.member_ids = []
+        # Member ids as a tuple and logs shared until first added, as most tasks have few or none.
+        self.member_ids = ()
         self.description = None
         self.status = "PENDING"
         self.priority = None
         self.archive = False
-        self.logs = {}
+        self.logs = NO_LOGS
+        self.workflow = None
     
     def assign_member(self,member):
-      self.member_ids.append(member.id)
+      if member.id not in self.member_ids:
+        self.member_ids = self.member_ids + (member.id,)
+        if self.workflow:
+          self.workflow.tasks_by_member.setdefault(member.id,{})[self] = None
+        emit_event(self.workflow,events.TaskMembersChanged,self)
+
+    def remove_member(self,member):
+      if member.id not in self.member_ids:
+        raise ValueError(f"{member.id} not in member_ids")
+      if self.workflow:
+        self.workflow.unindex_task_members(self)
+      self.member_ids = tuple(member_id for member_id in self.member_ids if member_id != member.id)
+      if self.workflow:
+        self.workflow.index_task_members(self)
+      emit_event(self.workflow,events.TaskMembersChanged,self)
 
     def add_log(self,author,comment):
       current_datetime = datetime.now().strftime("%H:%M:%S %d-%m-%Y")
-      log_info = [comment,author.id]
-      self.logs[current_datetime] = log_info
+      self.set_log(current_datetime,[comment,author.id])
+      emit_event(self.workflow,events.LogAppended,self,current_datetime)
+
+    # Setting log without storing it, used when loading.
+    def set_log(self,log_datetime,log_info):
+      if self.logs is NO_LOGS:
+        self.logs = {}
+      self.logs[log_datetime] = log_info
 
     def remove_log(self,datetime):
       del self.logs[datetime]
+      emit_event(self.workflow,events.LogRemoved,self,datetime)
 
+    # Getting cached members, skipping those not cached or who have left.
     def get_members(self,guild):
-      members = []
-      for member_id in self.member_ids:
-        members.append(guild.get_member(member_id))
-      return members
+      return members.get_resolver(guild).get_all(self.member_ids)
     
     def change_description(self,description):
       self.description = description
+      emit_event(self.workflow,events.TaskChanged,self)
 
     def change_status(self,status):
+      project = self.get_project()
+      if project:
+        project.count_task(self,-1)
       self.status = status
+      if project:
+        project.count_task(self,1)
+      emit_event(self.workflow,events.TaskStatusChanged,self)
 
     def change_priority(self,priority):
       self.priority = priority
+      emit_event(self.workflow,events.TaskChanged,self)
+
+    def change_archive(self,archive):
+      project = self.get_project()
+      if project:
+        project.untrack_task(self)
+      self.archive = archive
+      if project:
+        project.track_task(self)
+      emit_event(self.workflow,events.TaskArchiveChanged,self)
 
     def get_unix_deadline(self) -> int:
-      deadline = datetime(year=self.deadline['year'],month=self.deadline['month'],day=self.deadline['day'])
-      return round(deadline.timestamp())
+      return self.deadline
+
+    # Getting project counting this task, if it has been added to one.
+    def get_project(self):
+      project = self.workflow.get_project_by_id(self.project) if self.workflow else None
+      if project and project.task_by_id.get(self.id) is self:
+        return project
+      return None
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 class Team():
 
+  __slots__ = ("name","id","role_id","manager_role_id","project_ids","workflow")
+
+  # Attributes written to storage.
+  stored_attributes = ("name","id","role_id","manager_role_id","project_ids")
+
   def __init__(self,name,role_id:None,manager_role_id:None,id) -> None:
     self.name = name
     self.id = id
     self.role_id = role_id
     self.manager_role_id = manager_role_id
     self.project_ids = []
+    self.workflow = None
+
+  # Changing name of team.
+  def change_name(self,name):
+    if self.workflow:
+      self.workflow.unindex_team(self)
+    self.name = name
+    if self.workflow:
+      self.workflow.index_team(self)
+    emit_event(self.workflow,events.TeamChanged,self)
+
+  # Setting roles of team.
+  def set_roles(self,role_id,manager_role_id):
+    if self.workflow:
+      self.workflow.unindex_team(self)
+    self.role_id = role_id
+    self.manager_role_id = manager_role_id
+    if self.workflow:
+      self.workflow.index_team(self)
+    emit_event(self.workflow,events.TeamChanged,self)
 
   # Adding project to teams.
   def add_project(self,project: Project):
     project.team_ids.append(self.id)
     self.project_ids.append(project.id)
+    emit_event(self.workflow,events.ProjectChanged,project)
+    emit_event(self.workflow,events.TeamChanged,self)
 
   # Deleting project to teams.
   def del_project(self,project: Project):
     project.team_ids.remove(self.id)
     self.project_ids.remove(project.id)
+    emit_event(self.workflow,events.ProjectChanged,project)
+    emit_event(self.workflow,events.TeamChanged,self)
 
   # Getting projects from ids..
   def get_projects_from_ids(self,workflow):
@@ -283,19 +672,59 @@ class DatetimeConversionError(Exception):
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-# Converting string input to datetime object.
+# Emitting event on the bus of a workflow, if the item belongs to one.
+def emit_event(workflow,event_type,*args):
+  if workflow:
+    workflow.events.emit(event_type,workflow,*args)
+
+# Adding item to an index under key.
+def add_to_index(index,key,item):
+  index.setdefault(key,[]).append(item)
+
+# Removing item from an index under key.
+def remove_from_index(index,key,item):
+  items = index.get(key,[])
+  if item in items:
+    items.remove(item)
+    if len(items) == 0:
+      del index[key]
+
+# Getting first item added to an index under key.
+def get_from_index(index,key):
+  items = index.get(key)
+  return items[0] if items else None
+
+# Getting id after the largest of projects, tasks or teams, used for data stored before ids were allocated.
+def get_next_id(items):
+  return max([item.id for item in items],default=0) + 1
+
+# Converting "dd mm yyyy" input to unix deadline.
 def convert_deadline(deadline_input):
+    if deadline_input == None:
+        return None
+    parts = deadline_input.split()
+    # Accepting the digits strptime("%d %m %Y") would, a four digit year and a day and month of one or two.
+    if len(parts) != 3 or not all(part.isascii() and part.isdigit() for part in parts) or len(parts[0]) > 2 or len(parts[1]) > 2 or len(parts[2]) != 4:
+        raise DatetimeConversionError
+    day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
+    if not 1 <= month <= 12 or not 1 <= year <= 9999 or not 1 <= day <= monthrange(year,month)[1]:
+        raise DatetimeConversionError
+    # Dates at the ends of the range can still fall outside what unix time can hold in the timezone.
     try:
-        if deadline_input == None:
-            deadline = None
-        else:
-            deadline = datetime.strptime(deadline_input, "%d %m %Y")
-            deadline = {
-              'day': deadline.day,
-              'month': deadline.month,
-              'year': deadline.year
-            }
-    except:
+        return get_epoch(day,month,year)
+    except (ValueError,OverflowError,OSError):
         raise DatetimeConversionError
 
-    return deadline
\ No newline at end of file
+# Getting unix time of midnight on a date in the deadline timezone.
+def get_epoch(day,month,year) -> int:
+    if config.DEADLINE_TIMEZONE:
+        return round(datetime(year,month,day,tzinfo=ZoneInfo(config.DEADLINE_TIMEZONE)).timestamp())
+    return round(datetime(year,month,day).astimezone().timestamp())
+
+# Loading stored deadline, either unix time or a day, month and year dictionary from older data.
+def load_deadline(deadline):
+    if deadline is None:
+        return None
+    if isinstance(deadline,dict):
+        return get_epoch(deadline['day'],deadline['month'],deadline['year'])
+    return int(deadline)
\ No newline at end of file